@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mam_analyzer.archive import LZMA, ZLIB, decode_flight, encode_flight
+
+ARCHIVE_SUFFIX = ".mamz"
+
+def pack(path, output_dir, codec):
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    target = (output_dir or path.parent) / (path.stem + ARCHIVE_SUFFIX)
+    target.write_bytes(encode_flight(document, codec))
+    return target
+
+def unpack(path, output_dir):
+    document = decode_flight(path.read_bytes())
+    target = (output_dir or path.parent) / (path.stem + ".json")
+    target.write_text(json.dumps(document, indent=2, ensure_ascii=False), encoding="utf-8")
+    return target
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack MAM ACARS flight JSON files into compact archives, or unpack them.")
+    parser.add_argument("command", choices=["pack", "unpack"], help="pack: JSON to archive, unpack: archive to JSON")
+    parser.add_argument("inputs", type=Path, nargs="+", help="Flight JSON files (pack) or archives (unpack)")
+    parser.add_argument("--output-dir", type=Path, default=None, help="Directory for the output files (default next to each input)")
+    parser.add_argument("--codec", choices=[LZMA, ZLIB], default=LZMA, help="Compression of the archives (lzma is smaller, zlib decodes faster)")
+    args = parser.parse_args()
+
+    for path in args.inputs:
+        if not path.is_file():
+            print(f"Error: input file '{path}' does not exist.")
+            sys.exit(1)
+    if args.output_dir is not None:
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    for path in args.inputs:
+        if args.command == "pack":
+            target = pack(path, args.output_dir, args.codec)
+        else:
+            target = unpack(path, args.output_dir)
+        print(f"{path} -> {target} ({path.stat().st_size} -> {target.stat().st_size} bytes)")
+
+if __name__ == "__main__":
+    main()
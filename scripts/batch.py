@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mam_analyzer.batch import DEFAULT_MAX_READS, analyze_many
+from mam_analyzer.log import configure_logging
+from mam_analyzer.models.flight_context import FlightContext
+from mam_analyzer.phases.profiles import FULL, PROFILES
+from mam_analyzer.sink import DEFAULT_BATCH_SIZE, SqliteReportSink
+
+def collect_inputs(inputs):
+    """Flight files of the inputs: files as given, directories expanded to their *.json files."""
+    paths = []
+    for path in inputs:
+        if path.is_dir():
+            paths.extend(sorted(path.glob("*.json")))
+        else:
+            paths.append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze many MAM ACARS flight JSON files.")
+    parser.add_argument("inputs", type=Path, nargs="+", help="Flight JSON files or directories with them")
+    parser.add_argument("--output-dir", type=Path, default=None, help="Directory for the reports (same file name as each flight)")
+    parser.add_argument("--db", type=Path, default=None, help="SQLite database where flights, phases, metrics and issues are stored")
+    parser.add_argument("--db-batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Flights written per database transaction")
+    parser.add_argument("--context", type=Path, default=None, help="Optional flight context JSON file, used for every flight")
+    parser.add_argument("--profile", choices=list(PROFILES), default=FULL, help="Phases detected and analyzers run (metrics-only: global metrics only)")
+    parser.add_argument("--max-reads", type=int, default=DEFAULT_MAX_READS, help="Files read concurrently")
+    parser.add_argument("--workers", type=int, default=None, help="Analysis processes (default: one per CPU)")
+    parser.add_argument("--log-level", default="WARNING", help="Analyzer log level (DEBUG, INFO, WARNING...)")
+    parser.add_argument("--log-json", action="store_true", help="Write analyzer logs as JSON lines")
+    args = parser.parse_args()
+
+    configure_logging(args.log_level, args.log_json)
+
+    if args.output_dir is None and args.db is None:
+        parser.error("at least one of --output-dir or --db is required")
+
+    contexts = None
+    paths = collect_inputs(args.inputs)
+    if args.context is not None:
+        if not args.context.is_file():
+            print(f"Error: context file '{args.context}' does not exist.")
+            sys.exit(1)
+        with open(args.context, encoding="utf-8") as f:
+            context = FlightContext.from_dict(json.load(f))
+        contexts = {path: context for path in paths}
+
+    sink = SqliteReportSink(args.db, args.db_batch_size) if args.db is not None else None
+    try:
+        results = analyze_many(paths, output_dir=args.output_dir, contexts=contexts, max_reads=args.max_reads, workers=args.workers, sink=sink, profile=args.profile)
+    finally:
+        if sink is not None:
+            sink.close()
+
+    failed = [r for r in results if not r.ok]
+    for result in failed:
+        print(f"Error analyzing '{result.path}': {result.error}", file=sys.stderr)
+    destinations = " and ".join(f"'{d}'" for d in (args.output_dir, args.db) if d is not None)
+    print(f"{len(results) - len(failed)} flight reports saved to {destinations}")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mam_analyzer.fleet import DEFAULT_METRICS, aggregate_fleet, by_metric, by_name_part
+
+def parse_group_by(value):
+    """name:INDEX groups by a part of the flight name, metric:KEY by a phase metric value."""
+    if value is None:
+        return None
+    kind, _, arg = value.partition(":")
+    if kind == "name":
+        return by_name_part(int(arg))
+    if kind == "metric":
+        return by_metric(arg)
+    raise argparse.ArgumentTypeError(f"invalid group by '{value}' (use name:INDEX or metric:KEY)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet statistics over many analyzed flights.")
+    parser.add_argument("source", type=Path, nargs="+", help="Report JSON files, a directory of them, a report cache or a report database")
+    parser.add_argument("--group-by", type=parse_group_by, default=None, help="name:INDEX (Ex: name:-1 for the aircraft type of LEPA-LEPP-737) or metric:KEY (Ex: metric:LandingRunway)")
+    parser.add_argument("--metric", action="append", default=None, help=f"Phase metric to aggregate (repeatable, default {', '.join(DEFAULT_METRICS)})")
+    parser.add_argument("--issue", action="append", default=None, help="Issue code to count (repeatable, default all)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes aggregating parts of the source")
+    parser.add_argument("--output", type=Path, default=None, help="Output JSON file (default stdout)")
+    args = parser.parse_args()
+
+    source = args.source[0] if len(args.source) == 1 else args.source
+    for path in args.source:
+        if not path.exists():
+            print(f"Error: source '{path}' does not exist.")
+            sys.exit(1)
+
+    aggregate = aggregate_fleet(
+        source,
+        metrics=args.metric or DEFAULT_METRICS,
+        issue_codes=args.issue,
+        group_by=args.group_by,
+        workers=args.workers,
+    )
+    text = json.dumps(aggregate.to_dict(), indent=2)
+
+    if args.output is None:
+        print(text)
+    else:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text, encoding="utf-8")
+        print(f"Fleet statistics saved to '{args.output}'")
+
+if __name__ == "__main__":
+    main()
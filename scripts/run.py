@@ -6,17 +6,34 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
 
+from mam_analyzer.cache import DEFAULT_MAX_BYTES, ResultCache
 from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.log import configure_logging
 from mam_analyzer.models.flight_context import FlightContext
-from mam_analyzer.parser import load_flight_data
+from mam_analyzer.parser import parse_flight_data
+from mam_analyzer.phases.profiles import FULL, PROFILES
+from mam_analyzer.precheck import precheck_flight_data
+from mam_analyzer.profiling import MemoryProfiler, Profiler
 
 def main():
     parser = argparse.ArgumentParser(description="Analyze a MAM ACARS flight JSON file.")
-    parser.add_argument("input_json", type=Path, help="Input flight JSON file")
+    parser.add_argument("input_json", type=Path, help="Input flight JSON file (or flight archive, see scripts/archive.py)")
     parser.add_argument("output_json", type=Path, help="Output report JSON file")
     parser.add_argument("--context", type=Path, default=None, help="Optional flight context JSON file")
+    parser.add_argument("--timings", action="store_true", help="Include per-stage timings in the report")
+    parser.add_argument("--memory-profile", action="store_true", help="Include per-stage timings, peak RSS and top allocators in the report (slow)")
+    parser.add_argument("--cache", type=Path, default=None, help="SQLite file caching reports by flight content and analyzer version")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024), help="Cache size bound in MB (least recently used reports are evicted)")
+    parser.add_argument("--profile", choices=list(PROFILES), default=FULL, help="Phases detected and analyzers run (metrics-only: global metrics only)")
+    parser.add_argument("--preview", action="store_true", help="Quick provisional report: phase timeline and global metrics from a decimated track")
+    parser.add_argument("--raw-issues", action="store_true", help="Export every issue instead of merging repeated issues into intervals")
+    parser.add_argument("--skip-precheck", action="store_true", help="Analyze the flight without first checking it has a takeoff and a landing")
+    parser.add_argument("--log-level", default="WARNING", help="Analyzer log level (DEBUG, INFO, WARNING...)")
+    parser.add_argument("--log-json", action="store_true", help="Write analyzer logs as JSON lines")
     args = parser.parse_args()
 
+    configure_logging(args.log_level, args.log_json)
+
     if not args.input_json.is_file():
         print(f"Error: input file '{args.input_json}' does not exist.")
         sys.exit(1)
@@ -32,15 +49,43 @@ def main():
     input_file = args.input_json
     output_file = args.output_json
 
-    events = load_flight_data(input_file)
-    evaluator = FlightEvaluator()
+    profiler = None
+    if args.memory_profile:
+        profiler = MemoryProfiler()
+    elif args.timings:
+        profiler = Profiler()
+
+    data = input_file.read_bytes()
+    if not args.skip_precheck:
+        check = precheck_flight_data(data)
+        if not check.analyzable:
+            print(f"Error: flight can't be analyzed ({check.reason}): {check.message}", file=sys.stderr)
+            sys.exit(1)
+
+    events = parse_flight_data(data, profiler)
 
-    report = evaluator.evaluate(events, context=context)
+    if args.preview:
+        # Provisional reports are never cached
+        report_dict = FlightEvaluator(profiler).preview(events, context).to_dict()
+    elif args.cache is not None and profiler is None:
+        with ResultCache(args.cache, int(args.cache_max_mb * 1024 * 1024)) as cache:
+            # On a report miss, memoized phases and unchanged analyzer results are reused
+            evaluator = FlightEvaluator(phase_cache=cache, profile=args.profile)
+            if args.raw_issues:
+                # Cached reports have coalesced issues
+                report_dict = evaluator.evaluate(events, context).to_dict(raw_issues=True)
+            else:
+                report_dict = cache.get_or_evaluate(events, context, evaluator)
+    else:
+        # Profiled runs always evaluate: cached reports have no timings
+        report_dict = FlightEvaluator(profiler, profile=args.profile).evaluate(events, context=context).to_dict(raw_issues=args.raw_issues)
 
     try:
         output_file.parent.mkdir(parents=True, exist_ok=True)
         with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(report.to_dict(), f, indent=2)
+            json.dump(report_dict, f, indent=2)
+        if args.memory_profile:
+            profiler.stop()
         print(f"Flight report saved to '{output_file}'")
     except Exception as e:
         print(f"Error saving flight report: {e}", file=sys.stderr)
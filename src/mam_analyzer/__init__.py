@@ -0,0 +1,4 @@
+import logging
+
+# Library logging is quiet by default: applications decide where it goes
+logging.getLogger(__name__).addHandler(logging.NullHandler())
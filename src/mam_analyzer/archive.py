@@ -0,0 +1,476 @@
+"""Compact archive format of raw ACARS flight files.
+
+An archive keeps the whole flight document and gives back exactly the same Changes dicts
+(values are the original text, comma decimals included), so the exported events are
+still faithful. It is much smaller than the JSON and decodes faster than the JSON path,
+straight into FlightEvents (parser.load_flight_data / parse_flight_data detect archives).
+
+Layout: MAGIC, format version, codec, then the compressed body (zlib or lzma):
+
+- head: JSON with the document without its events, the key table, the layouts (keys of
+  the changes of an event, as a presence bitmask over the key table when the keys are in
+  table order) and the timestamp formats. Events that aren't {"Timestamp", "Changes"}
+  with text values, and timestamps out of the supported formats, are kept as they are
+  in the head.
+- events: layout id and timestamp format id of each event, and the timestamps as deltas
+  in nanoseconds with the previous one.
+- a column per key with the values of the events that have it: the table of its distinct
+  values, in order of appearance, and a reference to the table per value. Fixed point
+  numbers (lat/lon, fuel, altitudes...) are stored as their scale and the delta of their
+  integer mantissa with the previous number of the table, anything else as text.
+
+Small ints (counts, text sizes) are varints. Ids, references and deltas are arrays of the
+smallest item size, so they are decoded in one go instead of value by value.
+"""
+import json
+import lzma
+import re
+import sys
+import zlib
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate, repeat
+from operator import floordiv, itemgetter, mod
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from mam_analyzer.models.flight_events import FlightEvent
+# The magic bytes live in the parser, which detects archives without importing this module
+from mam_analyzer.parser import MAGIC, is_archive
+
+VERSION = 1
+
+ZLIB = "zlib"
+LZMA = "lzma"
+_CODECS = {ZLIB: 0, LZMA: 1}
+
+# Timestamps as ticks (nanoseconds) since 0001-01-01
+_EPOCH = datetime(1, 1, 1)
+_NS_PER_DAY = 86400 * 10**9
+_TIMESTAMP = re.compile(r"(\d{4})-(\d{2})-(\d{2})([T ])(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,9}))?")
+_FIXED_POINT = re.compile(r"-?\d+(?:,(\d+))?")
+
+# Layout / timestamp format id 0: raw event / timestamp literal, kept in the head
+_RAW = 0
+# Tag of a distinct value: 0 text, else scale + 1 of a number
+_TEXT = 0
+
+
+def _write_varints(out: bytearray, values: List[int]) -> None:
+    for value in values:
+        while value > 0x7F:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+
+def _read_varints(buf: bytes, pos: int, count: int) -> Tuple[List[int], int]:
+    values: List[int] = []
+    append = values.append
+    for _ in range(count):
+        b = buf[pos]
+        pos += 1
+        if b < 0x80:
+            append(b)
+            continue
+        value = b & 0x7F
+        shift = 7
+        while True:
+            b = buf[pos]
+            pos += 1
+            value |= (b & 0x7F) << shift
+            if b < 0x80:
+                break
+            shift += 7
+        append(value)
+    return values, pos
+
+
+def _typecode(size: int) -> str:
+    """Smallest array item for the numbers below size."""
+    if size <= 0x100:
+        return "B"
+    if size <= 0x10000:
+        return "H"
+    return "I"
+
+
+# Signed array items by size. Deltas that don't fit in 64 bits are stored as text
+_SIGNED_TYPECODES = {1: "b", 2: "h", 4: "i", 8: "q"}
+_INT64_BOUND = 1 << 63
+
+
+def _signed_size(values: List[int]) -> int:
+    """Smallest signed array item size (bytes) for the values."""
+    bound = max((v if v >= 0 else -v - 1 for v in values), default=0)
+    for size in (1, 2, 4):
+        if bound < 1 << (size * 8 - 1):
+            return size
+    return 8
+
+
+def _write_array(out: bytearray, typecode: str, values: List[int]) -> None:
+    items = array(typecode, values)
+    if sys.byteorder == "big":
+        items.byteswap()
+    out += items.tobytes()
+
+
+def _read_array(buf: bytes, pos: int, typecode: str, count: int) -> Tuple[array, int]:
+    items = array(typecode)
+    end = pos + count * items.itemsize
+    items.frombytes(buf[pos:end])
+    if sys.byteorder == "big":
+        items.byteswap()
+    return items, end
+
+
+def _write_signed(out: bytearray, values: List[int]) -> None:
+    """Item size and array of signed values (which fit in 64 bits)."""
+    size = _signed_size(values)
+    out.append(size)
+    _write_array(out, _SIGNED_TYPECODES[size], values)
+
+
+def _read_signed(buf: bytes, pos: int, count: int) -> Tuple[array, int]:
+    return _read_array(buf, pos + 1, _SIGNED_TYPECODES[buf[pos]], count)
+
+
+def _format_fixed(mantissa: int, scale: int) -> str:
+    """Comma decimal text of mantissa / 10**scale (Ex: 395469, 4 -> "39,5469")."""
+    if scale == 0:
+        return str(mantissa)
+    sign = "-" if mantissa < 0 else ""
+    units, decimals = divmod(abs(mantissa), 10**scale)
+    return f"{sign}{units},{decimals:0{scale}d}"
+
+
+# printf format and divisor of each number tag (scale + 1)
+_FIXED_FORMATS = [""] + ["%d%.0s"] + [f"%d,%0{scale}d" for scale in range(1, 255)]
+_FIXED_DIVISORS = [1] + [10**scale for scale in range(255)]
+
+
+def _format_fixed_many(mantissas: List[int], tags: List[int]) -> List[str]:
+    """_format_fixed of each mantissa with the scale of its tag."""
+    formats, divisors = _FIXED_FORMATS, _FIXED_DIVISORS
+    return [
+        formats[t] % divmod(m, divisors[t]) if m >= 0 else "-" + formats[t] % divmod(-m, divisors[t])
+        for m, t in zip(mantissas, tags)
+    ]
+
+
+def _parse_fixed(value: str) -> Optional[Tuple[int, int]]:
+    """(mantissa, scale) of a comma decimal text, None if the text can't be rebuilt from them."""
+    match = _FIXED_POINT.fullmatch(value)
+    if match is None:
+        return None
+    decimals = match.group(1)
+    scale = len(decimals) if decimals is not None else 0
+    mantissa = int(value.replace(",", ""))
+    # Leading zeros, "-0"...
+    if _format_fixed(mantissa, scale) != value:
+        return None
+    return mantissa, scale
+
+
+def _format_timestamp(ticks: int, sep: str, digits: int) -> Tuple[str, datetime]:
+    """(text, datetime) of the ticks. The datetime is truncated to microseconds, as parse_timestamp."""
+    dt = _EPOCH + timedelta(microseconds=ticks // 1000)
+    text = dt.isoformat(sep, "seconds")
+    if digits:
+        text = f"{text}.{ticks % 10**9:09d}"[:20 + digits]
+    return text, dt
+
+
+# printf format and divisor of the ticks fraction of each number of digits
+_FRACTION_FORMATS = ["%s%.0s"] + [f"%s.%0{digits}d" for digits in range(1, 10)]
+_FRACTION_DIVISORS = [10**(9 - digits) for digits in range(10)]
+
+
+def _format_timestamps(ticks: List[int], formats: List[Tuple[str, int]]) -> Tuple[List[str], List[datetime]]:
+    """_format_timestamp of each ticks with its (separator, fraction digits), by C level maps."""
+    micros = map(floordiv, ticks, repeat(1000))
+    dts = list(map(_EPOCH.__add__, map(timedelta, repeat(0), repeat(0), micros)))
+    texts = map(datetime.isoformat, dts, map(itemgetter(0), formats), repeat("seconds"))
+    digits = list(map(itemgetter(1), formats))
+    fractions = map(floordiv, map(mod, ticks, repeat(10**9)), map(_FRACTION_DIVISORS.__getitem__, digits))
+    texts = map(str.__mod__, map(_FRACTION_FORMATS.__getitem__, digits), zip(texts, fractions))
+    return list(texts), dts
+
+
+def _parse_timestamp(value: str) -> Optional[Tuple[int, str, int]]:
+    """(ticks, separator, fraction digits) of a timestamp, None if it can't be rebuilt from them."""
+    match = _TIMESTAMP.fullmatch(value)
+    if match is None:
+        return None
+    year, month, day, sep, hour, minute, second, fraction = match.groups()
+    try:
+        dt = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+    except ValueError:
+        return None
+    digits = len(fraction) if fraction is not None else 0
+    ticks = (dt - _EPOCH).days * _NS_PER_DAY + (dt.hour * 3600 + dt.minute * 60 + dt.second) * 10**9
+    if fraction is not None:
+        ticks += int(fraction.ljust(9, "0"))
+    if _format_timestamp(ticks, sep, digits)[0] != value:
+        return None
+    return ticks, sep, digits
+
+
+def _is_plain_event(event: Any) -> bool:
+    """{"Timestamp": text, "Changes": {key: text}}, the events of the columns."""
+    return (
+        type(event) is dict
+        and list(event) == ["Timestamp", "Changes"]
+        and type(event["Timestamp"]) is str
+        and type(event["Changes"]) is dict
+        and all(type(v) is str for v in event["Changes"].values())
+    )
+
+
+class _Column:
+    """Values of a key being encoded: the distinct values and a reference to them per value."""
+
+    def __init__(self) -> None:
+        self.refs: Dict[str, int] = {}
+        self.values: List[int] = []
+        self.tags: List[int] = []
+        self.texts: List[bytes] = []
+        self.deltas: List[int] = []
+        self.last_mantissa = 0
+
+    def add(self, value: str) -> None:
+        ref = self.refs.get(value)
+        if ref is None:
+            ref = self.refs[value] = len(self.refs)
+            self._add_distinct(value)
+        self.values.append(ref)
+
+    def _add_distinct(self, value: str) -> None:
+        fixed = _parse_fixed(value)
+        delta = fixed[0] - self.last_mantissa if fixed is not None else 0
+        if fixed is None or fixed[1] > 0xFE or not -_INT64_BOUND <= delta < _INT64_BOUND:
+            self.tags.append(_TEXT)
+            self.texts.append(value.encode("utf-8"))
+            return
+        mantissa, scale = fixed
+        self.tags.append(scale + 1)
+        self.deltas.append(delta)
+        self.last_mantissa = mantissa
+
+    def write(self, out: bytearray) -> None:
+        """Distinct count, tags, text sizes, texts, number deltas and the references."""
+        _write_varints(out, [len(self.tags)])
+        out += bytes(self.tags)
+        _write_varints(out, [len(text) for text in self.texts])
+        out += b"".join(self.texts)
+        _write_signed(out, self.deltas)
+        _write_array(out, _typecode(len(self.tags)), self.values)
+
+
+def _read_column(buf: bytes, pos: int, count: int) -> Tuple[List[str], int]:
+    """Values of a column of count values."""
+    (distinct,), pos = _read_varints(buf, pos, 1)
+    tags = buf[pos:pos + distinct]
+    pos += distinct
+
+    sizes, pos = _read_varints(buf, pos, tags.count(_TEXT))
+    texts: List[str] = []
+    for size in sizes:
+        texts.append(buf[pos:pos + size].decode("utf-8"))
+        pos += size
+    deltas, pos = _read_signed(buf, pos, distinct - len(texts))
+
+    if not texts:
+        table = _format_fixed_many(list(accumulate(deltas)), tags)
+    elif len(texts) == distinct:
+        table = texts
+    else:
+        next_text = iter(texts).__next__
+        next_number = iter(_format_fixed_many(list(accumulate(deltas)), [t for t in tags if t != _TEXT])).__next__
+        table = [next_text() if tag == _TEXT else next_number() for tag in tags]
+
+    refs, pos = _read_array(buf, pos, _typecode(distinct), count)
+    return list(map(table.__getitem__, refs)), pos
+
+
+def encode_flight(document: Dict[str, Any], codec: str = LZMA) -> bytes:
+    """Archive of a flight document (the decoded JSON of a flight file)."""
+    if codec not in _CODECS:
+        raise ValueError(f"Unknown archive codec '{codec}' (use {ZLIB} or {LZMA})")
+    events = document.get("Events") if isinstance(document, dict) else None
+    if not isinstance(events, list):
+        raise ValueError("A flight document is an object with an Events list")
+
+    keys: Dict[str, int] = {}
+    columns: List[_Column] = []
+    layouts: Dict[Tuple[str, ...], int] = {}
+    layout_defs: List[Any] = []
+    formats: Dict[Tuple[str, int], int] = {}
+    raw_events: Dict[str, Any] = {}
+    literals: Dict[str, str] = {}
+
+    layout_ids: List[int] = []
+    format_ids: List[int] = []
+    ticks_deltas: List[int] = []
+    first_ticks = last_ticks = None
+    for i, event in enumerate(events):
+        if not _is_plain_event(event):
+            raw_events[str(i)] = event
+            layout_ids.append(_RAW)
+            continue
+
+        changes = event["Changes"]
+        layout_keys = tuple(changes)
+        layout_id = layouts.get(layout_keys)
+        if layout_id is None:
+            for key in layout_keys:
+                if key not in keys:
+                    keys[key] = len(keys)
+                    columns.append(_Column())
+            ids = [keys[key] for key in layout_keys]
+            layout_defs.append(sum(1 << k for k in ids) if ids == sorted(ids) else ids)
+            layout_id = layouts[layout_keys] = len(layouts) + 1
+        layout_ids.append(layout_id)
+
+        timestamp = event["Timestamp"]
+        parsed = _parse_timestamp(timestamp)
+        if parsed is not None and first_ticks is None:
+            first_ticks = last_ticks = parsed[0]
+        if parsed is None or not -_INT64_BOUND <= parsed[0] - last_ticks < _INT64_BOUND:
+            literals[str(i)] = timestamp
+            format_ids.append(_RAW)
+        else:
+            ticks, sep, digits = parsed
+            format_ids.append(formats.setdefault((sep, digits), len(formats) + 1))
+            ticks_deltas.append(ticks - last_ticks)
+            last_ticks = ticks
+
+        for key, value in changes.items():
+            columns[keys[key]].add(value)
+
+    head = {
+        "document": {k: None if k == "Events" else v for k, v in document.items()},
+        "count": len(events),
+        "keys": list(keys),
+        "layouts": layout_defs,
+        "formats": [list(f) for f in formats],
+        "first_ticks": first_ticks,
+        "literals": literals,
+        "raw_events": raw_events,
+    }
+    head_data = json.dumps(head, separators=(",", ":")).encode("utf-8")
+
+    body = bytearray()
+    _write_varints(body, [len(head_data)])
+    body += head_data
+    _write_array(body, _typecode(len(layouts) + 1), layout_ids)
+    _write_array(body, _typecode(len(formats) + 1), format_ids)
+    _write_signed(body, ticks_deltas)
+    for column in columns:
+        column.write(body)
+
+    compressed = zlib.compress(bytes(body), 9) if codec == ZLIB else lzma.compress(bytes(body))
+    return MAGIC + bytes((VERSION, _CODECS[codec])) + compressed
+
+
+def _decompress(data: bytes) -> bytes:
+    if not is_archive(data):
+        raise ValueError("Not a flight archive")
+    version, codec = data[len(MAGIC)], data[len(MAGIC) + 1]
+    if version != VERSION:
+        raise ValueError(f"Unsupported flight archive version {version}")
+    body = data[len(MAGIC) + 2:]
+    if codec == _CODECS[ZLIB]:
+        return zlib.decompress(body)
+    if codec == _CODECS[LZMA]:
+        return lzma.decompress(body)
+    raise ValueError(f"Unknown flight archive codec {codec}")
+
+
+class _Archive:
+    """Decoded body of an archive: head, and per event its layout keys, timestamp and values."""
+
+    def __init__(self, data: bytes) -> None:
+        buf = _decompress(data)
+        (size,), pos = _read_varints(buf, 0, 1)
+        head = json.loads(buf[pos:pos + size])
+        pos += size
+
+        self.document: Dict[str, Any] = head["document"]
+        self.raw_events: Dict[str, Any] = head["raw_events"]
+        keys: List[str] = head["keys"]
+        layouts: List[Optional[Tuple[str, ...]]] = [None]
+        for definition in head["layouts"]:
+            if isinstance(definition, int):
+                layouts.append(tuple(key for k, key in enumerate(keys) if definition >> k & 1))
+            else:
+                layouts.append(tuple(keys[k] for k in definition))
+        formats = [None] + [tuple(f) for f in head["formats"]]
+        literals: Dict[str, str] = head["literals"]
+
+        count = head["count"]
+        layout_ids, pos = _read_array(buf, pos, _typecode(len(layouts)), count)
+        self.layouts: List[Optional[Tuple[str, ...]]] = list(map(layouts.__getitem__, layout_ids))
+        plain = count - layout_ids.count(_RAW)
+        format_ids, pos = _read_array(buf, pos, _typecode(len(formats)), plain)
+        deltas, pos = _read_signed(buf, pos, plain - format_ids.count(_RAW))
+
+        ticks = list(accumulate(deltas, initial=head["first_ticks"]))[1:]
+        timestamps, datetimes = _format_timestamps(ticks, [formats[f] for f in format_ids if f != _RAW])
+        self.timestamps: List[Optional[str]] = timestamps
+        self.datetimes: List[Optional[datetime]] = datetimes
+        if len(timestamps) < count:
+            # Raw events and timestamp literals in between
+            self.timestamps = [None] * count
+            self.datetimes = [None] * count
+            next_format = iter(format_ids).__next__
+            next_formatted = zip(timestamps, datetimes).__next__
+            for i, layout_id in enumerate(layout_ids):
+                if layout_id == _RAW:
+                    continue
+                if next_format() == _RAW:
+                    self.timestamps[i] = literals[str(i)]
+                else:
+                    self.timestamps[i], self.datetimes[i] = next_formatted()
+
+        occurrences = dict.fromkeys(keys, 0)
+        for layout_id in set(layout_ids) - {_RAW}:
+            n = layout_ids.count(layout_id)
+            for key in layouts[layout_id]:
+                occurrences[key] += n
+
+        columns: Dict[str, Iterator[str]] = {}
+        for key in keys:
+            values, pos = _read_column(buf, pos, occurrences[key])
+            columns[key] = iter(values)
+        # Columns of the keys of each layout
+        self._layout_columns = {layout: [columns[key] for key in layout] for layout in layouts[1:]}
+
+    def values(self, layout: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Next values of the columns of the layout keys."""
+        return tuple(map(next, self._layout_columns[layout]))
+
+
+def decode_flight(data: bytes) -> Dict[str, Any]:
+    """Flight document of an archive, equal to the archived one."""
+    archive = _Archive(data)
+    events: List[Any] = []
+    for i, (layout, timestamp) in enumerate(zip(archive.layouts, archive.timestamps)):
+        if layout is None:
+            events.append(archive.raw_events[str(i)])
+        else:
+            events.append({"Timestamp": timestamp, "Changes": dict(zip(layout, archive.values(layout)))})
+    return {k: events if k == "Events" else v for k, v in archive.document.items()}
+
+
+def decode_flight_events(data: bytes) -> List[FlightEvent]:
+    """Events of an archive, the same ones parse_flight_data builds from the JSON."""
+    archive = _Archive(data)
+    events: List[Any] = []
+    for i, (layout, timestamp, dt) in enumerate(zip(archive.layouts, archive.timestamps, archive.datetimes)):
+        if layout is None:
+            # As the JSON path: every entry of the Events list is an event, whatever its keys
+            events.append(FlightEvent.from_json(archive.raw_events[str(i)]))
+        else:
+            events.append(FlightEvent.from_changes(timestamp, layout, archive.values(layout), parsed_timestamp=dt))
+    return events
@@ -0,0 +1,166 @@
+"""Asynchronous analysis of many flight files.
+
+Reading and writing files on network storage is I/O bound, the analysis is CPU bound.
+analyze_many_async overlaps both: every file goes through a pipeline of
+
+    read (thread pool, at most max_reads at a time)
+    -> precheck + parse + evaluate (process pool)
+    -> write (thread pool)
+
+with at most max_in_flight files between the read and the write, so memory stays
+bounded whatever the number of files.
+"""
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional
+
+from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.models.flight_context import FlightContext
+from mam_analyzer.parser import parse_flight_data
+from mam_analyzer.phases.profiles import FULL
+from mam_analyzer.precheck import PrecheckResult, UnanalyzableFlight, precheck_flight_data
+
+if TYPE_CHECKING:
+    from mam_analyzer.sink import SqliteReportSink
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_READS = 8
+
+
+@dataclass
+class BatchResult:
+    path: Path
+    # Report file, when the batch writes to an output directory
+    output: Optional[Path] = None
+    # Report dictionary, when the batch has no output directory nor sink
+    report: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # Why the precheck rejected the flight (the error has its message)
+    rejection: Optional[PrecheckResult] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def analyze_flight_json(
+    data: bytes,
+    context: Optional[FlightContext] = None,
+    precheck: bool = True,
+    profile: str = FULL,
+) -> str:
+    """Parse and evaluate the content of a flight file. Returns the report as JSON text.
+
+    Runs in the worker processes: the text is cheaper to send back than the report dict.
+    With precheck, flights that can't be analyzed raise UnanalyzableFlight before parsing.
+    profile is the name of the analysis profile (see phases.profiles).
+    """
+    if precheck:
+        result = precheck_flight_data(data)
+        if not result.analyzable:
+            raise UnanalyzableFlight(result)
+
+    events = parse_flight_data(data)
+    report = FlightEvaluator(profile=profile).evaluate(events, context).to_dict()
+    return json.dumps(report, indent=2)
+
+
+def report_path(path: Path, output_dir: Path) -> Path:
+    """Report file of a flight in the output directory (same file name as the flight)."""
+    return output_dir / path.name
+
+
+def _write_text(path: Path, text: str) -> None:
+    path.write_text(text, encoding="utf-8")
+
+
+async def analyze_many_async(
+    paths: Iterable[Path],
+    output_dir: Optional[Path] = None,
+    contexts: Optional[Mapping[Path, FlightContext]] = None,
+    max_reads: int = DEFAULT_MAX_READS,
+    max_in_flight: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+    sink: Optional["SqliteReportSink"] = None,
+    precheck: bool = True,
+    profile: str = FULL,
+) -> List[BatchResult]:
+    """Analyze every flight file, overlapping file I/O with the analysis.
+
+    Reports are written to output_dir (see report_path) and / or added to sink under the
+    flight file stem. Without both, they are returned in the results. contexts maps a
+    flight path to its FlightContext. The analysis runs in executor, a process pool of
+    workers processes by default. workers (default one per CPU) also sizes the read-ahead
+    when max_in_flight isn't given: pass the workers of a given executor. A flight that
+    can't be read or analyzed gets an error in its result and doesn't stop the batch. With
+    precheck, flights rejected by precheck.precheck_flight_data aren't parsed and get the
+    reason in their result. profile names the analysis profile of every flight (see
+    phases.profiles).
+
+    Returns one BatchResult per path, in the same order.
+    """
+    paths = [Path(p) for p in paths]
+    contexts = contexts or {}
+
+    workers = workers or os.cpu_count() or 1
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    # Enough files read ahead to keep every worker busy
+    max_in_flight = max_in_flight or 2 * workers + max_reads
+
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    loop = asyncio.get_running_loop()
+    reads = asyncio.Semaphore(max_reads)
+    in_flight = asyncio.Semaphore(max_in_flight)
+
+    async def process(path: Path) -> BatchResult:
+        result = BatchResult(path)
+        async with in_flight:
+            try:
+                async with reads:
+                    data = await loop.run_in_executor(io_pool, path.read_bytes)
+
+                text = await loop.run_in_executor(executor, analyze_flight_json, data, contexts.get(path), precheck, profile)
+                del data
+
+                if output_dir is None and sink is None:
+                    result.report = json.loads(text)
+                if sink is not None:
+                    # In the event loop thread: the sink's connection belongs to it
+                    sink.add_report(path.stem, json.loads(text))
+                if output_dir is not None:
+                    result.output = report_path(path, output_dir)
+                    await loop.run_in_executor(io_pool, _write_text, result.output, text)
+            except UnanalyzableFlight as e:
+                logger.info("Skipping %s: %s", path, e)
+                result.error = str(e)
+                result.rejection = e.result
+            except Exception as e:
+                logger.warning("Can't analyze %s: %r", path, e)
+                result.error = repr(e)
+        return result
+
+    try:
+        with ThreadPoolExecutor(max_workers=2 * max_reads, thread_name_prefix="mam-io") as io_pool:
+            results = await asyncio.gather(*(process(path) for path in paths))
+        if sink is not None:
+            sink.flush()
+        return results
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+def analyze_many(paths: Iterable[Path], **kwargs) -> List[BatchResult]:
+    """Blocking version of analyze_many_async."""
+    return asyncio.run(analyze_many_async(paths, **kwargs))
@@ -0,0 +1,452 @@
+"""Content-addressed cache of analysis results.
+
+A report is stored under the hash of the flight events, the flight context, the report
+variant (analysis profile and issue coalescing) and the ruleset version (hash of the
+analysis source code, thresholds included: _RULESET_SOURCES), so any change to the code
+that produces the report invalidates the previous entries.
+Entries live in a SQLite file, evicted least-recently-used over a size bound.
+
+On a report miss, the same file also memoizes the phase boundaries of each flight and
+the AnalysisResult of every phase, tagged with the version of the analyzer that produced
+it (PhaseMemo). After a rule change only the analyzers whose version changed run again.
+"""
+import hashlib
+import inspect
+import json
+import logging
+import sqlite3
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from mam_analyzer.issue_coalescing import DEFAULT_ISSUE_COALESCING, CoalesceRule
+from mam_analyzer.models.flight_context import FlightContext
+from mam_analyzer.models.flight_events import FlightEvent
+from mam_analyzer.phases.analyzers.result import AnalysisResult
+from mam_analyzer.phases.profiles import FULL
+
+if TYPE_CHECKING:
+    from mam_analyzer.evaluator import FlightEvaluator
+    from mam_analyzer.phases.analyzers.analyzer import Analyzer
+    from mam_analyzer.phases.flight_phase import FlightPhase
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the cached reports changes without a code change in the analyzers
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Access counter used for the LRU order (clocks are too coarse on some platforms),
+# shared by the reports and the memoized phases
+_NEXT_ACCESS = (
+    "SELECT MAX((SELECT COALESCE(MAX(accessed), 0) FROM reports),"
+    " (SELECT COALESCE(MAX(accessed), 0) FROM phase_flights)) + 1"
+)
+
+_PACKAGE_DIR = Path(__file__).resolve().parent
+_ANALYZERS_DIR = _PACKAGE_DIR / "phases" / "analyzers"
+# Modules of the analyzers package shared by every analyzer (not versioned per analyzer)
+_SHARED_ANALYZER_MODULES = {"__init__", "analyzer", "issues", "result"}
+# Modules and packages the analysis output depends on (reporting and I/O modules aren't versioned)
+_RULESET_SOURCES = ("parser.py", "ingest.py", "evaluator.py", "issue_coalescing.py", "models", "phases", "utils")
+
+# A memoized phase: (name, start, end)
+PhaseBoundary = Tuple[str, datetime, datetime]
+
+
+def _is_analyzer_module(path: Path) -> bool:
+    return path.parent == _ANALYZERS_DIR and path.stem not in _SHARED_ANALYZER_MODULES
+
+
+def _ruleset_paths() -> List[Path]:
+    paths = []
+    for name in _RULESET_SOURCES:
+        source = _PACKAGE_DIR / name
+        paths.extend(source.rglob("*.py") if source.is_dir() else [source])
+    return sorted(paths)
+
+
+@lru_cache(maxsize=1)
+def ruleset_version() -> str:
+    """Hash of the source code of the analysis (_RULESET_SOURCES): changes whenever an
+    analyzer, detector or threshold changes."""
+    digest = hashlib.sha256(f"format:{CACHE_FORMAT_VERSION}".encode())
+    for path in _ruleset_paths():
+        digest.update(str(path.relative_to(_PACKAGE_DIR)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def detection_version() -> str:
+    """Hash of the source code of the analysis except the analyzer modules: detectors, phase
+    aggregation, parsing and shared utilities. Changes invalidate the memoized phases."""
+    digest = hashlib.sha256(f"format:{CACHE_FORMAT_VERSION}".encode())
+    for path in _ruleset_paths():
+        if _is_analyzer_module(path):
+            continue
+        digest.update(str(path.relative_to(_PACKAGE_DIR)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _analyzer_class_version(cls: type, version: int) -> str:
+    digest = hashlib.sha256(f"{cls.__module__}.{cls.__qualname__}:{version}".encode())
+    digest.update(Path(inspect.getsourcefile(cls)).read_bytes())
+    return f"{cls.__qualname__}:{version}:{digest.hexdigest()[:16]}"
+
+
+def analyzer_version(analyzer: "Analyzer") -> str:
+    """Version tag of an analyzer: its VERSION attribute plus the hash of its module source."""
+    return _analyzer_class_version(type(analyzer), analyzer.VERSION)
+
+
+def content_key(events: List[FlightEvent], context: Optional[FlightContext] = None) -> str:
+    """Hash of the flight events and context, independent of the analyzer code."""
+    return _content_digest(hashlib.sha256(), events, context)
+
+
+def _coalescing_tag(issue_coalescing: Optional[Mapping[str, CoalesceRule]]) -> str:
+    if issue_coalescing is None:
+        return "none"
+    rules = {
+        code: [rule.max_gap.total_seconds(), f"{rule.magnitude.__module__}.{rule.magnitude.__qualname__}"]
+        for code, rule in issue_coalescing.items()
+    }
+    return json.dumps(rules, sort_keys=True)
+
+
+def report_variant(
+    profile: str = FULL,
+    issue_coalescing: Optional[Mapping[str, CoalesceRule]] = DEFAULT_ISSUE_COALESCING,
+) -> str:
+    """How a report differs from the full one with the default issue coalescing ("" if it doesn't)."""
+    variant = ""
+    if profile != FULL:
+        variant += f"profile:{profile}"
+    if issue_coalescing != DEFAULT_ISSUE_COALESCING:
+        variant += f"coalescing:{_coalescing_tag(issue_coalescing)}"
+    return variant
+
+
+def flight_key(
+    events: List[FlightEvent],
+    context: Optional[FlightContext] = None,
+    profile: str = FULL,
+    issue_coalescing: Optional[Mapping[str, CoalesceRule]] = DEFAULT_ISSUE_COALESCING,
+) -> str:
+    """Cache key of a flight analysis: events + context + ruleset version (+ analysis profile
+    other than the full one, + issue coalescing rules other than the default ones)."""
+    digest = hashlib.sha256(ruleset_version().encode())
+    digest.update(report_variant(profile, issue_coalescing).encode())
+    return _content_digest(digest, events, context)
+
+
+def evaluator_key(events: List[FlightEvent], context: Optional[FlightContext], evaluator: "FlightEvaluator") -> str:
+    """Cache key of the report the evaluator produces for the flight."""
+    return flight_key(events, context, evaluator.profile.name, evaluator.issue_coalescing)
+
+
+def _evaluator_variant(evaluator: "FlightEvaluator") -> str:
+    return report_variant(evaluator.profile.name, evaluator.issue_coalescing)
+
+
+def _content_digest(digest, events: List[FlightEvent], context: Optional[FlightContext]) -> str:
+    context_dict = asdict(context) if context is not None else None
+    digest.update(json.dumps(context_dict, sort_keys=True).encode())
+
+    # Imported events: the same key with or without collapsed static runs
+    for e in events:
+        for d in e.to_dicts():
+            digest.update(json.dumps(d, sort_keys=True, separators=(",", ":")).encode())
+            digest.update(b"\n")
+
+    # Reports of normalized events export what the parser did (FlightReport.ingest)
+    ingest = getattr(events, "ingest", None)
+    if ingest is not None and ingest.changed:
+        digest.update(json.dumps(ingest.to_dict(), sort_keys=True).encode())
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Serialized reports (FlightReport.to_dict, without timings) stored in SQLite.
+
+    Each report is tagged with the ruleset version that produced it and its variant
+    (report_variant), so current_reports() yields one report per flight. When the stored
+    reports exceed max_bytes, the least recently used are evicted.
+    """
+
+    def __init__(self, path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                key TEXT PRIMARY KEY,
+                report TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                accessed INTEGER NOT NULL,
+                ruleset TEXT NOT NULL DEFAULT '',
+                variant TEXT NOT NULL DEFAULT ''
+            )
+            """
+        )
+        # Files written before the reports were tagged: their reports are never current
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(reports)")}
+        for column in ("ruleset", "variant"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE reports ADD COLUMN {column} TEXT NOT NULL DEFAULT ''")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS reports_accessed ON reports (accessed)")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS phase_flights (
+                content TEXT PRIMARY KEY,
+                detection TEXT NOT NULL,
+                phases TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                accessed INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS phase_results (
+                content TEXT NOT NULL,
+                phase TEXT NOT NULL,
+                params TEXT NOT NULL,
+                detection TEXT NOT NULL,
+                analyzer TEXT NOT NULL,
+                result TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (content, phase, params)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS phase_flights_accessed ON phase_flights (accessed)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT report FROM reports WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            logger.debug("Cache miss %s", key)
+            return None
+
+        with self._conn:
+            self._conn.execute(f"UPDATE reports SET accessed = ({_NEXT_ACCESS}) WHERE key = ?", (key,))
+        logger.debug("Cache hit %s", key)
+        return json.loads(row[0])
+
+    def put(self, key: str, report: Dict[str, Any], variant: str = "") -> None:
+        """Store a report of the current ruleset. variant is its report_variant."""
+        # Timings belong to one run, they are never cached
+        report = {k: v for k, v in report.items() if k != "timings"}
+        data = json.dumps(report)
+        with self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO reports (key, report, size, accessed, ruleset, variant)"
+                f" VALUES (?, ?, ?, ({_NEXT_ACCESS}), ?, ?)",
+                (key, data, len(data), ruleset_version(), variant),
+            )
+        self._evict()
+
+    def current_reports(self, part: int = 0, parts: int = 1) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(key, report) of the full reports of the current ruleset in part `part` out of
+        `parts`: one per flight, skipping other profiles, issue coalescings and stale reports."""
+        rows = self._conn.execute(
+            "SELECT key, report FROM reports WHERE ruleset = ? AND variant = '' AND rowid % ? = ?",
+            (ruleset_version(), parts, part),
+        )
+        for key, report in rows:
+            yield key, json.loads(report)
+
+    def _evict(self) -> None:
+        total = self.size_bytes()
+        if total <= self.max_bytes:
+            return
+
+        # Reports and memoized flights (phases + results) in least recently used order
+        rows = self._conn.execute(
+            """
+            SELECT 'report', key, size, accessed FROM reports
+            UNION ALL
+            SELECT 'phases', content,
+                size + (SELECT COALESCE(SUM(size), 0) FROM phase_results r WHERE r.content = f.content),
+                accessed
+            FROM phase_flights f
+            ORDER BY accessed
+            """
+        ).fetchall()
+        reports = []
+        flights = []
+        for kind, key, size, _ in rows:
+            if total <= self.max_bytes:
+                break
+            (reports if kind == "report" else flights).append((key,))
+            total -= size
+
+        with self._conn:
+            self._conn.executemany("DELETE FROM reports WHERE key = ?", reports)
+            self._conn.executemany("DELETE FROM phase_flights WHERE content = ?", flights)
+            self._conn.executemany("DELETE FROM phase_results WHERE content = ?", flights)
+        logger.debug("Evicted %d cached reports and %d memoized flights", len(reports), len(flights))
+
+    def size_bytes(self) -> int:
+        return self._conn.execute(
+            """
+            SELECT (SELECT COALESCE(SUM(size), 0) FROM reports)
+                + (SELECT COALESCE(SUM(size), 0) FROM phase_flights)
+                + (SELECT COALESCE(SUM(size), 0) FROM phase_results)
+            """
+        ).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM reports")
+            self._conn.execute("DELETE FROM phase_flights")
+            self._conn.execute("DELETE FROM phase_results")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.close()
+        return False
+
+    def memo(self, events: List[FlightEvent], context: Optional[FlightContext] = None) -> "PhaseMemo":
+        """Memoized phases and analyzer results of the flight, for PhasesAggregator."""
+        return PhaseMemo(self, content_key(events, context))
+
+    def get_or_evaluate(
+        self,
+        events: List[FlightEvent],
+        context: Optional[FlightContext],
+        evaluator: "FlightEvaluator",
+    ) -> Dict[str, Any]:
+        """Return the cached report of the flight, evaluating and storing it on a miss.
+        The key covers the analysis profile and the issue coalescing of the evaluator."""
+        key = evaluator_key(events, context, evaluator)
+        report = self.get(key)
+        if report is None:
+            report = evaluator.evaluate(events, context).to_dict()
+            self.put(key, report, _evaluator_variant(evaluator))
+        return report
+
+
+def _phase_key(name: str, start: datetime, end: datetime) -> str:
+    return f"{name}|{start.isoformat()}|{end.isoformat()}"
+
+
+class PhaseMemo:
+    """Phase boundaries and per-phase AnalysisResult of one flight.
+
+    Boundaries are valid while detection_version() is unchanged. Each result is reused
+    while the analyzer version tag and the phase parameters are the same. New entries are
+    written by save(), once the phases of the flight are complete.
+    """
+
+    def __init__(self, cache: ResultCache, content: str) -> None:
+        self.cache = cache
+        self.content = content
+        self.detection = detection_version()
+        self.hits = 0
+        self.misses = 0
+        self._results: Optional[Dict[Tuple[str, str], Tuple[str, str, str]]] = None
+        self._pending: List[Tuple[str, str, str, str, str, str, int]] = []
+
+    def phases(self) -> Optional[List[PhaseBoundary]]:
+        """Memoized (name, start, end) of every phase, or None if detection must run."""
+        row = self.cache._conn.execute(
+            "SELECT phases FROM phase_flights WHERE content = ? AND detection = ?",
+            (self.content, self.detection),
+        ).fetchone()
+        if row is None:
+            logger.debug("Phase memo miss %s", self.content)
+            return None
+
+        logger.debug("Phase memo hit %s", self.content)
+        return [
+            (name, datetime.fromisoformat(start), datetime.fromisoformat(end))
+            for name, start, end in json.loads(row[0])
+        ]
+
+    def analysis(
+        self,
+        name: str,
+        start: datetime,
+        end: datetime,
+        analyzer: "Analyzer",
+        phase_params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[AnalysisResult]:
+        """Memoized result of the analyzer over the phase, or None if it must run."""
+        if self._results is None:
+            rows = self.cache._conn.execute(
+                "SELECT phase, params, detection, analyzer, result FROM phase_results WHERE content = ?",
+                (self.content,),
+            ).fetchall()
+            self._results = {(phase, params): (detection, version, result) for phase, params, detection, version, result in rows}
+
+        found = self._results.get((_phase_key(name, start, end), json.dumps(phase_params, sort_keys=True)))
+        if found is None or found[0] != self.detection or found[1] != analyzer_version(analyzer):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return AnalysisResult.from_dict(json.loads(found[2]))
+
+    def put_analysis(
+        self,
+        name: str,
+        start: datetime,
+        end: datetime,
+        analyzer: "Analyzer",
+        phase_params: Optional[Dict[str, Any]],
+        result: AnalysisResult,
+    ) -> None:
+        # Serialized now: the evaluator appends global issues to the result afterwards
+        data = json.dumps(result.to_dict())
+        self._pending.append((
+            self.content,
+            _phase_key(name, start, end),
+            json.dumps(phase_params, sort_keys=True),
+            self.detection,
+            analyzer_version(analyzer),
+            data,
+            len(data),
+        ))
+
+    def save(self, phases: List["FlightPhase"]) -> None:
+        """Store the phase boundaries and the results computed in this run."""
+        data = json.dumps([(p.name, p.start.isoformat(), p.end.isoformat()) for p in phases])
+        conn = self.cache._conn
+        with conn:
+            # Results of a previous detection version can't be reached anymore
+            conn.execute(
+                "DELETE FROM phase_results WHERE content = ? AND detection != ?",
+                (self.content, self.detection),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO phase_results (content, phase, params, detection, analyzer, result, size)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+            conn.execute(
+                f"INSERT OR REPLACE INTO phase_flights (content, detection, phases, size, accessed)"
+                f" VALUES (?, ?, ?, ?, ({_NEXT_ACCESS}))",
+                (self.content, self.detection, data, len(data)),
+            )
+        self._pending = []
+        self._results = None
+        self.cache._evict()
@@ -1,24 +1,46 @@
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Mapping, Optional, Union
 
 from mam_analyzer.models.flight_context import FlightContext
 from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.phases_aggregator import PhasesAggregator
 from mam_analyzer.phases.flight_phase import FlightPhase
+from mam_analyzer.phases.profiles import AnalysisProfile
+from mam_analyzer.preview import DEFAULT_PREVIEW_STEP, PREVIEW_PROFILE, decimate_events
 from mam_analyzer.phases.analyzers.issues import Issues
 from mam_analyzer.phases.analyzers.result import AnalysisIssue
 from mam_analyzer.flight_report import FlightReport
+from mam_analyzer.ingest import expand_static_runs
+from mam_analyzer.issue_coalescing import DEFAULT_ISSUE_COALESCING, CoalesceRule
+from mam_analyzer.profiling import NULL_PROFILER, Profiler
 from mam_analyzer.utils.engines import all_engines_are_off, some_engine_is_off, some_engine_is_on
 from mam_analyzer.utils.fuel import event_has_fuel, get_fuel_kg_as_float
 from mam_analyzer.utils.location import event_has_location
-from mam_analyzer.utils.search import find_first_index_forward
+from mam_analyzer.utils.search import find_first_index_forward, find_key_index_backward
 from mam_analyzer.utils.units import coords_differ, haversine, meters_to_nm
 from mam_analyzer.utils.weight import event_has_zfw, get_zfw_as_int
 
+if TYPE_CHECKING:
+    from mam_analyzer.cache import PhaseMemo, ResultCache
 
 
 class FlightEvaluator:
-    def __init__(self):
-        self.aggregator = PhasesAggregator()
+    def __init__(
+        self,
+        profiler: Optional[Profiler] = None,
+        phase_cache: Optional["ResultCache"] = None,
+        issue_coalescing: Optional[Mapping[str, CoalesceRule]] = DEFAULT_ISSUE_COALESCING,
+        profile: Union[str, AnalysisProfile, None] = None,
+    ):
+        self.profiler = profiler or NULL_PROFILER
+        # Phases detected and analyzers run, by name or AnalysisProfile (see phases.profiles)
+        self.aggregator = PhasesAggregator(self.profiler, profile)
+        self.profile = self.aggregator.profile
+        # Memoizes phase boundaries and analyzer results between runs (full profile only)
+        self.phase_cache = phase_cache
+        # Repeated issues merged into intervals in the reports (None keeps every issue)
+        self.issue_coalescing = issue_coalescing
+        # Detection only aggregator of the previews, built on the first one
+        self._preview_aggregator: Optional[PhasesAggregator] = None
 
     def calculate_global_metrics(self, phases: List[FlightPhase])-> Dict[str, Any]:
         metrics: dict[str, Any] = {}
@@ -55,9 +77,52 @@ class FlightEvaluator:
         return metrics
 
     def evaluate(self, events: List[FlightEvent], context: Optional[FlightContext] = None) -> FlightReport:
-        phases: List[FlightPhase] = self.aggregator.identify_phases(events, context)
-        global_metrics = self.calculate_global_metrics(phases)
-        return FlightReport(phases=phases, global_metrics=global_metrics)
+        memo = None
+        if self.phase_cache is not None and self.profile.is_full:
+            memo = self.phase_cache.memo(events, context)
+
+        return self.__evaluate(self.aggregator, events, context, memo)
+
+    def preview(
+        self,
+        events: List[FlightEvent],
+        context: Optional[FlightContext] = None,
+        step: int = DEFAULT_PREVIEW_STEP,
+    ) -> FlightReport:
+        """Provisional report: phase timeline and global metrics detected over a decimated
+        track (see preview module), without analyzers. Boundaries and metrics are
+        approximate."""
+        if self._preview_aggregator is None:
+            self._preview_aggregator = PhasesAggregator(self.profiler, PREVIEW_PROFILE)
+
+        with self.profiler.stage("decimate", len(events)):
+            decimated = decimate_events(events, step)
+
+        report = self.__evaluate(self._preview_aggregator, decimated, context, None)
+        report.provisional = True
+        return report
+
+    def __evaluate(
+        self,
+        aggregator: PhasesAggregator,
+        events: List[FlightEvent],
+        context: Optional[FlightContext],
+        memo: Optional["PhaseMemo"],
+    ) -> FlightReport:
+        with self.profiler.stage("identify_phases", len(events)):
+            phases: List[FlightPhase] = aggregator.identify_phases(events, context, memo)
+
+        with self.profiler.stage("global_metrics", len(events)):
+            global_metrics = self.calculate_global_metrics(phases)
+
+        return FlightReport(
+            phases=phases,
+            global_metrics=global_metrics,
+            profiler=self.profiler,
+            issue_coalescing=self.issue_coalescing,
+            ingest=getattr(events, "ingest", None),
+            profile=None if aggregator.profile.is_full else aggregator.profile.name,
+        )
 
     def calculate_airborne_time(self, phases: List[FlightPhase]) -> int:
         start_airborne_time = None
@@ -167,12 +232,8 @@ class FlightEvaluator:
         last_fuel_event_kg = 0
 
         def look_for_fuel_event(phase: FlightPhase) -> float:
-            fuel_event_kg = None
-            for event in reversed(phase.events):
-                if event_has_fuel(event):
-                    fuel_event_kg = get_fuel_kg_as_float(event)
-                    break
-            return fuel_event_kg
+            found = find_key_index_backward(phase.events, "FuelKg")
+            return get_fuel_kg_as_float(found[1]) if found is not None else None
 
         for phase in reversed(phases):
             last_fuel_event_kg = look_for_fuel_event(phase)
@@ -230,7 +291,8 @@ class FlightEvaluator:
         max_variation = initial_zfw * 0.002
         for i in range(1, len(phases) - 1):
             phase = phases[i]
-            for event in phase.events:
+            # An issue per event: collapsed runs count all their events
+            for event in expand_static_runs(phase.events):
                 if event_has_zfw(event) and abs(initial_zfw - get_zfw_as_int(event)) > max_variation :
                     phase.analysis.issues.append(
                         AnalysisIssue(
@@ -0,0 +1,331 @@
+"""Fleet statistics over many analyzed flights.
+
+Reports are read one at a time from JSON report files, a ResultCache file or a
+SqliteReportSink database, reduced to a FlightSummary and folded into per-group
+accumulators (count / mean / standard deviation / min / max of numeric phase metrics,
+flights and occurrences of each issue code). Memory only depends on the number of
+groups, and partial aggregates of disjoint parts of the source can be computed in
+parallel and merged.
+"""
+import json
+import math
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_METRICS = ("LandingVSFpm", "LandingRunwayTouchdownPct", "TakeoffRunwayRemainingPct")
+
+# Group of the flights when no group_by is given
+ALL_FLIGHTS = "all"
+
+
+@dataclass
+class FlightSummary:
+    """What the aggregation needs from a report: phase metrics and issue codes per phase."""
+    name: str
+    global_metrics: Dict[str, Any]
+    # (phase name, phase metrics, issue codes). A code is repeated for every issue of a coalesced interval
+    phases: List[Tuple[str, Dict[str, Any], List[str]]]
+
+    @staticmethod
+    def from_report(name: str, report: Dict[str, Any]) -> "FlightSummary":
+        """Summary of a FlightReport.to_dict()."""
+        return FlightSummary(
+            name=name,
+            global_metrics=report["global"],
+            phases=[
+                (
+                    p["name"],
+                    p["analysis"]["phase_metrics"],
+                    [i["code"] for i in p["analysis"]["issues"] for _ in range(i.get("count", 1))],
+                )
+                for p in report["phases"]
+            ],
+        )
+
+    def metric(self, key: str) -> Any:
+        """Value of the first phase with the metric, or None."""
+        for _, metrics, _ in self.phases:
+            if key in metrics:
+                return metrics[key]
+        return None
+
+
+GroupBy = Callable[[FlightSummary], Optional[Hashable]]
+
+
+def _metric_value(key: str, summary: FlightSummary) -> Optional[Hashable]:
+    return summary.metric(key)
+
+
+def _name_part(index: int, sep: str, summary: FlightSummary) -> Optional[Hashable]:
+    parts = summary.name.split(sep)
+    return parts[index] if -len(parts) <= index < len(parts) else None
+
+
+def by_metric(key: str) -> GroupBy:
+    """Group by the value of a phase metric (Ex: LandingRunway)."""
+    return partial(_metric_value, key)
+
+
+def by_name_part(index: int, sep: str = "-") -> GroupBy:
+    """Group by a part of the flight name (Ex: aircraft type -1 in LEPA-LEPP-737)."""
+    return partial(_name_part, index, sep)
+
+
+@dataclass
+class MetricStats:
+    count: int = 0
+    mean: float = 0.0
+    # Sum of squared differences from the mean (Welford), mergeable between partial aggregates
+    m2: float = 0.0
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "MetricStats") -> None:
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.min, self.max = other.count, other.mean, other.m2, other.min, other.max
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def stdev(self) -> Optional[float]:
+        """Sample standard deviation."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "mean": self.mean if self.count else None, "stdev": self.stdev, "min": self.min, "max": self.max}
+
+
+@dataclass
+class IssueStats:
+    # Flights with the issue, and total occurrences
+    flights: int = 0
+    occurrences: int = 0
+
+    def merge(self, other: "IssueStats") -> None:
+        self.flights += other.flights
+        self.occurrences += other.occurrences
+
+
+@dataclass
+class GroupStats:
+    flights: int = 0
+    metrics: Dict[str, MetricStats] = field(default_factory=dict)
+    issues: Dict[str, IssueStats] = field(default_factory=dict)
+
+    def issue_rate(self, code: str) -> float:
+        """Fraction of the flights of the group with the issue."""
+        issue = self.issues.get(code)
+        return issue.flights / self.flights if issue and self.flights else 0.0
+
+    def merge(self, other: "GroupStats") -> None:
+        self.flights += other.flights
+        for key, stats in other.metrics.items():
+            self.metrics.setdefault(key, MetricStats()).merge(stats)
+        for code, stats in other.issues.items():
+            self.issues.setdefault(code, IssueStats()).merge(stats)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "flights": self.flights,
+            "metrics": {key: stats.to_dict() for key, stats in sorted(self.metrics.items())},
+            "issues": {
+                code: {"flights": stats.flights, "occurrences": stats.occurrences, "rate": self.issue_rate(code)}
+                for code, stats in sorted(self.issues.items())
+            },
+        }
+
+
+class FleetAggregate:
+    """Grouped statistics of phase metrics and issue codes.
+
+    issue_codes None counts every code. Non numeric metric values are skipped.
+    """
+
+    def __init__(
+        self,
+        metrics: Sequence[str] = DEFAULT_METRICS,
+        issue_codes: Optional[Sequence[str]] = None,
+        group_by: Optional[GroupBy] = None,
+    ) -> None:
+        self.metrics = frozenset(metrics)
+        self.issue_codes = frozenset(issue_codes) if issue_codes is not None else None
+        self.group_by = group_by
+        self.groups: Dict[Hashable, GroupStats] = {}
+
+    def add(self, summary: FlightSummary) -> None:
+        key = self.group_by(summary) if self.group_by is not None else ALL_FLIGHTS
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = GroupStats()
+        group.flights += 1
+
+        occurrences: Dict[str, int] = {}
+        for _, metrics, codes in summary.phases:
+            for metric, value in metrics.items():
+                if metric in self.metrics and isinstance(value, (int, float)) and not isinstance(value, bool):
+                    stats = group.metrics.get(metric)
+                    if stats is None:
+                        stats = group.metrics[metric] = MetricStats()
+                    stats.add(value)
+            for code in codes:
+                if self.issue_codes is None or code in self.issue_codes:
+                    occurrences[code] = occurrences.get(code, 0) + 1
+
+        for code, count in occurrences.items():
+            stats = group.issues.get(code)
+            if stats is None:
+                stats = group.issues[code] = IssueStats()
+            stats.flights += 1
+            stats.occurrences += count
+
+    def add_all(self, summaries: Iterable[FlightSummary]) -> "FleetAggregate":
+        for summary in summaries:
+            self.add(summary)
+        return self
+
+    def merge(self, other: "FleetAggregate") -> None:
+        for key, stats in other.groups.items():
+            self.groups.setdefault(key, GroupStats()).merge(stats)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {str(key): self.groups[key].to_dict() for key in sorted(self.groups, key=str)}
+
+
+# === Sources ===
+# Every source yields the summaries of part `part` out of `parts` disjoint parts
+
+
+def iter_report_files(paths: Sequence[Path], part: int = 0, parts: int = 1) -> Iterator[FlightSummary]:
+    """Summaries of report JSON files (FlightReport.to_dict), named by the file stem."""
+    for path in paths[part::parts]:
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+        yield FlightSummary.from_report(Path(path).stem, report)
+
+
+def iter_cache_reports(path: Path, part: int = 0, parts: int = 1) -> Iterator[FlightSummary]:
+    """Summaries of the reports of a ResultCache file, named by their cache key.
+
+    A cache keeps a flight under several keys (analysis profiles, issue coalescings, stale
+    ruleset versions until evicted): only its full report of the current ruleset is read.
+    """
+    # Imported here: the other sources don't need the analysis modules
+    from mam_analyzer.cache import ResultCache
+
+    with ResultCache(path) as cache:
+        for key, report in cache.current_reports(part, parts):
+            # Partial reports stored without their variant
+            if "profile" not in report:
+                yield FlightSummary.from_report(key, report)
+
+
+def iter_sink_reports(path: Path, part: int = 0, parts: int = 1) -> Iterator[FlightSummary]:
+    """Summaries of the flights of a SqliteReportSink database."""
+    conn = sqlite3.connect(str(path))
+    try:
+        flights = conn.execute("SELECT id, name FROM flights WHERE id % ? = ? ORDER BY id", (parts, part)).fetchall()
+        for flight_id, name in flights:
+            phases = {
+                idx: (phase_name, {}, [])
+                for idx, phase_name in conn.execute("SELECT idx, name FROM phases WHERE flight_id = ? ORDER BY idx", (flight_id,))
+            }
+            for idx, key, value in conn.execute("SELECT phase_idx, name, value FROM phase_metrics WHERE flight_id = ?", (flight_id,)):
+                phases[idx][1][key] = value
+            for idx, code, count in conn.execute("SELECT phase_idx, code, count FROM issues WHERE flight_id = ? ORDER BY rowid", (flight_id,)):
+                phases[idx][2].extend([code] * count)
+            global_metrics = dict(conn.execute("SELECT name, value FROM global_metrics WHERE flight_id = ?", (flight_id,)))
+            yield FlightSummary(name, global_metrics, [phases[idx] for idx in sorted(phases)])
+    finally:
+        conn.close()
+
+
+Source = Union[Path, Sequence[Path]]
+
+
+def iter_summaries(source: Source, part: int = 0, parts: int = 1) -> Iterator[FlightSummary]:
+    """Summaries of a source: report JSON files, a directory of them, or a SQLite file
+    written by ResultCache or SqliteReportSink (detected from its tables)."""
+    if not isinstance(source, (str, Path)):
+        return iter_report_files(list(source), part, parts)
+
+    source = Path(source)
+    if source.is_dir():
+        return iter_report_files(sorted(source.glob("*.json")), part, parts)
+
+    with open(source, "rb") as f:
+        is_sqlite = f.read(16) == b"SQLite format 3\x00"
+    if not is_sqlite:
+        return iter_report_files([source], part, parts)
+
+    conn = sqlite3.connect(str(source))
+    try:
+        tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        conn.close()
+    if "flights" in tables:
+        return iter_sink_reports(source, part, parts)
+    if "reports" in tables:
+        return iter_cache_reports(source, part, parts)
+    raise ValueError(f"{source} is neither a report cache nor a report database")
+
+
+def _aggregate_part(
+    source: Source,
+    part: int,
+    parts: int,
+    metrics: Sequence[str],
+    issue_codes: Optional[Sequence[str]],
+    group_by: Optional[GroupBy],
+) -> FleetAggregate:
+    return FleetAggregate(metrics, issue_codes, group_by).add_all(iter_summaries(source, part, parts))
+
+
+def aggregate_fleet(
+    source: Source,
+    metrics: Sequence[str] = DEFAULT_METRICS,
+    issue_codes: Optional[Sequence[str]] = None,
+    group_by: Optional[GroupBy] = None,
+    workers: int = 1,
+) -> FleetAggregate:
+    """Grouped statistics of every flight of the source (see iter_summaries).
+
+    With workers > 1 the source is split in that many parts aggregated in a process pool
+    (group_by must be picklable, like by_metric / by_name_part) and merged.
+    """
+    if not isinstance(source, (str, Path)):
+        source = [Path(p) for p in source]
+
+    if workers <= 1:
+        return _aggregate_part(source, 0, 1, metrics, issue_codes, group_by)
+
+    result = FleetAggregate(metrics, issue_codes, group_by)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = [
+            executor.submit(_aggregate_part, source, part, workers, metrics, issue_codes, group_by)
+            for part in range(workers)
+        ]
+        for future in partials:
+            result.merge(future.result())
+    return result
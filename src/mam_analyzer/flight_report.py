@@ -1,15 +1,48 @@
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Mapping, Optional
 
+from mam_analyzer.ingest import IngestSummary
+from mam_analyzer.issue_coalescing import CoalesceRule
 from mam_analyzer.phases.flight_phase import FlightPhase
+from mam_analyzer.profiling import NULL_PROFILER, Profiler
 
 @dataclass
 class FlightReport:
     phases: List[FlightPhase]
     global_metrics: Dict[str, Any]
+    profiler: Optional[Profiler] = None
+    # Rules merging repeated issues into intervals on export, None exports every issue
+    issue_coalescing: Optional[Mapping[str, CoalesceRule]] = None
+    # What the parser did to the events (reordering, duplicates), None if not parsed by it
+    ingest: Optional[IngestSummary] = None
+    # Name of the analysis profile, None for the full analysis
+    profile: Optional[str] = None
+    # Approximate report from a decimated track (FlightEvaluator.preview)
+    provisional: bool = False
 
-    def to_dict(self) -> dict:
-        return {
-            "global": self.global_metrics,
-            "phases": [p.to_dict() for p in self.phases],
-        }
+    def to_dict(self, raw_issues: bool = False) -> dict:
+        """The report as a JSON-friendly dict. raw_issues exports every issue even with
+        issue_coalescing rules."""
+        profiler = self.profiler or NULL_PROFILER
+        issue_coalescing = None if raw_issues else self.issue_coalescing
+
+        with profiler.stage("serialize"):
+            result = {
+                "global": self.global_metrics,
+                "phases": [p.to_dict(issue_coalescing) for p in self.phases],
+            }
+
+        if self.profile is not None:
+            result["profile"] = self.profile
+        if self.provisional:
+            result["provisional"] = True
+
+        # Only exported when the events needed normalizing
+        if self.ingest is not None and self.ingest.changed:
+            result["ingest"] = self.ingest.to_dict()
+
+        # Timings are only exported when profiling is enabled
+        if profiler.enabled:
+            result["timings"] = profiler.to_dict()
+
+        return result
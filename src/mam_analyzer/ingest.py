@@ -0,0 +1,150 @@
+"""Stages applied to the decoded events of a flight before the analysis.
+
+normalize_events makes the events ordered by timestamp, which the searches by time and
+the EventIndex bisects rely on: it checks the order in one pass, stably sorts the events
+only when a clock jump left some out of order, and drops exact duplicates (same
+timestamp and changes, Ex: a chunk uploaded twice). What it did is exported in the
+report (IngestSummary).
+
+Long sit-at-gate recordings before the engine start and after the shutdown report the
+same full event again and again (same position, fuel, engines off...).
+collapse_static_runs keeps the first and the last event of each run of identical ground
+events and collapses the ones in between into a StaticRun record. Detectors and
+analyzers see the same states and the same first / last timestamps, so the phase
+boundaries are exactly the ones of the whole flight. Checks raising an issue per event
+(ZFW changes, taxi overspeed) iterate expand_static_runs, so they count every imported
+event. Reports export every event again (FlightEvent.to_dicts).
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from mam_analyzer.models.flight_events import FlightEvent, StaticRun
+
+@dataclass
+class IngestSummary:
+    """What normalize_events did to the events of a flight."""
+    # Imported events
+    events: int = 0
+    # Events with a timestamp before the one of the previous event
+    out_of_order: int = 0
+    # Exact duplicates dropped
+    duplicates: int = 0
+
+    @property
+    def reordered(self) -> bool:
+        return self.out_of_order > 0
+
+    @property
+    def changed(self) -> bool:
+        return self.out_of_order > 0 or self.duplicates > 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "events": self.events,
+            "reordered": self.reordered,
+            "out_of_order": self.out_of_order,
+            "duplicates": self.duplicates,
+        }
+
+
+def _event_key(e: FlightEvent) -> Any:
+    return e.to_dict()
+
+
+def _drop_duplicates(events: List[FlightEvent]) -> List[FlightEvent]:
+    """Events without the exact duplicates of an event with the same timestamp (sorted events)."""
+    result: List[FlightEvent] = []
+    # Events of the current timestamp, usually one
+    group: List[Any] = []
+    for e in events:
+        if result and e.timestamp == result[-1].timestamp:
+            if not group:
+                group.append(_event_key(result[-1]))
+            key = _event_key(e)
+            if key in group:
+                continue
+            group.append(key)
+        else:
+            group = []
+        result.append(e)
+    return result
+
+
+def normalize_events(events: List[FlightEvent]) -> Tuple[List[FlightEvent], IngestSummary]:
+    """Events ordered by timestamp without exact duplicates. Events already ordered and
+    without duplicates are returned as they are."""
+    summary = IngestSummary(events=len(events))
+    has_ties = False
+    for a, b in zip(events, events[1:]):
+        if b.timestamp < a.timestamp:
+            summary.out_of_order += 1
+        elif b.timestamp == a.timestamp:
+            has_ties = True
+
+    if summary.out_of_order:
+        # Stable: events with the same timestamp keep their order
+        events = sorted(events, key=lambda e: e.timestamp)
+        has_ties = True
+    if has_ties:
+        deduplicated = _drop_duplicates(events)
+        summary.duplicates = len(events) - len(deduplicated)
+        if summary.duplicates:
+            events = deduplicated
+
+    return events, summary
+
+
+# Shorter runs are kept as they are: a run keeps two events anyway
+MIN_STATIC_RUN = 3
+
+
+def _is_static_ground_event(e: FlightEvent) -> bool:
+    return (
+        type(e) is FlightEvent
+        and e._raw is None
+        and e._timestamp_raw is not None
+        and e.on_ground is True
+        and e.is_full_event()
+    )
+
+
+def _same_state(a: FlightEvent, b: FlightEvent) -> bool:
+    return a._layout is b._layout and a._values == b._values
+
+
+def collapse_static_runs(events: List[FlightEvent], min_run: int = MIN_STATIC_RUN) -> List[FlightEvent]:
+    """Events with the runs of at least min_run identical full events on ground collapsed."""
+    result: List[FlightEvent] = []
+    n = len(events)
+    i = 0
+    while i < n:
+        first = events[i]
+        j = i + 1
+        if _is_static_ground_event(first):
+            while j < n and _is_static_ground_event(events[j]) and _same_state(first, events[j]):
+                j += 1
+
+        if j - i >= max(min_run, 3):
+            last = events[j - 1]
+            collapsed = tuple(e._timestamp_raw for e in events[i + 1:j - 1])
+            result.append(StaticRun.collapse(first, last, collapsed))
+            result.append(last)
+        else:
+            result.extend(events[i:j])
+        i = j
+
+    return result
+
+
+def expanded_event_count(events: List[FlightEvent]) -> int:
+    """Number of imported events of the list (collapsed runs count all their events)."""
+    return sum(e.run_count - 1 if type(e) is StaticRun else 1 for e in events)
+
+
+def expand_static_runs(events: Iterable[FlightEvent]) -> Iterator[FlightEvent]:
+    """The events with the collapsed runs expanded again into plain events."""
+    for e in events:
+        if type(e) is StaticRun:
+            yield from e.expand()
+        else:
+            yield e
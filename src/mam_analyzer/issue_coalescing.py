@@ -0,0 +1,123 @@
+"""Coalescing of repeated issues into time intervals.
+
+Analyzers report an AnalysisIssue per offending event, so a sustained fast taxi or a
+steep approach yields one issue every few seconds. For the codes with a CoalesceRule,
+issues of the same code closer than max_gap are merged into an IssueInterval (start,
+end, count and the peak value). AnalysisResult keeps the raw issues: coalescing is
+applied when a report is serialized.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from mam_analyzer.phases.analyzers.issues import Issues
+from mam_analyzer.phases.analyzers.result import AnalysisIssue
+
+
+def numeric_value(value: Any) -> Optional[float]:
+    """Issue value as a number (Ex: TaxiOverspeed knots)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def abs_first_field(value: Any) -> Optional[float]:
+    """Absolute value of the first field of a "a|b|c" issue value (Ex: approach "vs|agl|threshold")."""
+    if value is None:
+        return None
+    number = numeric_value(str(value).split("|", 1)[0])
+    return abs(number) if number is not None else None
+
+
+@dataclass(frozen=True)
+class CoalesceRule:
+    # Issues further apart start a new interval
+    max_gap: timedelta = timedelta(seconds=10)
+    # Magnitude of an issue value: the interval peak is the issue with the greatest one
+    magnitude: Callable[[Any], Optional[float]] = numeric_value
+
+
+_APPROACH_RULE = CoalesceRule(magnitude=abs_first_field)
+
+DEFAULT_ISSUE_COALESCING: Dict[str, CoalesceRule] = {
+    Issues.ISSUE_TAXI_OVERSPEED: CoalesceRule(),
+    Issues.ISSUE_APP_HIGH_VS_BELOW_2000AGL: _APPROACH_RULE,
+    Issues.ISSUE_APP_HIGH_VS_BELOW_1000AGL: _APPROACH_RULE,
+    Issues.ISSUE_APP_HIGH_VS_AVG_BELOW_1000AGL: _APPROACH_RULE,
+    Issues.ISSUE_APP_HIGH_VS_BELOW_500AGL: _APPROACH_RULE,
+    Issues.ISSUE_APP_HIGH_VS_AVG_BELOW_500AGL: _APPROACH_RULE,
+}
+
+
+@dataclass
+class IssueInterval:
+    code: str
+    start: Optional[datetime]
+    end: Optional[datetime]
+    # Value of the peak issue
+    peak: Any
+    # Raw issues of the interval
+    issues: List[AnalysisIssue] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.issues)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same form as a raw issue (timestamp is the start, value the peak) plus end and
+        count when more than one issue was merged."""
+        result = {
+            "code": self.code,
+            "timestamp": self.start.isoformat() if self.start else None,
+            "value": self.peak,
+        }
+        if self.count > 1:
+            result["end"] = self.end.isoformat() if self.end else None
+            result["count"] = self.count
+        return result
+
+
+def coalesce_issues(
+    issues: List[AnalysisIssue],
+    rules: Mapping[str, CoalesceRule] = DEFAULT_ISSUE_COALESCING,
+) -> List[IssueInterval]:
+    """Intervals of the issues, in the order of their first issue.
+
+    Issues of a code without rule (or without timestamp) are an interval each.
+    """
+    intervals: List[IssueInterval] = []
+    # Open interval of each code, with the magnitude of its peak
+    open_intervals: Dict[str, IssueInterval] = {}
+    peaks: Dict[str, Optional[float]] = {}
+
+    for issue in issues:
+        rule = rules.get(issue.code)
+        if rule is None or issue.timestamp is None:
+            intervals.append(IssueInterval(issue.code, issue.timestamp, issue.timestamp, issue.value, [issue]))
+            continue
+
+        magnitude = rule.magnitude(issue.value)
+        current = open_intervals.get(issue.code)
+        if current is not None and issue.timestamp - current.end <= rule.max_gap:
+            current.issues.append(issue)
+            current.end = issue.timestamp
+            peak = peaks[issue.code]
+            if magnitude is not None and (peak is None or magnitude > peak):
+                current.peak = issue.value
+                peaks[issue.code] = magnitude
+            continue
+
+        current = IssueInterval(issue.code, issue.timestamp, issue.timestamp, issue.value, [issue])
+        intervals.append(current)
+        open_intervals[issue.code] = current
+        peaks[issue.code] = magnitude
+
+    return intervals
+
+
+def coalesced_issue_dicts(
+    issues: List[AnalysisIssue],
+    rules: Mapping[str, CoalesceRule] = DEFAULT_ISSUE_COALESCING,
+) -> List[Dict[str, Any]]:
+    return [interval.to_dict() for interval in coalesce_issues(issues, rules)]
@@ -0,0 +1,51 @@
+import json
+import logging
+from datetime import datetime, timezone
+from typing import IO, Optional
+
+ROOT_LOGGER_NAME = "mam_analyzer"
+
+# Attributes present in every LogRecord, everything else comes from `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as a single JSON line (for batch and service modes)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                data[key] = value
+
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(data, default=str)
+
+
+def configure_logging(
+    level: str = "WARNING",
+    json_format: bool = False,
+    stream: Optional[IO[str]] = None,
+) -> logging.Handler:
+    """Attach a stream handler to the `mam_analyzer` logger hierarchy.
+
+    Returns the handler so callers can remove it later.
+    """
+    handler = logging.StreamHandler(stream)
+    if json_format:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    logger = logging.getLogger(ROOT_LOGGER_NAME)
+    logger.setLevel(level.upper())
+    logger.addHandler(handler)
+    return handler
@@ -0,0 +1,108 @@
+"""Interned key layouts of the ACARS event changes.
+
+MAM ACARS reports a fixed set of keys: full events carry every state key, delta events
+only the keys that changed. Instead of one dict per event, an event keeps a ChangeLayout
+(the tuple of its keys, shared by every event with the same keys in the same order) and
+a tuple with the values in that order.
+
+Every key has a bit: the layout mask tells which keys the event has, so a full event is
+exactly one whose mask contains every full event key.
+"""
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+# State keys present in every full event (engines depend on the aircraft)
+FULL_EVENT_KEYS = (
+    "Latitude",
+    "Longitude",
+    "onGround",
+    "Altitude",
+    "AGLAltitude",
+    "Altimeter",
+    "VSFpm",
+    "Heading",
+    "GSKnots",
+    "IASKnots",
+    "QNHSet",
+    "Flaps",
+    "Gear",
+    "FuelKg",
+    "Squawk",
+    "AP",
+)
+
+ACARS_KEYS = FULL_EVENT_KEYS + (
+    "Engine 1",
+    "Engine 2",
+    "Engine 3",
+    "Engine 4",
+    "ZFW",
+    "VSLast3Avg",
+    "LandingVSFpm",
+)
+
+# Layouts interned at most (a malformed input can't grow the table without bound)
+MAX_INTERNED_LAYOUTS = 65536
+
+_key_bits: Dict[str, int] = {key: bit for bit, key in enumerate(ACARS_KEYS)}
+_key_bits_lock = threading.Lock()
+
+
+def key_bit(key: str) -> int:
+    """Bit of the key in the layout masks. Keys out of the ACARS set get the next free bit."""
+    bit = _key_bits.get(key)
+    if bit is None:
+        with _key_bits_lock:
+            bit = _key_bits.setdefault(key, len(_key_bits))
+    return bit
+
+
+def keys_mask(keys: Iterable[str]) -> int:
+    mask = 0
+    for key in keys:
+        mask |= 1 << key_bit(key)
+    return mask
+
+
+FULL_EVENT_MASK = keys_mask(FULL_EVENT_KEYS)
+
+
+class ChangeLayout:
+    """Keys of the changes of an event, in their original order."""
+
+    __slots__ = ("keys", "index", "mask", "is_full")
+
+    def __init__(self, keys: Tuple[str, ...]) -> None:
+        self.keys = keys
+        # Position of each key in the values tuple
+        self.index: Dict[str, int] = {key: i for i, key in enumerate(keys)}
+        self.mask = keys_mask(keys)
+        self.is_full = self.mask & FULL_EVENT_MASK == FULL_EVENT_MASK
+
+    def position(self, key: str) -> Optional[int]:
+        return self.index.get(key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ChangeLayout) and self.keys == other.keys
+
+    def __hash__(self) -> int:
+        return hash(self.keys)
+
+    def __repr__(self) -> str:
+        return f"ChangeLayout({self.keys!r})"
+
+
+_layouts: Dict[Tuple[str, ...], ChangeLayout] = {}
+
+
+def intern_layout(keys: Tuple[str, ...]) -> ChangeLayout:
+    """Shared layout of the keys."""
+    layout = _layouts.get(keys)
+    if layout is None:
+        layout = ChangeLayout(keys)
+        if len(_layouts) < MAX_INTERNED_LAYOUTS:
+            _layouts[keys] = layout
+    return layout
+
+
+EMPTY_LAYOUT = intern_layout(())
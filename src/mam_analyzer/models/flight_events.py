@@ -1,10 +1,26 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 
+from mam_analyzer.models.event_layout import EMPTY_LAYOUT, ChangeLayout, intern_layout
 from mam_analyzer.utils.parsing import parse_coordinate, parse_timestamp
 
 
+def _parse_bool(val: Optional[str]) -> Optional[bool]:
+    if val is None:
+        return None
+    return val.strip().lower() == "true"
+
+
+def _parse_int(val: Optional[str]) -> Optional[int]:
+    if val is None:
+        return None
+    try:
+        return int(val)
+    except ValueError:
+        return None
+
+
 @dataclass(slots=True)
 class FlightEvent:
     timestamp: datetime
@@ -15,45 +31,130 @@ class FlightEvent:
     latitude: Optional[float] = None
     longitude: Optional[float] = None
 
-    # Other changes not so important to trace
-    other_changes: Dict[str, str] = None
+    # Keys of the other changes, interned and shared between events (see event_layout)
+    _layout: ChangeLayout = EMPTY_LAYOUT
+    # Values of the changes, in the order of the layout keys
+    _values: Tuple[Any, ...] = ()
 
-    # Raw (export purposes)
-    _raw: Dict[str, Any] = None
+    # Timestamp as imported (export purposes)
+    _timestamp_raw: Optional[str] = None
+    # Whole imported event, only kept when it isn't {"Timestamp", "Changes"} (export purposes)
+    _raw: Optional[Dict[str, Any]] = None
 
     def is_full_event(self) -> bool:
-        return len(self.other_changes) > 10
+        """True if the event reports every state key (not only the changes)."""
+        return self._layout.is_full
+
+    @property
+    def changes_mask(self) -> int:
+        """Bitmask of the keys of the changes (see event_layout.key_bit)."""
+        return self._layout.mask
+
+    def get_change(self, key: str) -> Optional[Any]:
+        """Value of a key of the changes, None if the event doesn't have it."""
+        i = self._layout.index.get(key)
+        return None if i is None else self._values[i]
+
+    def has_change(self, key: str) -> bool:
+        return key in self._layout.index
+
+    def change_items(self) -> Iterator[Tuple[str, Any]]:
+        """(key, value) of the changes in their original order."""
+        return zip(self._layout.keys, self._values)
+
+    @property
+    def other_changes(self) -> Dict[str, Any]:
+        """Changes of the event as a new dict. The analysis uses get_change / change_items."""
+        return dict(zip(self._layout.keys, self._values))
 
     @staticmethod
-    def from_json(event: Dict[str, Any]) -> "FlightEvent":
-        changes = event.get("Changes", {})
-        ts = parse_timestamp(event["Timestamp"])
+    def from_changes(
+        timestamp: str,
+        keys: Tuple[str, ...],
+        values: Tuple[Any, ...],
+        raw: Optional[Dict[str, Any]] = None,
+        parsed_timestamp: Optional[datetime] = None,
+    ) -> "FlightEvent":
+        """Event from the timestamp text and the keys / values of its changes.
+
+        parsed_timestamp skips parsing the text when the caller already has it (archives).
+        """
+        layout = intern_layout(keys)
+        index = layout.index
 
-        def parse_bool(val: Optional[str]) -> Optional[bool]:
-            if val is None:
-                return None
-            return val.strip().lower() == "true"
+        def value(key: str) -> Optional[Any]:
+            i = index.get(key)
+            return None if i is None else values[i]
 
-        def parse_int(val: Optional[str]) -> Optional[int]:
-            if val is None:
-                return None
-            try:
-                return int(val)
-            except ValueError:
-                return None        
+        latitude = value("Latitude")
+        longitude = value("Longitude")
 
         return FlightEvent(
-            timestamp=ts,
-            latitude=parse_coordinate(changes.get("Latitude")) if "Latitude" in changes else None,
-            longitude=parse_coordinate(changes.get("Longitude")) if "Longitude" in changes else None,
-            on_ground=parse_bool(changes.get("onGround")),
-            heading=parse_int(changes.get("Heading")),
-            flaps=parse_int(changes.get("Flaps")),
-            gear=changes.get("Gear"),
-            other_changes=changes,
-            _raw=event,
+            timestamp=parsed_timestamp if parsed_timestamp is not None else parse_timestamp(timestamp),
+            latitude=parse_coordinate(latitude) if "Latitude" in index else None,
+            longitude=parse_coordinate(longitude) if "Longitude" in index else None,
+            on_ground=_parse_bool(value("onGround")),
+            heading=_parse_int(value("Heading")),
+            flaps=_parse_int(value("Flaps")),
+            gear=value("Gear"),
+            _layout=layout,
+            _values=values,
+            _timestamp_raw=timestamp,
+            _raw=raw,
         )
 
+    @staticmethod
+    def from_json(event: Dict[str, Any]) -> "FlightEvent":
+        changes = event.get("Changes", {})
+        # Usual events are rebuilt on export, others are kept as they are
+        raw = None if len(event) == 2 and "Changes" in event else event
+        return FlightEvent.from_changes(event["Timestamp"], tuple(changes), tuple(changes.values()), raw)
+
     def to_dict(self) -> Dict[str, Any]:
         """Return the event as we imported"""
-        return self._raw
\ No newline at end of file
+        if self._raw is not None:
+            return self._raw
+        return {"Timestamp": self._timestamp_raw, "Changes": self.other_changes}
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Imported events this event stands for (more than one for a StaticRun)."""
+        return [self.to_dict()]
+
+
+@dataclass(slots=True)
+class StaticRun(FlightEvent):
+    """Run of identical events on ground, collapsed at ingest (see ingest.collapse_static_runs).
+
+    The record is the first event of the run: timestamp is the first one, run_end the
+    last one and run_count the events of the run. The last event is kept as is right
+    after the record, so searches forward and backward find the same timestamps. The
+    events in between only keep their timestamp text (export purposes).
+    """
+    run_end: Optional[datetime] = None
+    _collapsed_timestamps: Tuple[str, ...] = ()
+
+    @property
+    def run_count(self) -> int:
+        return len(self._collapsed_timestamps) + 2
+
+    @staticmethod
+    def collapse(first: FlightEvent, last: FlightEvent, collapsed_timestamps: Tuple[str, ...]) -> "StaticRun":
+        """Record of a run from its first and last events and the timestamps in between."""
+        values = {f.name: getattr(first, f.name) for f in fields(FlightEvent)}
+        return StaticRun(**values, run_end=last.timestamp, _collapsed_timestamps=collapsed_timestamps)
+
+    def expand(self) -> List[FlightEvent]:
+        """Plain events of the first event and the collapsed ones (the last one is still in
+        the flight events)."""
+        values = {f.name: getattr(self, f.name) for f in fields(FlightEvent)}
+        first = FlightEvent(**values)
+        values.pop("timestamp")
+        values.pop("_timestamp_raw")
+        return [first] + [
+            FlightEvent(timestamp=parse_timestamp(ts), _timestamp_raw=ts, **values) for ts in self._collapsed_timestamps
+        ]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """The first event and the collapsed ones (the last one is still in the flight events)."""
+        first = self.to_dict()
+        return [first] + [{"Timestamp": ts, "Changes": self.other_changes} for ts in self._collapsed_timestamps]
@@ -1,9 +1,73 @@
 import json
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from mam_analyzer.ingest import collapse_static_runs, normalize_events
 from mam_analyzer.models.flight_events import FlightEvent
+from mam_analyzer.profiling import NULL_PROFILER, Profiler
+from mam_analyzer.utils.search import IndexedEvents
 
-def load_flight_data(filepath):
-	with open(filepath, "r", encoding="utf-8") as f:
-		raw_json = json.load(f)
-	raw_events = raw_json["Events"]
-	return [FlightEvent.from_json(e) for e in raw_events]
\ No newline at end of file
+# First bytes of a flight archive. The archive module (and its compression libraries) is
+# only imported to decode one
+MAGIC = b"MAMZ"
+
+def is_archive(data: bytes) -> bool:
+	return data[:len(MAGIC)] == MAGIC
+
+class _PendingObject:
+	"""JSON object decoded before knowing what it is: the Changes of an event or the root."""
+	__slots__ = ("pairs",)
+
+	def __init__(self, pairs: List[Tuple[str, Any]]):
+		self.pairs = pairs
+
+	def to_dict(self) -> Dict[str, Any]:
+		return {k: v.to_dict() if type(v) is _PendingObject else v for k, v in self.pairs}
+
+def _event_pairs_hook(pairs: List[Tuple[str, Any]]) -> Any:
+	"""Builds the usual events ({"Timestamp", "Changes"} in any order) straight from the
+	decoded (key, value) pairs: no dict per event"""
+	if len(pairs) == 2:
+		(key_a, value_a), (key_b, value_b) = pairs
+		if key_b == "Timestamp":
+			key_a, value_a, key_b, value_b = key_b, value_b, key_a, value_a
+		if key_a == "Timestamp" and key_b == "Changes" and type(value_b) is _PendingObject:
+			changes = value_b.pairs
+			keys, values = zip(*changes) if changes else ((), ())
+			return FlightEvent.from_changes(value_a, keys, values)
+	return _PendingObject(pairs)
+
+def _as_event(entry: Any) -> FlightEvent:
+	"""Event of an entry of the Events list the hook didn't build (other keys)"""
+	if type(entry) is FlightEvent:
+		return entry
+	return FlightEvent.from_json(entry.to_dict() if type(entry) is _PendingObject else entry)
+
+def _decode_events(data: Union[bytes, str], collapse_static: bool) -> IndexedEvents:
+	if isinstance(data, bytes) and is_archive(data):
+		from mam_analyzer.archive import decode_flight_events
+		events = decode_flight_events(data)
+	else:
+		events = [_as_event(e) for e in json.loads(data, object_pairs_hook=_event_pairs_hook).to_dict()["Events"]]
+	# Ordered and without duplicates: lookups by time can bisect (see ingest.normalize_events)
+	events, summary = normalize_events(events)
+	if collapse_static:
+		events = collapse_static_runs(events)
+	# Indexed at load: lookups of the nearest event with a key are bisects (see utils.search)
+	indexed = IndexedEvents(events)
+	indexed.ingest = summary
+	return indexed
+
+def load_flight_data(filepath, profiler: Optional[Profiler] = None, collapse_static: bool = True):
+	"""Events of a flight file, JSON or archive (see archive.encode_flight), ordered by timestamp
+	without exact duplicates (see ingest.normalize_events). Runs of identical
+	events on ground are collapsed unless collapse_static is False (see ingest.collapse_static_runs)."""
+	profiler = profiler or NULL_PROFILER
+	with profiler.stage("parse"):
+		with open(filepath, "rb") as f:
+			return _decode_events(f.read(), collapse_static)
+
+def parse_flight_data(data: Union[bytes, str], profiler: Optional[Profiler] = None, collapse_static: bool = True):
+	"""Same as load_flight_data over the content of a flight file already read."""
+	profiler = profiler or NULL_PROFILER
+	with profiler.stage("parse"):
+		return _decode_events(data, collapse_static)
@@ -4,8 +4,13 @@ from typing import List, Dict, Any, Optional
 from mam_analyzer.models.flight_context import FlightContext
 from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.analyzers.result import AnalysisResult
+from mam_analyzer.phases.blackboard import FlightBlackboard
 
 class Analyzer(ABC):
+    # Version tag of the analyzer rules. Bump it when the results change because of code
+    # outside the analyzer module (e.g. a shared utility) so cached results are recomputed
+    VERSION = 1
+
     @abstractmethod
     def analyze(
         self,
@@ -14,6 +19,7 @@ class Analyzer(ABC):
         end_time: datetime,
         context: Optional[FlightContext] = None,
         phase_params: Optional[Dict[str, Any]] = None,
+        blackboard: Optional[FlightBlackboard] = None,
     ) -> AnalysisResult:
         """
         Analyze the phase of flight that begins at `start_time` and ends at `end_time`,
@@ -23,6 +29,9 @@ class Analyzer(ABC):
         representing the metrics or results extracted from the analyzed phase and the
         other part are the issues found in the phase (Ex taxi overspeed)
 
+        `blackboard` holds what the detectors of the flight already computed (Ex the
+        matched runway), the analyzer computes it by itself without it.
+
         Example:
             {
                 "Fuel consumed":"200"
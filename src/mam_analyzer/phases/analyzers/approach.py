@@ -7,6 +7,7 @@ from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.analyzers.analyzer import Analyzer
 from mam_analyzer.phases.analyzers.issues import Issues
 from mam_analyzer.phases.analyzers.result import AnalysisResult, AnalysisIssue
+from mam_analyzer.phases.blackboard import FlightBlackboard
 from mam_analyzer.utils.altitude import event_has_agl_altitude, get_agl_altitude_as_int
 from mam_analyzer.utils.vertical_speed import (
     event_has_vertical_speed,
@@ -40,6 +41,7 @@ class ApproachAnalyzer(Analyzer):
         end_time: datetime,
         context: Optional[FlightContext] = None,
         phase_params: Optional[Dict[str, Any]] = None,
+        blackboard: Optional[FlightBlackboard] = None,
     ) -> AnalysisResult:
         """Analyze approach phase generating:
            - average vertical speed fpm
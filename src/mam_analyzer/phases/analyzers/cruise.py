@@ -6,10 +6,11 @@ from mam_analyzer.models.flight_context import FlightContext
 from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.analyzers.analyzer import Analyzer
 from mam_analyzer.phases.analyzers.result import AnalysisResult
+from mam_analyzer.phases.blackboard import FlightBlackboard
 from mam_analyzer.utils.altitude import event_has_altitude, get_altitude_as_int_rounded_to
 from mam_analyzer.utils.filter import always_true
-from mam_analyzer.utils.fuel import event_has_fuel, get_fuel_kg_as_float
-from mam_analyzer.utils.search import find_first_index_backward, find_first_index_backward_starting_from_idx, find_first_index_forward, find_first_index_forward_starting_from_idx
+from mam_analyzer.utils.fuel import get_fuel_kg_as_float
+from mam_analyzer.utils.search import find_first_index_backward, find_first_index_forward, find_key_index_backward, find_key_index_forward
 
 
 class CruiseAnalyzer(Analyzer):
@@ -20,6 +21,7 @@ class CruiseAnalyzer(Analyzer):
         end_time: datetime,
         context: Optional[FlightContext] = None,
         phase_params: Optional[Dict[str, Any]] = None,
+        blackboard: Optional[FlightBlackboard] = None,
     ) -> AnalysisResult:
         """Analyze cruise phase generating:
            - fuel consumption
@@ -30,12 +32,10 @@ class CruiseAnalyzer(Analyzer):
         #Calculate fuel consumption
 
         def get_fuel_consumption(events, start_idx, end_idx) -> int:
-            found_start_fuel = find_first_index_forward_starting_from_idx(
+            found_start_fuel = find_key_index_forward(
                 events,
-                start_idx,
-                event_has_fuel,
-                None,
-                None
+                "FuelKg",
+                start_idx=start_idx
             )
 
             if found_start_fuel is not None:
@@ -44,12 +44,10 @@ class CruiseAnalyzer(Analyzer):
             else:
                 raise RuntimeError("Can't retrieve start fuel event for cruise phase")
 
-            found_end_fuel = find_first_index_backward_starting_from_idx(
+            found_end_fuel = find_key_index_backward(
                 events,
-                end_idx,
-                event_has_fuel,
-                None,
-                None
+                "FuelKg",
+                start_idx=end_idx
             )
 
             if found_end_fuel is not None:
@@ -7,6 +7,7 @@ from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.analyzers.analyzer import Analyzer
 from mam_analyzer.phases.analyzers.issues import Issues
 from mam_analyzer.phases.analyzers.result import AnalysisResult,AnalysisIssue
+from mam_analyzer.phases.blackboard import FlightBlackboard
 from mam_analyzer.utils.engines import all_engines_are_off, some_engine_is_off
 from mam_analyzer.utils.landing import event_has_landing_vs_fpm, get_landing_vs_fpm_as_int, is_hard_landing
 from mam_analyzer.utils.runway import match_runway_for_landing
@@ -28,6 +29,7 @@ class FinalLandingAnalyzer(Analyzer):
         end_time: datetime,
         context: Optional[FlightContext] = None,
         phase_params: Optional[Dict[str, Any]] = None,
+        blackboard: Optional[FlightBlackboard] = None,
     ) -> AnalysisResult:
         """Analyze final landing phase generating:
            - number of bounces
@@ -125,7 +127,8 @@ class FinalLandingAnalyzer(Analyzer):
             and context.landing.runways
             and touch_event_ref is not None
         ):
-            rwy_match = match_runway_for_landing(
+            match = blackboard.match_runway_for_landing if blackboard is not None else match_runway_for_landing
+            rwy_match = match(
                 context.landing,
                 events,
                 touch_idx,
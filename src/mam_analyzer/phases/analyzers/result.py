@@ -24,4 +24,19 @@ class AnalysisResult:
                 }
                 for i in self.issues
             ]
-        }    
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "AnalysisResult":
+        return AnalysisResult(
+            phase_metrics=dict(data["phase_metrics"]),
+            issues=[
+                AnalysisIssue(
+                    code=i["code"],
+                    timestamp=datetime.fromisoformat(i["timestamp"]) if i["timestamp"] else None,
+                    value=i["value"],
+                )
+                for i in data["issues"]
+            ],
+        )
+
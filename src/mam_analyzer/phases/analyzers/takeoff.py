@@ -6,6 +6,7 @@ from mam_analyzer.models.flight_context import FlightContext
 from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.analyzers.analyzer import Analyzer
 from mam_analyzer.phases.analyzers.result import AnalysisResult
+from mam_analyzer.phases.blackboard import FlightBlackboard
 from mam_analyzer.utils.ground import event_has_on_ground, is_on_ground
 from mam_analyzer.utils.landing import event_has_landing_vs_fpm, get_landing_vs_fpm_as_int
 from mam_analyzer.utils.location import event_has_location
@@ -28,6 +29,7 @@ class TakeoffAnalyzer(Analyzer):
         end_time: datetime,
         context: Optional[FlightContext] = None,
         phase_params: Optional[Dict[str, Any]] = None,
+        blackboard: Optional[FlightBlackboard] = None,
     ) -> AnalysisResult:
         """Analyze takeoff phase generating:
            - number of bounces
@@ -102,7 +104,8 @@ class TakeoffAnalyzer(Analyzer):
             and context.departure.runways
             and airborne_event_ref is not None
         ):
-            rwy_match = match_runway_for_takeoff(
+            match = blackboard.match_runway_for_takeoff if blackboard is not None else match_runway_for_takeoff
+            rwy_match = match(
                 context.departure,
                 events,
                 airborne_idx,
@@ -2,11 +2,13 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 
+from mam_analyzer.ingest import expand_static_runs
 from mam_analyzer.models.flight_context import FlightContext
 from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.analyzers.analyzer import Analyzer
 from mam_analyzer.phases.analyzers.issues import Issues
 from mam_analyzer.phases.analyzers.result import AnalysisResult, AnalysisIssue
+from mam_analyzer.phases.blackboard import FlightBlackboard
 from mam_analyzer.utils.speed import event_has_gs, get_gs_as_int
 
 class TaxiAnalyzer(Analyzer):
@@ -17,6 +19,7 @@ class TaxiAnalyzer(Analyzer):
         end_time: datetime,
         context: Optional[FlightContext] = None,
         phase_params: Optional[Dict[str, Any]] = None,
+        blackboard: Optional[FlightBlackboard] = None,
     ) -> AnalysisResult:
         """Analyze taxi phase generating:
            - Overspeed taxi issue
@@ -24,7 +27,8 @@ class TaxiAnalyzer(Analyzer):
 
         result = AnalysisResult()
 
-        for e in events:
+        # An issue per event: collapsed runs count all their events
+        for e in expand_static_runs(events):
             ts = e.timestamp
             if ts >= start_time:
                 if ts <= end_time:
@@ -0,0 +1,97 @@
+"""Intermediate results shared by the detectors and analyzers of one flight.
+
+The takeoff and landing detectors match the runway from the airborne / touch event and
+the analyzers of those phases need the same match. PhasesAggregator creates a
+FlightBlackboard per flight: the detectors publish what they computed and the analyzers
+reuse it when it was computed from the same inputs. Without a blackboard (or when the
+inputs differ) every detector and analyzer computes everything by itself.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from mam_analyzer.models.flight_context import AirportContext, Runway, RunwayEnd
+from mam_analyzer.models.flight_events import FlightEvent
+from mam_analyzer.utils.location import collect_location_events_after, collect_location_events_before
+from mam_analyzer.utils.runway import match_runway_for_landing, match_runway_for_takeoff
+
+
+@dataclass
+class RunwayMatch:
+    """Runway matched from the airborne / touch event and its ground track."""
+    airport: AirportContext
+    event: FlightEvent
+    heading: Optional[int]
+    # Location events of the ground track besides the event
+    track: Tuple[FlightEvent, ...]
+    runway: Optional[Tuple[Runway, RunwayEnd]]
+
+    def same_inputs(
+        self,
+        airport: AirportContext,
+        event: FlightEvent,
+        heading: Optional[int],
+        track: Sequence[FlightEvent],
+    ) -> bool:
+        return (
+            self.airport is airport
+            and self.event is event
+            and self.heading == heading
+            and len(self.track) == len(track)
+            and all(a is b for a, b in zip(self.track, track))
+        )
+
+
+class FlightBlackboard:
+    """Per flight intermediates: the takeoff and landing runway matches."""
+
+    def __init__(self) -> None:
+        self.takeoff: Optional[RunwayMatch] = None
+        self.landing: Optional[RunwayMatch] = None
+        # Runway matches computed / reused, for profiling and tests
+        self.computed = 0
+        self.reused = 0
+
+    def match_runway_for_takeoff(
+        self,
+        airport: AirportContext,
+        events: List[FlightEvent],
+        airborne_idx: int,
+        airborne_event: FlightEvent,
+        fallback_heading: int,
+    ) -> Optional[Tuple[Runway, RunwayEnd]]:
+        """match_runway_for_takeoff, reusing the published match of the same event and track."""
+        track = collect_location_events_before(events, airborne_idx, 2)
+        if self.takeoff is not None and self.takeoff.same_inputs(airport, airborne_event, fallback_heading, track):
+            self.reused += 1
+            return self.takeoff.runway
+
+        self.computed += 1
+        runway = match_runway_for_takeoff(airport, events, airborne_idx, airborne_event, fallback_heading)
+        self.takeoff = RunwayMatch(airport, airborne_event, fallback_heading, tuple(track), runway)
+        return runway
+
+    def match_runway_for_landing(
+        self,
+        airport: AirportContext,
+        events: List[FlightEvent],
+        touch_idx: int,
+        touch_event: FlightEvent,
+        fallback_heading: int,
+    ) -> Optional[Tuple[Runway, RunwayEnd]]:
+        """match_runway_for_landing, reusing the published match of the same event and track."""
+        track = collect_location_events_after(events, touch_idx, 2)
+        if self.landing is not None and self.landing.same_inputs(airport, touch_event, fallback_heading, track):
+            self.reused += 1
+            return self.landing.runway
+
+        self.computed += 1
+        runway = match_runway_for_landing(airport, events, touch_idx, touch_event, fallback_heading)
+        self.landing = RunwayMatch(airport, touch_event, fallback_heading, tuple(track), runway)
+        return runway
+
+    def landing_runway_end(self, designator: Optional[str]) -> Optional[RunwayEnd]:
+        """Matched landing runway end if its designator is the given one, else None."""
+        if designator is None or self.landing is None or self.landing.runway is None:
+            return None
+        _, end = self.landing.runway
+        return end if end.designator == designator else None
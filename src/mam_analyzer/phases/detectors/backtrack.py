@@ -1,17 +1,19 @@
 from datetime import datetime
 from math import sqrt, acos
-from shapely.geometry import LineString, MultiLineString, Point
-from shapely.ops import unary_union
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from mam_analyzer.models.flight_context import FlightContext
 from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.flight_phase import FlightPhase
 from mam_analyzer.utils.ground import is_on_air
 from mam_analyzer.utils.location import event_has_location
-from mam_analyzer.utils.runway import build_runway_polygon, match_runway_end
+from mam_analyzer.utils.runway import build_runway_polygon, build_runway_safe_zone, match_runway_end, runway_projection
 from mam_analyzer.utils.search import find_first_index_forward, find_first_index_backward
-from mam_analyzer.utils.units import latlon_to_xy
+from mam_analyzer.utils.units import LocalProjection
+
+# numpy / shapely are imported on first use (see utils/runway.py)
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class BacktrackDetector():
@@ -25,6 +27,8 @@ class BacktrackDetector():
 
     def extend_line(self, p1, p2, length):
         """Extend a line in both directions by 'length' meters."""
+        from shapely.geometry import LineString
+
         (x1, y1), (x2, y2) = p1, p2
         dx = x2 - x1
         dy = y2 - y1
@@ -46,6 +50,25 @@ class BacktrackDetector():
         cos_theta = max(min(dot / (mag1 * mag2), 1), -1)  # numerical safety
         return acos(cos_theta) * 180.0 / 3.14159265
 
+    def taxi_track(self, taxi: FlightPhase, projection: LocalProjection) -> Tuple[List[FlightEvent], "np.ndarray"]:
+        """Taxi events with location and their projected (x, y) coordinates (one bulk projection)."""
+        import numpy as np
+
+        located = [ev for ev in taxi.events if event_has_location(ev)]
+        xs, ys = projection.to_xy_many(
+            [ev.latitude for ev in located],
+            [ev.longitude for ev in located],
+        )
+        return located, np.column_stack((xs, ys))
+
+    def track_length_inside(self, coords: "np.ndarray", corridor) -> float:
+        """Length of the taxi track inside the corridor."""
+        from shapely.geometry import LineString
+
+        if len(coords) < 2:
+            return 0
+        return LineString(coords).intersection(corridor).length
+
     def detect_from_takeoff(
         self,
         taxi: FlightPhase,
@@ -53,6 +76,10 @@ class BacktrackDetector():
         context: Optional[FlightContext] = None,
     ) -> Optional[Tuple[datetime, datetime]]:
         """Detects backtrack before takeoff using geometric analysis."""
+        import numpy as np
+        import shapely
+        from shapely.geometry import Point
+        from shapely.ops import unary_union
 
         # 1. Identify runway motion vector
         _, run_start_event = find_first_index_forward(
@@ -62,9 +89,6 @@ class BacktrackDetector():
             takeoff.events, is_on_air, takeoff.start, takeoff.end
         )
 
-        run_start_xy = latlon_to_xy(run_start_event.latitude, run_start_event.longitude)
-        run_end_xy = latlon_to_xy(run_end_event.latitude, run_end_event.longitude)
-
         # 2. Build corridor and safe zone
         runway_match = None
         if (
@@ -82,21 +106,26 @@ class BacktrackDetector():
                 run_start_event.longitude,
             )
 
-        utm_zone = None
+        # Single projection for the whole phase: the runway one, or centred on the run start
+        if runway_match is not None:
+            projection = runway_projection(runway_match[0])
+        else:
+            projection = LocalProjection(run_start_event.latitude, run_start_event.longitude)
+
+        run_start_xy = projection.to_xy(run_start_event.latitude, run_start_event.longitude)
+        run_end_xy = projection.to_xy(run_end_event.latitude, run_end_event.longitude)
+
         if runway_match is not None:
-            rwy, matched_end = runway_match
-            opposite_end = rwy.ends[1] if matched_end is rwy.ends[0] else rwy.ends[0]
-            takeoff_corridor, utm_zone = build_runway_polygon(rwy)
-            matched_end_xy = latlon_to_xy(matched_end.latitude, matched_end.longitude, utm_zone)
-            opposite_end_xy = latlon_to_xy(opposite_end.latitude, opposite_end.longitude, utm_zone)
-            turn_zone_1 = Point(matched_end_xy).buffer(self.TURN_ZONE_RADIUS)
-            turn_zone_2 = Point(opposite_end_xy).buffer(self.TURN_ZONE_RADIUS)
-            safe_zone = unary_union([takeoff_corridor, turn_zone_1, turn_zone_2])
+            rwy, _ = runway_match
+            takeoff_corridor, _ = build_runway_polygon(rwy)
+            # Runway polygon plus turn zones at both ends (cached per runway)
+            safe_zone = build_runway_safe_zone(rwy, 0, self.TURN_ZONE_RADIUS)
         else:
             takeoff_line = self.extend_line(run_start_xy, run_end_xy, length=self.EXTEND_LINE_METERS)
             takeoff_corridor = takeoff_line.buffer(self.WIDTH_CORRIDOR, cap_style=2)
             turn_zone = Point(run_start_xy).buffer(self.TURN_ZONE_RADIUS)
             safe_zone = unary_union([takeoff_corridor, turn_zone])
+            shapely.prepare(safe_zone)
 
         # Reference vector (true takeoff direction)
         takeoff_vector = (
@@ -104,35 +133,18 @@ class BacktrackDetector():
             run_end_xy[1] - run_start_xy[1]
         )
 
-        # 3. Build taxi segments line geometry
-        taxi_coords = []
-        taxi_events_xy = []
-        for ev in taxi.events:
-            if event_has_location(ev):
-                xy = latlon_to_xy(ev.latitude, ev.longitude, utm_zone)
-                taxi_coords.append(xy)
-                taxi_events_xy.append((xy, ev))
-
-        taxi_lines = MultiLineString(
-            [LineString([taxi_coords[i], taxi_coords[i + 1]]) for i in range(len(taxi_coords) - 1)]
-        )
+        # 3. Build taxi track geometry
+        taxi_events, taxi_coords = self.taxi_track(taxi, projection)
 
         # 4. Check how much taxi is on top of the runway
         threshold = self.BACKTRACK_THRESHOLD_WITH_RUNWAY_METERS if runway_match is not None else self.BACKTRACK_THRESHOLD_METERS
-        if taxi_lines.intersection(takeoff_corridor).length < threshold:
+        if self.track_length_inside(taxi_coords, takeoff_corridor) < threshold:
             return None  # no backtrack
 
         # 5. Get the first event that is inside the backtrack
-        backtrack_start_event = None
-        for i in range(len(taxi_events_xy)):
-            xy, ev = taxi_events_xy[i]
-            point = Point(xy)
-            if safe_zone.covers(point):
-                backtrack_start_event = ev
-                break
-
-        if backtrack_start_event:
-            return backtrack_start_event.timestamp, taxi.end
+        inside = shapely.covers(safe_zone, shapely.points(taxi_coords))
+        if inside.any():
+            return taxi_events[int(np.argmax(inside))].timestamp, taxi.end
 
         return None
 
@@ -143,6 +155,10 @@ class BacktrackDetector():
         context: Optional[FlightContext] = None,
     ) -> Optional[Tuple[datetime, datetime]]:
         """Detects backtrack after landing using geometric analysis."""
+        import numpy as np
+        import shapely
+        from shapely.geometry import Point
+        from shapely.ops import unary_union
 
         # 1. Identify runway motion vector
         _, landing_start_event = find_first_index_forward(
@@ -152,9 +168,6 @@ class BacktrackDetector():
             landing.events, event_has_location, landing.start, landing.end
         )
 
-        landing_start_xy = latlon_to_xy(landing_start_event.latitude, landing_start_event.longitude)
-        landing_end_xy = latlon_to_xy(landing_end_event.latitude, landing_end_event.longitude)
-
         # 2. Build corridor and safe zone
         runway_match = None
         if (
@@ -172,21 +185,26 @@ class BacktrackDetector():
                 landing_start_event.longitude,
             )
 
-        utm_zone = None
+        # Single projection for the whole phase: the runway one, or centred on the landing start
+        if runway_match is not None:
+            projection = runway_projection(runway_match[0])
+        else:
+            projection = LocalProjection(landing_start_event.latitude, landing_start_event.longitude)
+
+        landing_start_xy = projection.to_xy(landing_start_event.latitude, landing_start_event.longitude)
+        landing_end_xy = projection.to_xy(landing_end_event.latitude, landing_end_event.longitude)
+
         if runway_match is not None:
-            rwy, matched_end = runway_match
-            opposite_end = rwy.ends[1] if matched_end is rwy.ends[0] else rwy.ends[0]
-            landing_corridor, utm_zone = build_runway_polygon(rwy)
-            matched_end_xy = latlon_to_xy(matched_end.latitude, matched_end.longitude, utm_zone)
-            opposite_end_xy = latlon_to_xy(opposite_end.latitude, opposite_end.longitude, utm_zone)
-            turn_zone_1 = Point(matched_end_xy).buffer(self.TURN_ZONE_RADIUS)
-            turn_zone_2 = Point(opposite_end_xy).buffer(self.TURN_ZONE_RADIUS)
-            safe_zone = unary_union([landing_corridor, turn_zone_1, turn_zone_2])
+            rwy, _ = runway_match
+            landing_corridor, _ = build_runway_polygon(rwy)
+            # Runway polygon plus turn zones at both ends (cached per runway)
+            safe_zone = build_runway_safe_zone(rwy, 0, self.TURN_ZONE_RADIUS)
         else:
             landing_line = self.extend_line(landing_start_xy, landing_end_xy, length=self.EXTEND_LINE_METERS)
             landing_corridor = landing_line.buffer(self.WIDTH_CORRIDOR, cap_style=2)
             turn_zone = Point(landing_end_xy).buffer(self.TURN_ZONE_RADIUS)
             safe_zone = unary_union([landing_corridor, turn_zone])
+            shapely.prepare(safe_zone)
 
         # Reference vector (true landing direction)
         landing_vector = (
@@ -194,39 +212,16 @@ class BacktrackDetector():
             landing_end_xy[1] - landing_start_xy[1]
         )
 
-        # 3. Build taxi segments line geometry
-        taxi_coords = []
-        taxi_events_xy = []
-        for ev in taxi.events:
-            if event_has_location(ev):
-                xy = latlon_to_xy(ev.latitude, ev.longitude, utm_zone)
-                taxi_coords.append(xy)
-                taxi_events_xy.append((xy, ev))
-
-        taxi_lines = MultiLineString(
-            [LineString([taxi_coords[i], taxi_coords[i + 1]]) for i in range(len(taxi_coords) - 1)]
-        )
+        # 3. Build taxi track geometry
+        taxi_events, taxi_coords = self.taxi_track(taxi, projection)
 
         # 4. Check how much taxi is on top of the runway
         threshold = self.BACKTRACK_THRESHOLD_WITH_RUNWAY_METERS if runway_match is not None else self.BACKTRACK_THRESHOLD_METERS
-        if taxi_lines.intersection(landing_corridor).length < threshold:
+        if self.track_length_inside(taxi_coords, landing_corridor) < threshold:
             return None  # no backtrack
 
-        # 5. Get the last event that is inside the backtrack
-        last_xy, backtrack_end_event = taxi_events_xy[0]
-
-        for i in range(len(taxi_events_xy)):
-            xy, ev = taxi_events_xy[i]
-            point = Point(xy)
+        # 5. Get the last event of the initial run inside the safe region (runway corridor or turning circle)
+        inside = shapely.covers(safe_zone, shapely.points(taxi_coords))
+        last_inside = len(inside) - 1 if inside.all() else max(int(np.argmin(inside)) - 1, 0)
 
-            if safe_zone.covers(point):
-                # Still within safe region (runway corridor or turning circle)
-                last_xy = xy
-                backtrack_end_event = ev
-            else:
-                break
-
-        if backtrack_end_event:
-            return taxi.start, backtrack_end_event.timestamp
-
-        return None
+        return taxi.start, taxi_events[last_inside].timestamp
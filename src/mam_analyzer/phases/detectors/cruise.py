@@ -1,11 +1,14 @@
+import logging
 from datetime import datetime, timedelta
 from typing import List, Optional, Tuple, Dict, Any
 
 from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.detectors.detector import Detector
-from mam_analyzer.utils.search import find_first_index_backward_starting_from_idx, find_first_index_forward_starting_from_idx
+from mam_analyzer.utils.search import ALTITUDE, find_column_max, find_first_index_backward_in_blocks, find_first_index_forward_in_blocks
 from mam_analyzer.utils.units import heading_within_range
 
+logger = logging.getLogger(__name__)
+
 class CruiseDetector(Detector):
     def detect(
         self,
@@ -13,6 +16,7 @@ class CruiseDetector(Detector):
         from_time: Optional[datetime],
         to_time: Optional[datetime],
         context: Optional["FlightContext"] = None,
+        blackboard: Optional["FlightBlackboard"] = None,
     ) -> Optional[Tuple[datetime, datetime]]:
         """Detect the cruise_phase: period the plane stays in the same altitude 
             with a range of variation allowed, but should be maintained along time
@@ -23,25 +27,15 @@ class CruiseDetector(Detector):
         if from_time is None or to_time is None:
             raise RuntimeError("TouchAndGoDetector must have from_time and to_time")
 
-        # Step 1: Look for the highest altitude in this period of time
+        # Step 1: Look for the highest altitude in this period of time (first event reaching it)
         high_altitude = 0
         high_altitude_agl = 0
         high_altitude_first_event_idx = None
 
-        for idx in range(0,len(events)):
-            e = events[idx]
-
-            if e.timestamp >= from_time and e.timestamp <= to_time:
-
-                e_altitude = e.other_changes.get("Altitude") # TODO: Use altitude utils
-                if e_altitude is not None:
-                    if int(e_altitude) > high_altitude:
-                        high_altitude = int(e_altitude)
-                        high_altitude_agl = int(e.other_changes.get("AGLAltitude"))
-                        high_altitude_first_event_idx = idx
-
-            elif e.timestamp > to_time:
-                break
+        found_high = find_column_max(events, ALTITUDE, from_time, to_time) # TODO: Use altitude utils
+        if found_high is not None and found_high[1] > high_altitude:
+            high_altitude_first_event_idx, high_altitude = found_high
+            high_altitude_agl = int(events[high_altitude_first_event_idx].get_change("AGLAltitude"))
 
         # Step 2: Check is over 1500 AGL
         if high_altitude_first_event_idx is None or high_altitude_agl <= 1500:
@@ -56,25 +50,32 @@ class CruiseDetector(Detector):
         else:
             margin_altitude = 1000
 
-        print(f"Margin altitude {margin_altitude} for high {high_altitude} (AGL {high_altitude_agl})")
+        logger.debug("Margin altitude %s for high %s (AGL %s)", margin_altitude, high_altitude, high_altitude_agl)
 
         # Look backwards and forward from the event to see when starts and ends
         def outOfCruise(e: FlightEvent) -> bool:
-            e_alt = e.other_changes.get("Altitude")
+            e_alt = e.get_change("Altitude")
             return e_alt is not None and abs(high_altitude - int(e_alt)) > margin_altitude
 
-        found_start = find_first_index_backward_starting_from_idx(
+        def blockOutOfCruise(lowest: int, highest: int) -> bool:
+            return not (high_altitude - margin_altitude <= lowest and highest <= high_altitude + margin_altitude)
+
+        found_start = find_first_index_backward_in_blocks(
             events,
             high_altitude_first_event_idx,
             outOfCruise,
+            ALTITUDE,
+            blockOutOfCruise,
             from_time,
             to_time
         )
 
-        found_end = find_first_index_forward_starting_from_idx(
+        found_end = find_first_index_forward_in_blocks(
             events,
             high_altitude_first_event_idx,
             outOfCruise,
+            ALTITUDE,
+            blockOutOfCruise,
             from_time,
             to_time
         )
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import List, Optional, Tuple, Dict, Any
 from mam_analyzer.models.flight_context import FlightContext
 from mam_analyzer.models.flight_events import FlightEvent
+from mam_analyzer.phases.blackboard import FlightBlackboard
 
 class Detector(ABC):
     phase_name: str # TODO: Check, is not used
@@ -14,7 +15,9 @@ class Detector(ABC):
         start_time: datetime,
         end_time: datetime,
         context: Optional[FlightContext] = None,
+        blackboard: Optional[FlightBlackboard] = None,
     ) -> Optional[Tuple[datetime, datetime]]:
         """Detect phase between `start_time` and `end_time` from `events`.
-        Return (start, end) or None if phase is not detected."""
+        Return (start, end) or None if phase is not detected.
+        Intermediates useful for the analyzers are published in `blackboard` if given."""
         pass
\ No newline at end of file
@@ -1,3 +1,4 @@
+import logging
 from datetime import datetime, timedelta
 from typing import List, Optional, Tuple, Dict, Any
 
@@ -5,8 +6,10 @@ from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.detectors.detector import Detector
 from mam_analyzer.utils.location import event_has_location
 from mam_analyzer.utils.runway import build_runway_polygon, match_runway_for_landing, point_inside_runway
-from mam_analyzer.utils.search import find_first_index_backward,find_first_index_forward_starting_from_idx,find_first_index_backward_starting_from_idx
-from mam_analyzer.utils.units import haversine, heading_within_range
+from mam_analyzer.utils.search import FULL_EVENTS,HEADING,find_first_index_forward_in_blocks,find_first_index_forward_starting_from_idx,find_key_index_backward
+from mam_analyzer.utils.units import haversine, heading_within_range, headings_within_range
+
+logger = logging.getLogger(__name__)
 
 class FinalLandingDetector(Detector):
     def detect(
@@ -15,6 +18,7 @@ class FinalLandingDetector(Detector):
         from_time: Optional[datetime],
         to_time: Optional[datetime],
         context: Optional["FlightContext"] = None,
+        blackboard: Optional["FlightBlackboard"] = None,
     ) -> Optional[Tuple[datetime, datetime]]:
         """Detect the last landing: from the moment the ground is touched until we leave the runway."""
         touch_idx = None
@@ -23,12 +27,9 @@ class FinalLandingDetector(Detector):
         landing_end = None
 
         # Step 1: Ensure the aircraft is on ground at the end of the flight
-        def lastFullEvent(e: FlightEvent) -> bool:
-            return e.is_full_event()
-
-        found_last_full_event = find_first_index_backward(
+        found_last_full_event = find_key_index_backward(
             events,
-            lastFullEvent,
+            FULL_EVENTS,
             from_time,
             to_time
         )
@@ -43,12 +44,9 @@ class FinalLandingDetector(Detector):
 
 
         # Step 2: First event with LandingVSFpm from backward
-        def withLandingVSFpm(e: FlightEvent) -> bool:
-            return e.other_changes.get("LandingVSFpm") is not None
-
-        found_landing = find_first_index_backward(
+        found_landing = find_key_index_backward(
             events,
-            withLandingVSFpm,
+            "LandingVSFpm",
             from_time,
             to_time
         )
@@ -63,21 +61,22 @@ class FinalLandingDetector(Detector):
         # Step 3: Detect possible double bounces look in previous 10 seconds was another touch
         delta = landing_start + timedelta(seconds=-10)
 
-        found_bounce = find_first_index_backward_starting_from_idx(
+        found_bounce = find_key_index_backward(
             events,
-            touch_idx - 1,
-            withLandingVSFpm,
+            "LandingVSFpm",
             delta,
-            to_time
+            to_time,
+            touch_idx - 1
         )
 
         if found_bounce is not None:
-            print("Found bounce! Updating touch")
+            logger.debug("Found bounce at %s! Updating touch", found_bounce[1].timestamp)
             touch_idx, landing_event = found_bounce
             touch_heading = landing_event.heading
             landing_start = landing_event.timestamp
 
 
+
         # Step 4: Look for the end of the landing (exit the runway)
         runway_match = None
         if (
@@ -87,7 +86,9 @@ class FinalLandingDetector(Detector):
             and landing_event.latitude is not None
             and landing_event.longitude is not None
         ):
-            runway_match = match_runway_for_landing(
+            # Published in the blackboard for the final landing analyzer
+            match = blackboard.match_runway_for_landing if blackboard is not None else match_runway_for_landing
+            runway_match = match(
                 context.landing,
                 events,
                 touch_idx,
@@ -99,7 +100,7 @@ class FinalLandingDetector(Detector):
             rwy, matched_end = runway_match
             # Opposite threshold: if we land on 01, aim for the 19 end
             opposite_end = rwy.ends[1] if matched_end is rwy.ends[0] else rwy.ends[0]
-            rwy_polygon, utm_zone = build_runway_polygon(rwy)
+            rwy_polygon, projection = build_runway_polygon(rwy)
 
             min_distance = haversine(
                 landing_event.latitude, landing_event.longitude,
@@ -111,7 +112,7 @@ class FinalLandingDetector(Detector):
                 e = events[idx]
                 if event_has_location(e):
                     # Left the runway polygon → landing over
-                    if not point_inside_runway(e.latitude, e.longitude, rwy_polygon, utm_zone):
+                    if not point_inside_runway(e.latitude, e.longitude, rwy_polygon, projection):
                         landing_end = events[idx - 1].timestamp
                         break
 
@@ -132,10 +133,12 @@ class FinalLandingDetector(Detector):
                     and not heading_within_range(touch_heading, e.heading)
                 )
 
-            found_end_landing = find_first_index_forward_starting_from_idx(
+            found_end_landing = find_first_index_forward_in_blocks(
                 events,
                 touch_idx + 1,
                 headingOutOfRange,
+                HEADING,
+                lambda lowest, highest: not headings_within_range(lowest, highest, touch_heading),
                 from_time,
                 to_time
             )
@@ -4,7 +4,7 @@ from typing import List, Optional, Tuple, Dict, Any
 from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.detectors.detector import Detector
 from mam_analyzer.utils.engines import all_engines_are_off_from_status,get_engine_status
-from mam_analyzer.utils.search import find_first_index_backward,find_first_index_backward_starting_from_idx
+from mam_analyzer.utils.search import FULL_EVENTS,find_first_index_backward_starting_from_idx,find_key_index_backward
 from mam_analyzer.utils.units import coords_differ
 
 class ShutdownDetector(Detector):
@@ -14,6 +14,7 @@ class ShutdownDetector(Detector):
         from_time: Optional[datetime],
         to_time: Optional[datetime],
         context: Optional["FlightContext"] = None,
+        blackboard: Optional["FlightBlackboard"] = None,
     ) -> Optional[Tuple[datetime, datetime]]:
         """Detect shutdown phase: Period with the plane in the position where the shutdown of the engines happens"""
         # In this detector we are not using from_time or to_time
@@ -21,12 +22,9 @@ class ShutdownDetector(Detector):
         # Step 1 check if engines are stopped at the end
         # Look for the last full event to check status
         # Iterate over the rest index to see if the status is changed
-        def fullEvent(e: FlightEvent) -> bool:
-            return e.is_full_event()
-
-        last_full_event_found = find_first_index_backward(
+        last_full_event_found = find_key_index_backward(
             events,
-            fullEvent,
+            FULL_EVENTS,
             from_time,
             to_time
         )
@@ -40,7 +38,7 @@ class ShutdownDetector(Detector):
 
         for idx in range(last_full_idx, len(events)):
             event = events[idx]
-            for k,v in event.other_changes.items():
+            for k,v in event.change_items():
                 if k.startswith("Engine "):
                     engine_num = int(k[7:])
                     engine_status[engine_num - 1] = v
@@ -14,6 +14,7 @@ class StartupDetector(Detector):
         from_time: Optional[datetime],
         to_time: Optional[datetime],
         context: Optional["FlightContext"] = None,
+        blackboard: Optional["FlightBlackboard"] = None,
     ) -> Optional[Tuple[datetime, datetime]]:
         """Detect startup phase: from first event (if engines are off) until location changes after engines are on."""
         # In this detector we are not using from_time or to_time
@@ -6,8 +6,8 @@ from mam_analyzer.phases.detectors.detector import Detector
 from mam_analyzer.utils.ground import is_on_air
 from mam_analyzer.utils.location import event_has_location
 from mam_analyzer.utils.runway import build_runway_polygon, match_runway_for_takeoff, point_inside_runway
-from mam_analyzer.utils.search import find_first_index_forward,find_first_index_backward_starting_from_idx,find_first_index_forward_starting_from_idx
-from mam_analyzer.utils.units import haversine, heading_within_range
+from mam_analyzer.utils.search import HEADING,find_first_index_forward,find_first_index_backward_in_blocks,find_first_index_forward_starting_from_idx
+from mam_analyzer.utils.units import haversine, heading_within_range, headings_within_range
 
 class TakeoffDetector(Detector):
     def detect(
@@ -16,6 +16,7 @@ class TakeoffDetector(Detector):
         from_time: Optional[datetime],
         to_time: Optional[datetime],
         context: Optional["FlightContext"] = None,
+        blackboard: Optional["FlightBlackboard"] = None,
     ) -> Optional[Tuple[datetime, datetime]]:
         """Detect the first takeoff: from the start of takeoff run until flaps 0, gear up or 1 minute."""
         airborne_idx = None
@@ -48,7 +49,9 @@ class TakeoffDetector(Detector):
             and airborne_event.latitude is not None
             and airborne_event.longitude is not None
         ):
-            runway_match = match_runway_for_takeoff(
+            # Published in the blackboard for the takeoff analyzer
+            match = blackboard.match_runway_for_takeoff if blackboard is not None else match_runway_for_takeoff
+            runway_match = match(
                 context.departure,
                 events,
                 airborne_idx,
@@ -58,7 +61,7 @@ class TakeoffDetector(Detector):
 
         if runway_match is not None:
             rwy, matched_end = runway_match
-            rwy_polygon, utm_zone = build_runway_polygon(rwy)
+            rwy_polygon, projection = build_runway_polygon(rwy)
 
             min_distance = haversine(
                 airborne_event.latitude, airborne_event.longitude,
@@ -69,7 +72,7 @@ class TakeoffDetector(Detector):
             for idx in range(airborne_idx - 1, -1, -1):
                 e = events[idx]
                 if event_has_location(e):
-                    inside = point_inside_runway(e.latitude, e.longitude, rwy_polygon, utm_zone)
+                    inside = point_inside_runway(e.latitude, e.longitude, rwy_polygon, projection)
                     if not inside:
                         takeoff_start = events[idx + 1].timestamp
                         break
@@ -90,10 +93,12 @@ class TakeoffDetector(Detector):
                     and not heading_within_range(e.heading, airborne_heading)
                 )
 
-            found_diff_heading = find_first_index_backward_starting_from_idx(
+            found_diff_heading = find_first_index_backward_in_blocks(
                 events,
                 airborne_idx - 1,
                 headingIsOutOfRange,
+                HEADING,
+                lambda lowest, highest: not headings_within_range(lowest, highest, airborne_heading),
                 from_time,
                 to_time
             )
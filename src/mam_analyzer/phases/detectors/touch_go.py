@@ -14,6 +14,7 @@ class TouchAndGoDetector(Detector):
         from_time: Optional[datetime],
         to_time: Optional[datetime],
         context: Optional["FlightContext"] = None,
+        blackboard: Optional["FlightBlackboard"] = None,
     ) -> Optional[Tuple[datetime, datetime]]:
         """Detect a touch&go: 
             From the moment the ground is touched (consider bounces) 
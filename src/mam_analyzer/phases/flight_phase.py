@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Mapping, Optional
 
+from mam_analyzer.issue_coalescing import CoalesceRule, coalesced_issue_dicts
 from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.analyzers.result import AnalysisResult
 
@@ -29,12 +30,20 @@ class FlightPhase():
     def __str__(self):
         return f"{self.name}: {self.start} → {self.end}"
 
-    def to_dict(self) -> dict:
+    def analysis_dict(self, issue_coalescing: Optional[Mapping[str, CoalesceRule]] = None) -> dict:
+        """The analysis as a dict. With issue_coalescing, repeated issues are exported as
+        intervals (see issue_coalescing)."""
+        analysis = self.analysis.to_dict()
+        if issue_coalescing is not None:
+            analysis["issues"] = coalesced_issue_dicts(self.analysis.issues, issue_coalescing)
+        return analysis
+
+    def to_dict(self, issue_coalescing: Optional[Mapping[str, CoalesceRule]] = None) -> dict:
         """Serialize this phase to a JSON-friendly dict."""
         return {
             "name": self.name,
             "start": self.start.isoformat(),
             "end": self.end.isoformat(),
-            "analysis": self.analysis.to_dict(),
-            "events": [ev.to_dict() for ev in self.events],  # assumes FlightEvent has to_dict()
+            "analysis": self.analysis_dict(issue_coalescing),
+            "events": [d for ev in self.events for d in ev.to_dicts()],
         }
\ No newline at end of file
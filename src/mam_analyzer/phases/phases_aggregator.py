@@ -1,6 +1,7 @@
+import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
 from mam_analyzer.models.flight_context import FlightContext
 from mam_analyzer.models.flight_events import FlightEvent
@@ -13,6 +14,7 @@ from mam_analyzer.phases.analyzers.result import AnalysisResult
 from mam_analyzer.phases.analyzers.takeoff import TakeoffAnalyzer
 from mam_analyzer.phases.analyzers.taxi import TaxiAnalyzer
 from mam_analyzer.phases.analyzers.touch_go import TouchAndGoAnalyzer
+from mam_analyzer.phases.blackboard import FlightBlackboard
 from mam_analyzer.phases.detectors.backtrack import BacktrackDetector
 from mam_analyzer.phases.detectors.cruise import CruiseDetector
 from mam_analyzer.phases.detectors.detector import Detector
@@ -21,15 +23,28 @@ from mam_analyzer.phases.detectors.shutdown import ShutdownDetector
 from mam_analyzer.phases.detectors.startup import StartupDetector
 from mam_analyzer.phases.detectors.takeoff import TakeoffDetector
 from mam_analyzer.phases.detectors.touch_go import TouchAndGoDetector
+from mam_analyzer.phases.profiles import AnalysisProfile, get_profile
+from mam_analyzer.profiling import NULL_PROFILER, Profiler
+from mam_analyzer.utils.search import IndexedEvents
+
+if TYPE_CHECKING:
+    from mam_analyzer.cache import PhaseBoundary, PhaseMemo
+
+logger = logging.getLogger(__name__)
 
 def _get_landing_glideslope(
     landing_phase: "FlightPhase",
     context: Optional[FlightContext],
+    blackboard: Optional[FlightBlackboard] = None,
 ) -> Optional[float]:
     """Return max_glideslope_deg for the runway end used during landing, or None."""
     designator = landing_phase.analysis.phase_metrics.get("LandingRunway")
     if not designator or not context:
         return None
+    if blackboard is not None:
+        matched_end = blackboard.landing_runway_end(designator)
+        if matched_end is not None:
+            return matched_end.max_glideslope_deg
     airport = context.landing or context.destination
     if not airport:
         return None
@@ -41,28 +56,46 @@ def _get_landing_glideslope(
 
 
 class PhasesAggregator:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        profiler: Optional[Profiler] = None,
+        profile: Union[str, AnalysisProfile, None] = None,
+    ) -> None:
+        self.profiler = profiler or NULL_PROFILER
+        # Phases detected and analyzers run (see phases.profiles), the full analysis by default
+        self.profile = get_profile(profile)
+
+        def enabled(name: str, analyzer: Analyzer) -> Optional[Analyzer]:
+            return analyzer if name in self.profile.analyzers else None
+
         self.detectors = {
             "startup": (StartupDetector(), None),
             "shutdown": (ShutdownDetector(), None),
-            "takeoff": (TakeoffDetector(), TakeoffAnalyzer()),
-            "touch_go": (TouchAndGoDetector(), TouchAndGoAnalyzer()),
-            "final_landing": (FinalLandingDetector(), FinalLandingAnalyzer()),
-            "cruise": (CruiseDetector(), CruiseAnalyzer()),
+            "takeoff": (TakeoffDetector(), enabled("takeoff", TakeoffAnalyzer())),
+            "touch_go": (TouchAndGoDetector(), enabled("touch_go", TouchAndGoAnalyzer())),
+            "final_landing": (FinalLandingDetector(), enabled("final_landing", FinalLandingAnalyzer())),
+            "cruise": (CruiseDetector(), enabled("cruise", CruiseAnalyzer())),
         }
         # Approach and taxi only have analyzer
-        self.taxi_analyzer = TaxiAnalyzer()
-        self.approach_analyzer = ApproachAnalyzer()
+        self.taxi_analyzer = enabled("taxi", TaxiAnalyzer())
+        self.approach_analyzer = enabled("approach", ApproachAnalyzer())
 
         # Backtrack is a special case because we need the other phases detected
         self.backtrack_detector = BacktrackDetector()
 
+        # Memoized phases and analyses of the flight being identified, if any
+        self._memo: Optional["PhaseMemo"] = None
+        # Intermediates shared by the detectors and analyzers of the flight being identified
+        self._blackboard: Optional[FlightBlackboard] = None
+
     def __filter_events(
         self,
         events: List[FlightEvent],
         start: datetime,
         end: datetime
     ) -> List[FlightEvent]:
+        if isinstance(events, IndexedEvents):
+            return events.between(start, end)
         filtered = []
         for ev in events:
             if ev.timestamp >= start:
@@ -84,7 +117,18 @@ class PhasesAggregator:
     ) -> FlightPhase:
         filtered_events = self.__filter_events(events, start, end)
 
-        analysis = analyzer.analyze(filtered_events, start, end, context, phase_params) if analyzer else AnalysisResult()
+        if analyzer:
+            analysis = None
+            if self._memo is not None:
+                analysis = self._memo.analysis(name, start, end, analyzer, phase_params)
+
+            if analysis is None:
+                with self.profiler.stage(f"analyze.{name}", len(filtered_events)):
+                    analysis = analyzer.analyze(filtered_events, start, end, context, phase_params, self._blackboard)
+                if self._memo is not None:
+                    self._memo.put_analysis(name, start, end, analyzer, phase_params, analysis)
+        else:
+            analysis = AnalysisResult()
 
         return FlightPhase(name, start, end, analysis, filtered_events)
 
@@ -98,6 +142,9 @@ class PhasesAggregator:
     ) -> List[FlightPhase]:
         """Return the taxi with backtrack phase if it's found"""
         result = []
+        if "backtrack" not in self.profile.detectors:
+            return [self.__generate_phase(events, "taxi", start, end, self.taxi_analyzer)]
+
         #Without analysis
         taxi_candidate = self.__generate_phase(
             events,
@@ -107,11 +154,12 @@ class PhasesAggregator:
             None
         )
 
-        backtrack_detected = self.backtrack_detector.detect_from_takeoff(
-            taxi_candidate,
-            takeoff_phase,
-            context,
-        )
+        with self.profiler.stage("detect.backtrack", len(taxi_candidate.events)):
+            backtrack_detected = self.backtrack_detector.detect_from_takeoff(
+                taxi_candidate,
+                takeoff_phase,
+                context,
+            )
 
         if backtrack_detected is None:
             final_taxi = self.__generate_phase(
@@ -155,6 +203,9 @@ class PhasesAggregator:
     ) -> List[FlightPhase]:
         """Return the taxi with backtrack phase if it's found"""
         result = []
+        if "backtrack" not in self.profile.detectors:
+            return [self.__generate_phase(events, "taxi", start, end, self.taxi_analyzer)]
+
         #Without analysis
         taxi_candidate = self.__generate_phase(
             events,
@@ -164,11 +215,12 @@ class PhasesAggregator:
             None
         )
 
-        backtrack_detected = self.backtrack_detector.detect_from_landing(
-            taxi_candidate,
-            landing_phase,
-            context,
-        )
+        with self.profiler.stage("detect.backtrack", len(taxi_candidate.events)):
+            backtrack_detected = self.backtrack_detector.detect_from_landing(
+                taxi_candidate,
+                landing_phase,
+                context,
+            )
 
         if backtrack_detected is None:
             final_taxi = self.__generate_phase(
@@ -215,11 +267,12 @@ class PhasesAggregator:
         detector, analyzer = self.detectors["touch_go"]
 
         while curr_start < landing_start:
-            found_touch_go = detector.detect(
-                events, 
-                curr_start, 
-                landing_start, 
-            )
+            with self.profiler.stage("detect.touch_go", len(events)):
+                found_touch_go = detector.detect(
+                    events, 
+                    curr_start, 
+                    landing_start, 
+                )
 
             if found_touch_go is None:
                 curr_start = landing_start
@@ -232,6 +285,22 @@ class PhasesAggregator:
 
         return result
 
+    def __find_cruise(
+        self,
+        events: List[FlightEvent],
+        start: datetime,
+        end: datetime,
+    ) -> Optional[FlightPhase]:
+        """Cruise phase between start and end, None if not found."""
+        cruise_detector, cruise_analyzer = self.detectors["cruise"]
+        with self.profiler.stage("detect.cruise", len(events)):
+            found_cruise = cruise_detector.detect(events, start, end)
+
+        if found_cruise is None:
+            return None
+        cruise_start, cruise_end = found_cruise
+        return self.__generate_phase(events, "cruise", cruise_start, cruise_end, cruise_analyzer)
+
     def _generate_approach(
         self,
         events: List[FlightEvent],
@@ -311,7 +380,86 @@ class PhasesAggregator:
 
         return filled        
 
-    def identify_phases(self, events: List[FlightEvent], context: Optional[FlightContext] = None)-> List[FlightPhase]:
+    def identify_phases(
+        self,
+        events: List[FlightEvent],
+        context: Optional[FlightContext] = None,
+        memo: Optional["PhaseMemo"] = None,
+    ) -> List[FlightPhase]:
+        """Detect and analyze the phases of the flight.
+
+        With a memo, the phase boundaries and the analyzer results stored by a previous run
+        are reused: only the analyzers whose version changed run again. The memo is only
+        used by the full profile.
+        """
+        if not self.profile.is_full:
+            memo = None
+        self.profiler.count("events", len(events))
+        if not isinstance(events, IndexedEvents):
+            events = IndexedEvents(events)
+
+        self._memo = memo
+        self._blackboard = FlightBlackboard()
+        try:
+            boundaries = memo.phases() if memo is not None else None
+            if boundaries is None:
+                final_result = self.__detect_phases(events, context)
+            else:
+                final_result = self.__replay_phases(events, boundaries, context)
+
+            if memo is not None:
+                memo.save(final_result)
+        finally:
+            self._memo = None
+            self._blackboard = None
+
+        self.profiler.count("phases", len(final_result))
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for phase in final_result:
+                logger.debug("Phase %s", phase)
+
+        return final_result
+
+    def __replay_phases(
+        self,
+        events: List[FlightEvent],
+        boundaries: List["PhaseBoundary"],
+        context: Optional[FlightContext] = None,
+    ) -> List[FlightPhase]:
+        """Rebuild the phases from memoized boundaries without running the detectors."""
+        analyzers = {
+            name: analyzer for name, (_, analyzer) in self.detectors.items() if analyzer is not None
+        }
+        analyzers["taxi"] = self.taxi_analyzer
+        analyzers["approach"] = self.approach_analyzer
+
+        # The final landing goes first: its runway sets the glideslope of the last approach
+        landing_idx = next(i for i, (name, _, _) in enumerate(boundaries) if name == "final_landing")
+        _, landing_start, landing_end = boundaries[landing_idx]
+        landing_phase = self.__generate_phase(
+            events, "final_landing", landing_start, landing_end, analyzers["final_landing"], context
+        )
+
+        landing_glideslope = _get_landing_glideslope(landing_phase, context, self._blackboard)
+        landing_phase_params = {PARAM_GLIDESLOPE_DEG: landing_glideslope} if landing_glideslope is not None else None
+
+        result: List[FlightPhase] = []
+        for i, (name, start, end) in enumerate(boundaries):
+            if i == landing_idx:
+                result.append(landing_phase)
+                continue
+
+            # Same arguments as the detection path: only takeoff and landing use the context
+            phase_context = context if name == "takeoff" else None
+            phase_params = landing_phase_params if i == landing_idx - 1 and name == "approach" else None
+            result.append(
+                self.__generate_phase(events, name, start, end, analyzers.get(name), phase_context, phase_params)
+            )
+
+        return result
+
+    def __detect_phases(self, events: List[FlightEvent], context: Optional[FlightContext] = None) -> List[FlightPhase]:
         result: List[FlightPhase] = []
 
         # === Takeoff & Landing detection ===
@@ -319,12 +467,14 @@ class PhasesAggregator:
         landing_detector, landing_analyzer = self.detectors["final_landing"]
 
         # First check that the flight has takeoff and landing
-        _takeoff = takeoff_detector.detect(events, None, None, context)
+        with self.profiler.stage("detect.takeoff", len(events)):
+            _takeoff = takeoff_detector.detect(events, None, None, context, self._blackboard)
 
         if _takeoff is None:
             raise RuntimeError("Can't identify takeoff phase")
 
-        _landing = landing_detector.detect(events, None, None, context)
+        with self.profiler.stage("detect.final_landing", len(events)):
+            _landing = landing_detector.detect(events, None, None, context, self._blackboard)
 
         if _landing is None:
             raise RuntimeError("Can't identify landing phase")
@@ -337,12 +487,13 @@ class PhasesAggregator:
         # TODO: Rename in all the code final_landing for landing?
         _landing_phase = self.__generate_phase(events, "final_landing",_landing_start, _landing_end, landing_analyzer, context)
 
-        _landing_glideslope = _get_landing_glideslope(_landing_phase, context)
+        _landing_glideslope = _get_landing_glideslope(_landing_phase, context, self._blackboard)
         _landing_phase_params = {PARAM_GLIDESLOPE_DEG: _landing_glideslope} if _landing_glideslope is not None else None
 
         # === Startup / Taxi before takeoff ===
         startup_detector, _ = self.detectors["startup"]
-        _startup = startup_detector.detect(events, None, None)
+        with self.profiler.stage("detect.startup", len(events)):
+            _startup = startup_detector.detect(events, None, None)
 
         if _startup is None:
             first_timestamp = events[0].timestamp
@@ -380,47 +531,48 @@ class PhasesAggregator:
 
         # Generate cruise between takeoff and touch_goes apps and final_landing apps
 
-        _touch_go_phases = self.__get_touch_go_phases(
-            events, 
-            _takeoff_end, 
-            _landing_start,
-        )
+        optional_phases = self.profile.detectors
 
-        # Generate last approach for final_landing
-        _last_landing_app = self._generate_approach(events, _landing_phase, result[-1] if result else None, phase_params=_landing_phase_params)
+        _touch_go_phases = []
+        if "touch_go" in optional_phases:
+            _touch_go_phases = self.__get_touch_go_phases(
+                events, 
+                _takeoff_end, 
+                _landing_start,
+            )
 
-        cruise_detector, cruise_analyzer = self.detectors["cruise"]
-        
-        if len(_touch_go_phases) == 0:
+        # Generate last approach for final_landing
+        _last_landing_app = None
+        if "approach" in optional_phases:
+            _last_landing_app = self._generate_approach(events, _landing_phase, result[-1] if result else None, phase_params=_landing_phase_params)
 
-            found_cruise = cruise_detector.detect(
-                events,
-                _takeoff_end + timedelta(microseconds=1),
-                _last_landing_app.start + timedelta(microseconds=-1)
-            )
+        # Detecting cruises implies detecting approaches (see phases.profiles)
+        detect_cruise = "cruise" in optional_phases
 
-            if found_cruise is not None:
-                cruise_start, cruise_end = found_cruise
-                cruise_phase = self.__generate_phase(events, "cruise", cruise_start, cruise_end, cruise_analyzer)
-                result.append(cruise_phase)
+        if len(_touch_go_phases) == 0:
+            if detect_cruise:
+                cruise_phase = self.__find_cruise(
+                    events,
+                    _takeoff_end + timedelta(microseconds=1),
+                    _last_landing_app.start + timedelta(microseconds=-1),
+                )
+                if cruise_phase is not None:
+                    result.append(cruise_phase)
 
         else:
             look_for_cruise_start = _takeoff_end + timedelta(microseconds=1)
 
             for _touch_go in _touch_go_phases:
 
-                _touch_go_app = self._generate_approach(events, _touch_go, result[-1] if result else None)
+                _touch_go_app = None
+                if "approach" in optional_phases:
+                    _touch_go_app = self._generate_approach(events, _touch_go, result[-1] if result else None)
 
-                cruise_end_limit = _touch_go_app.start if _touch_go_app else _touch_go.start
-                found_cruise = cruise_detector.detect(
-                    events,
-                    look_for_cruise_start,
-                    cruise_end_limit + timedelta(microseconds=-1)
-                )
-                if found_cruise is not None:
-                    cruise_start, cruise_end = found_cruise
-                    cruise_phase = self.__generate_phase(events, "cruise", cruise_start, cruise_end, cruise_analyzer)
-                    result.append(cruise_phase)
+                if detect_cruise:
+                    cruise_end_limit = _touch_go_app.start if _touch_go_app else _touch_go.start
+                    cruise_phase = self.__find_cruise(events, look_for_cruise_start, cruise_end_limit + timedelta(microseconds=-1))
+                    if cruise_phase is not None:
+                        result.append(cruise_phase)
 
                 if _touch_go_app is not None:
                     result.append(_touch_go_app)
@@ -428,29 +580,30 @@ class PhasesAggregator:
                 look_for_cruise_start = _touch_go.end + timedelta(microseconds=1)
 
             # Add cruise part from last_touch_go to last_landing_app start
-            found_cruise = cruise_detector.detect(
-                events,
-                look_for_cruise_start,
-                _last_landing_app.start + timedelta(microseconds=-1)
-            )
-            if found_cruise is not None:
-                cruise_start, cruise_end = found_cruise
-                cruise_phase = self.__generate_phase(events, "cruise", cruise_start, cruise_end, cruise_analyzer)
-                result.append(cruise_phase)
+            if detect_cruise:
+                cruise_phase = self.__find_cruise(
+                    events,
+                    look_for_cruise_start,
+                    _last_landing_app.start + timedelta(microseconds=-1),
+                )
+                if cruise_phase is not None:
+                    result.append(cruise_phase)
 
         # Once cruise and touch and goes apps are computed, add app and landing
         # === Final approach + landing ===
-        result.append(_last_landing_app)
+        if "approach" in optional_phases:
+            result.append(_last_landing_app)
         result.append(_landing_phase)
 
         # === Shutdown / Taxi after landing ===
         last_timestamp = events[len(events) - 1].timestamp
         shutdown_detector, _ = self.detectors["shutdown"]
-        _shutdown = shutdown_detector.detect(
-            events, 
-            _landing_end + timedelta(microseconds=1), 
-            last_timestamp
-        )
+        with self.profiler.stage("detect.shutdown", len(events)):
+            _shutdown = shutdown_detector.detect(
+                events, 
+                _landing_end + timedelta(microseconds=1), 
+                last_timestamp
+            )
 
         if _shutdown is None:            
 
@@ -482,11 +635,6 @@ class PhasesAggregator:
 
             result.append(_shutdown_phase)
 
-        final_result = self.__fill_gaps_with_unknown(result, events)
-
-        for phase in final_result:
-            print(phase)
-
-        return final_result
+        return self.__fill_gaps_with_unknown(result, events)
 
 
@@ -0,0 +1,108 @@
+"""Named analysis profiles: which phases are detected and which analyzers run.
+
+Startup, takeoff, final landing and shutdown are always detected: they bound the flight,
+and the global metrics (block / airborne time, fuel, distance) only depend on them. The
+other phases are detected on demand, with the phases their detection depends on:
+
+- touch_go: none
+- approach: touch and goes (an approach ends at a touch)
+- cruise: touch and goes and approaches (a cruise ends where they start)
+- backtrack: none (runway geometry on the taxi phases)
+
+An analyzer needs its phase detected. The approach analyzer also needs the final landing
+analyzer (glideslope of the landing runway), and the taxi analyzer the backtrack
+detection (otherwise the taxi phase would include the backtrack). Parts of the flight
+of the phases not detected are reported as unknown phases.
+"""
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Tuple, Union
+
+FULL = "full"
+METRICS_ONLY = "metrics-only"
+LANDING_ONLY = "landing-only"
+
+# Phases detected only when a profile asks for them
+OPTIONAL_PHASES = ("touch_go", "approach", "cruise", "backtrack")
+# Phases with an analyzer
+ANALYZED_PHASES = ("takeoff", "touch_go", "cruise", "approach", "final_landing", "taxi")
+
+# Optional phase -> optional phases its detection needs
+_DETECTION_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "touch_go": (),
+    "approach": ("touch_go",),
+    "cruise": ("touch_go", "approach"),
+    "backtrack": (),
+}
+
+# Analyzed phase -> (optional phases detected, other analyzers) it needs
+_ANALYZER_DEPENDENCIES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "takeoff": ((), ()),
+    "touch_go": (("touch_go",), ()),
+    "cruise": (("cruise",), ()),
+    "approach": (("approach",), ("final_landing",)),
+    "final_landing": ((), ()),
+    "taxi": (("backtrack",), ()),
+}
+
+
+@dataclass(frozen=True)
+class AnalysisProfile:
+    name: str
+    # Phases whose analyzer runs
+    analyzers: FrozenSet[str]
+    # Optional phases detected (see OPTIONAL_PHASES)
+    detectors: FrozenSet[str]
+
+    @property
+    def is_full(self) -> bool:
+        return self.analyzers == frozenset(ANALYZED_PHASES) and self.detectors == frozenset(OPTIONAL_PHASES)
+
+
+def make_profile(name: str, analyzers: Iterable[str], detectors: Iterable[str] = ()) -> AnalysisProfile:
+    """Profile running the analyzers and detecting the optional phases given, plus every
+    analyzer and detection they depend on."""
+    pending_analyzers = list(analyzers)
+    pending_detectors = list(detectors)
+    resolved_analyzers = set()
+    resolved_detectors = set()
+
+    while pending_analyzers:
+        phase = pending_analyzers.pop()
+        if phase not in _ANALYZER_DEPENDENCIES:
+            raise ValueError(f"Unknown analyzed phase: {phase}")
+        if phase not in resolved_analyzers:
+            resolved_analyzers.add(phase)
+            needed_detectors, needed_analyzers = _ANALYZER_DEPENDENCIES[phase]
+            pending_detectors.extend(needed_detectors)
+            pending_analyzers.extend(needed_analyzers)
+
+    while pending_detectors:
+        phase = pending_detectors.pop()
+        if phase not in _DETECTION_DEPENDENCIES:
+            raise ValueError(f"Unknown optional phase: {phase}")
+        if phase not in resolved_detectors:
+            resolved_detectors.add(phase)
+            pending_detectors.extend(_DETECTION_DEPENDENCIES[phase])
+
+    return AnalysisProfile(name, frozenset(resolved_analyzers), frozenset(resolved_detectors))
+
+
+PROFILES: Dict[str, AnalysisProfile] = {
+    FULL: make_profile(FULL, ANALYZED_PHASES, OPTIONAL_PHASES),
+    # Only the global metrics: no analyzer, no runway geometry for backtracks
+    METRICS_ONLY: make_profile(METRICS_ONLY, ()),
+    # Final landing and the approaches
+    LANDING_ONLY: make_profile(LANDING_ONLY, ("final_landing", "approach")),
+}
+
+
+def get_profile(profile: Union[str, AnalysisProfile, None]) -> AnalysisProfile:
+    """Profile by name (see PROFILES). None is the full analysis."""
+    if profile is None:
+        return PROFILES[FULL]
+    if isinstance(profile, AnalysisProfile):
+        return profile
+    found = PROFILES.get(profile)
+    if found is None:
+        raise ValueError(f"Unknown analysis profile: {profile} (known: {', '.join(PROFILES)})")
+    return found
@@ -0,0 +1,151 @@
+"""Quick rejection of flight files that can't be analyzed.
+
+Aborted sessions (never airborne, or not landed when the upload ends) only fail in
+PhasesAggregator after takeoff / landing detection, once the whole file is parsed into
+FlightEvents. precheck_flight_data looks at the plain decoded JSON dicts (a fraction of
+the parse cost) in one pass for what those detectors need, and returns why a file
+can't be analyzed:
+
+- an event with onGround False (TakeoffDetector)
+- the last full event on ground (FinalLandingDetector)
+- an event with LandingVSFpm (FinalLandingDetector)
+
+Files that pass can still fail later on other grounds (Ex: an approach without
+vertical speed).
+"""
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+from mam_analyzer.models.event_layout import FULL_EVENT_KEYS
+from mam_analyzer.parser import is_archive
+from mam_analyzer.utils.parsing import parse_timestamp
+
+# Naive ISO 8601 timestamps: two with the same length and date / time separator compare
+# as text like their datetimes, without parsing them
+_NAIVE_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?")
+
+_FULL_EVENT_KEYS = frozenset(FULL_EVENT_KEYS)
+
+NO_EVENTS = "no_events"
+NO_AIRBORNE_EVENT = "no_airborne_event"
+NO_FULL_EVENT = "no_full_event"
+NOT_ON_GROUND_AT_END = "not_on_ground_at_end"
+NO_LANDING_VS = "no_landing_vs"
+
+REASON_MESSAGES = {
+    NO_EVENTS: "The flight has no events",
+    NO_AIRBORNE_EVENT: "No event on air: can't identify takeoff phase",
+    NO_FULL_EVENT: "No full event: can't identify landing phase",
+    NOT_ON_GROUND_AT_END: "The last full event isn't on ground: can't identify landing phase",
+    NO_LANDING_VS: "No event with LandingVSFpm: can't identify landing phase",
+}
+
+
+@dataclass
+class PrecheckResult:
+    # One of the reason constants when the flight can't be analyzed
+    reason: Optional[str] = None
+    # Events looked at
+    events: int = 0
+
+    @property
+    def analyzable(self) -> bool:
+        return self.reason is None
+
+    @property
+    def message(self) -> Optional[str]:
+        return REASON_MESSAGES.get(self.reason)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "analyzable": self.analyzable,
+            "reason": self.reason,
+            "message": self.message,
+            "events": self.events,
+        }
+
+
+class UnanalyzableFlight(ValueError):
+    """A flight rejected by the precheck."""
+
+    def __init__(self, result: PrecheckResult):
+        # The result is the only argument: the exception is sent back from worker processes
+        super().__init__(result)
+        self.result = result
+
+    def __str__(self) -> str:
+        return self.result.message
+
+
+# Same as FlightEvent.on_ground: "true" is on ground, any other text on air
+def _is_true(value: Any) -> bool:
+    return isinstance(value, str) and value.strip().lower() == "true"
+
+
+def _is_false(value: Any) -> bool:
+    return isinstance(value, str) and value.strip().lower() != "true"
+
+
+def _not_before(timestamp: str, other: str) -> bool:
+    """timestamp >= other."""
+    if (
+        len(timestamp) == len(other)
+        and timestamp[10:11] == other[10:11]
+        and _NAIVE_TIMESTAMP.fullmatch(timestamp)
+        and _NAIVE_TIMESTAMP.fullmatch(other)
+    ):
+        return timestamp >= other
+    return parse_timestamp(timestamp) >= parse_timestamp(other)
+
+
+def precheck_events(events: Iterable[Dict[str, Any]]) -> PrecheckResult:
+    """Checks the events of a flight file as decoded JSON dicts."""
+    count = 0
+    airborne = False
+    landing_vs = False
+    # Last full event by timestamp (same as the parsed events ordered by ingest)
+    last_full_timestamp: Optional[str] = None
+    last_full_on_ground = False
+
+    for e in events:
+        count += 1
+        changes = e.get("Changes") or {}
+        if not airborne and _is_false(changes.get("onGround")):
+            airborne = True
+        if not landing_vs and changes.get("LandingVSFpm") not in (None, ""):
+            landing_vs = True
+        if _FULL_EVENT_KEYS <= changes.keys():
+            timestamp = e["Timestamp"]
+            if last_full_timestamp is None or _not_before(timestamp, last_full_timestamp):
+                last_full_timestamp = timestamp
+                last_full_on_ground = _is_true(changes["onGround"])
+
+    if count == 0:
+        reason = NO_EVENTS
+    elif not airborne:
+        reason = NO_AIRBORNE_EVENT
+    elif last_full_timestamp is None:
+        reason = NO_FULL_EVENT
+    elif not last_full_on_ground:
+        reason = NOT_ON_GROUND_AT_END
+    elif not landing_vs:
+        reason = NO_LANDING_VS
+    else:
+        reason = None
+    return PrecheckResult(reason, count)
+
+
+def precheck_flight_data(data: Union[bytes, str]) -> PrecheckResult:
+    """Checks the content of a flight file, JSON or archive, without parsing its events."""
+    if isinstance(data, bytes) and is_archive(data):
+        from mam_analyzer.archive import decode_flight
+        return precheck_events(decode_flight(data)["Events"])
+    return precheck_events(json.loads(data)["Events"])
+
+
+def precheck_flight_file(filepath: Union[str, Path]) -> PrecheckResult:
+    with open(filepath, "rb") as f:
+        return precheck_flight_data(f.read())
@@ -0,0 +1,103 @@
+"""Decimated tracks for quick provisional reports.
+
+FlightEvaluator.preview detects the phases (PREVIEW_PROFILE: no analyzer, no backtrack)
+over a fraction of the events: every step-th event plus the events the phase boundaries
+hang on:
+
+- the last event and the last full event (final landing / shutdown)
+- onGround transitions (takeoff, touch and goes, landing)
+- LandingVSFpm events (touches)
+- engine changes, and the first full event after them (startup / shutdown)
+- flaps / gear changes (takeoff end) and moving / stopped changes (startup, shutdown)
+- heading changes of more than HEADING_STEP (takeoff run, runway exit)
+
+and the event before every transition, as boundaries are often the event before one.
+Boundaries found by walks over the other events land on a kept neighbour instead, so
+they are approximate.
+"""
+from typing import Dict, List, Optional
+
+from mam_analyzer.models.flight_events import FlightEvent
+from mam_analyzer.phases.profiles import make_profile
+from mam_analyzer.utils.search import IndexedEvents
+from mam_analyzer.utils.units import heading_within_range
+
+# Every step-th event is kept
+DEFAULT_PREVIEW_STEP = 10
+
+# Phases of the timeline, without analyzers nor runway geometry
+PREVIEW_PROFILE = make_profile("preview", (), ("touch_go", "approach", "cruise"))
+
+# Heading change from the last kept heading that keeps an event (tolerance of the heading
+# walks of the detectors, see units.heading_within_range)
+HEADING_STEP = 6
+
+
+def _engine_changes(e: FlightEvent, engines: dict) -> bool:
+    """True if the event changes the state of an engine (engines is updated)."""
+    changed = False
+    for key, value in e.change_items():
+        if key.startswith("Engine ") and engines.get(key) != value:
+            engines[key] = value
+            changed = True
+    return changed
+
+
+def decimate_events(events: List[FlightEvent], step: int = DEFAULT_PREVIEW_STEP) -> IndexedEvents:
+    """Events kept for a preview of the flight (see module doc), in their order."""
+    if step < 1:
+        raise ValueError(f"step must be at least 1: {step}")
+
+    n = len(events)
+    keep = [i % step == 0 for i in range(n)]
+    if n:
+        keep[-1] = True
+    for i in range(n - 1, -1, -1):
+        if events[i].is_full_event():
+            keep[i] = True
+            break
+
+    on_ground: Optional[bool] = None
+    engines: Dict[str, str] = {}
+    full_pending = False
+    configuration = (None, None)
+    heading: Optional[int] = None
+    location = None
+    moving: Optional[bool] = None
+    for i, e in enumerate(events):
+        transition = False
+        if e.on_ground is not None:
+            transition = on_ground is not None and e.on_ground != on_ground
+            on_ground = e.on_ground
+        if e.has_change("LandingVSFpm"):
+            transition = True
+        if e.flaps is not None or e.gear is not None:
+            # Flaps / gear changes (takeoff end)
+            changed = (
+                e.flaps if e.flaps is not None else configuration[0],
+                e.gear if e.gear is not None else configuration[1],
+            )
+            transition = transition or (configuration != (None, None) and changed != configuration)
+            configuration = changed
+        if _engine_changes(e, engines) and i > 0:
+            transition = full_pending = True
+        if e.latitude is not None and e.longitude is not None:
+            moved = location is not None and (e.latitude, e.longitude) != location
+            transition = transition or (moving is not None and moved != moving)
+            location = (e.latitude, e.longitude)
+            moving = moved
+
+        if transition:
+            keep[i] = True
+            if i > 0:
+                keep[i - 1] = True
+        if full_pending and e.is_full_event():
+            keep[i] = True
+            full_pending = False
+        if e.heading is not None:
+            if heading is None or not heading_within_range(e.heading, heading, HEADING_STEP):
+                keep[i] = True
+            if keep[i]:
+                heading = e.heading
+
+    return IndexedEvents(e for e, kept in zip(events, keep) if kept)
@@ -0,0 +1,191 @@
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class Profiler:
+    """Collect wall-clock timings and counters of the analysis stages.
+
+    Every stage is identified by a name (Ex: "detect.takeoff", "analyze.taxi") and
+    accumulates the number of calls, the elapsed seconds and the number of events
+    it received (events scanned). Counters are free named integers.
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str, events: int = 0) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = {"calls": 0, "seconds": 0.0, "events": 0}
+                self.stages[name] = stage
+            stage["calls"] += 1
+            stage["seconds"] += elapsed
+            stage["events"] += events
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stages": {
+                name: {
+                    "calls": stage["calls"],
+                    "seconds": round(stage["seconds"], 6),
+                    "events": stage["events"],
+                }
+                for name, stage in self.stages.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of the process in KiB (None where not available)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux KiB
+    if sys.platform == "darwin":
+        peak //= 1024
+    return peak
+
+
+class MemoryProfiler(Profiler):
+    """Profiler that also tracks memory per stage.
+
+    On top of the timings, every stage records the tracemalloc peak (bytes above
+    the memory in use when the stage started), the net bytes still allocated when
+    it finished, the process peak RSS after it and its top allocation sites.
+    tracemalloc slows down the analysis considerably, only use it to investigate.
+    """
+
+    def __init__(self, top: int = 5) -> None:
+        super().__init__()
+        self.top = top
+        self.memory: Dict[str, Dict[str, Any]] = {}
+        self._open: List[Dict[str, int]] = []
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+
+    def _propagate_peak(self) -> None:
+        # tracemalloc has a single peak: fold it into the open stages before resetting it
+        _, peak = tracemalloc.get_traced_memory()
+        for frame in self._open:
+            frame["peak"] = max(frame["peak"], peak)
+
+    @contextmanager
+    def stage(self, name: str, events: int = 0) -> Iterator[None]:
+        self._propagate_peak()
+        before = self._snapshot()
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        frame = {"start": current, "peak": current}
+        self._open.append(frame)
+        try:
+            with super().stage(name, events):
+                yield
+        finally:
+            self._propagate_peak()
+            self._open.pop()
+            current, _ = tracemalloc.get_traced_memory()
+            after = self._snapshot()
+            self._record(name, frame, current, after.compare_to(before, "lineno"))
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        # Leave out the profiler's own bookkeeping
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def _record(self, name: str, frame: Dict[str, int], current: int, diff) -> None:
+        memory = self.memory.get(name)
+        if memory is None:
+            memory = {"peak_bytes": 0, "allocated_bytes": 0, "peak_rss_kb": None, "allocators": {}}
+            self.memory[name] = memory
+        memory["peak_bytes"] = max(memory["peak_bytes"], frame["peak"] - frame["start"])
+        memory["allocated_bytes"] += current - frame["start"]
+        memory["peak_rss_kb"] = peak_rss_kb()
+
+        allocators = memory["allocators"]
+        for stat in diff:
+            if stat.size_diff <= 0:
+                continue
+            frame_info = stat.traceback[0]
+            location = f"{frame_info.filename}:{frame_info.lineno}"
+            size, count = allocators.get(location, (0, 0))
+            allocators[location] = (size + stat.size_diff, count + stat.count_diff)
+
+    def _top_allocators(self, allocators: Dict[str, Any]) -> List[Dict[str, Any]]:
+        top = sorted(allocators.items(), key=lambda item: item[1][0], reverse=True)[:self.top]
+        return [
+            {"location": location, "size_bytes": size, "count": count}
+            for location, (size, count) in top
+        ]
+
+    def stop(self) -> None:
+        """Stop tracing memory allocations (only if this profiler started it)."""
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = super().to_dict()
+        for name, stage in result["stages"].items():
+            memory = self.memory.get(name)
+            if memory is not None:
+                stage["memory"] = {
+                    "peak_bytes": memory["peak_bytes"],
+                    "allocated_bytes": memory["allocated_bytes"],
+                    "peak_rss_kb": memory["peak_rss_kb"],
+                    "top_allocators": self._top_allocators(memory["allocators"]),
+                }
+        result["peak_rss_kb"] = peak_rss_kb()
+        return result
+
+
+class _NullStage:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class NullProfiler(Profiler):
+    """Profiler used when instrumentation is disabled: records nothing."""
+
+    enabled = False
+
+    def stage(self, name: str, events: int = 0) -> _NullStage:
+        return _NULL_STAGE
+
+    def count(self, name: str, value: int = 1) -> None:
+        pass
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {}
+
+
+NULL_PROFILER = NullProfiler()
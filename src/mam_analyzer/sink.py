@@ -0,0 +1,176 @@
+"""Normalized SQLite store of flight reports.
+
+One row per flight, global metric, phase, phase metric and issue (or interval of
+coalesced issues, with its end and count), so fleet-wide questions are plain SQL:
+
+    SELECT f.name, i.timestamp FROM issues i JOIN flights f ON f.id = i.flight_id
+    WHERE i.code = 'LandingHardFpm'
+
+Reports are buffered and written every batch_size flights with executemany in a single
+transaction. Scalar values keep their SQLite type, lists and dicts are stored as JSON.
+"""
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+from mam_analyzer.flight_report import FlightReport
+from mam_analyzer.ingest import expanded_event_count
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flights (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS global_metrics (
+    flight_id INTEGER NOT NULL REFERENCES flights (id),
+    name TEXT NOT NULL,
+    value,
+    PRIMARY KEY (flight_id, name)
+);
+CREATE TABLE IF NOT EXISTS phases (
+    flight_id INTEGER NOT NULL REFERENCES flights (id),
+    idx INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    first_event INTEGER,
+    last_event INTEGER,
+    PRIMARY KEY (flight_id, idx)
+);
+CREATE TABLE IF NOT EXISTS phase_metrics (
+    flight_id INTEGER NOT NULL REFERENCES flights (id),
+    phase_idx INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value,
+    PRIMARY KEY (flight_id, phase_idx, name)
+);
+CREATE TABLE IF NOT EXISTS issues (
+    flight_id INTEGER NOT NULL REFERENCES flights (id),
+    phase_idx INTEGER NOT NULL,
+    code TEXT NOT NULL,
+    timestamp TEXT,
+    value,
+    -- Coalesced issues: last issue of the interval and number of issues merged
+    end TEXT,
+    count INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS issues_code ON issues (code, timestamp);
+CREATE INDEX IF NOT EXISTS issues_timestamp ON issues (timestamp);
+CREATE INDEX IF NOT EXISTS issues_flight ON issues (flight_id);
+CREATE INDEX IF NOT EXISTS phase_metrics_name ON phase_metrics (name);
+CREATE INDEX IF NOT EXISTS phases_name ON phases (name);
+"""
+
+_CHILD_TABLES = ("global_metrics", "phases", "phase_metrics", "issues")
+
+
+def _value(value: Any) -> Any:
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+def _phase_rows(report: Union[FlightReport, Dict[str, Any]]) -> Tuple[Dict[str, Any], List[Tuple[str, str, str, int, Dict[str, Any]]]]:
+    """(global metrics, [(name, start, end, event count, analysis dict)]) of a report or its to_dict()."""
+    if isinstance(report, FlightReport):
+        return report.global_metrics, [
+            (p.name, p.start.isoformat(), p.end.isoformat(), expanded_event_count(p.events), p.analysis_dict(report.issue_coalescing))
+            for p in report.phases
+        ]
+    return report["global"], [
+        (p["name"], p["start"], p["end"], len(p["events"]), p["analysis"])
+        for p in report["phases"]
+    ]
+
+
+class SqliteReportSink:
+    """Writes reports into the normalized schema. A flight added again replaces the previous one."""
+
+    def __init__(self, path, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._next_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM flights").fetchone()[0]
+        self._pending: List[Tuple[str, Union[FlightReport, Dict[str, Any]]]] = []
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self._conn
+
+    def add_report(self, name: str, report: Union[FlightReport, Dict[str, Any]]) -> None:
+        """Queue the report of the flight, writing the queue once it reaches batch_size."""
+        self._pending.append((name, report))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+
+        flights = []
+        global_metrics = []
+        phases = []
+        phase_metrics = []
+        issues = []
+        # The last report of a flight wins, also inside one batch
+        pending = dict(self._pending)
+
+        for name, report in pending.items():
+            flight_id = self._next_id
+            self._next_id += 1
+            flights.append((flight_id, name))
+
+            global_dict, phase_rows = _phase_rows(report)
+            global_metrics.extend((flight_id, key, _value(value)) for key, value in global_dict.items())
+
+            # Phases are consecutive and every event belongs to one of them
+            first_event = 0
+            for idx, (phase_name, start, end, count, analysis) in enumerate(phase_rows):
+                first, last = (first_event, first_event + count - 1) if count else (None, None)
+                phases.append((flight_id, idx, phase_name, start, end, first, last))
+                first_event += count
+
+                phase_metrics.extend(
+                    (flight_id, idx, key, _value(value)) for key, value in analysis["phase_metrics"].items()
+                )
+                issues.extend(
+                    (flight_id, idx, issue["code"], issue["timestamp"], _value(issue["value"]), issue.get("end"), issue.get("count", 1))
+                    for issue in analysis["issues"]
+                )
+
+        names = [(name,) for name in pending]
+        with self._conn:
+            for table in _CHILD_TABLES:
+                self._conn.executemany(
+                    f"DELETE FROM {table} WHERE flight_id IN (SELECT id FROM flights WHERE name = ?)", names
+                )
+            self._conn.executemany("DELETE FROM flights WHERE name = ?", names)
+
+            self._conn.executemany("INSERT INTO flights (id, name) VALUES (?, ?)", flights)
+            self._conn.executemany("INSERT INTO global_metrics VALUES (?, ?, ?)", global_metrics)
+            self._conn.executemany("INSERT INTO phases VALUES (?, ?, ?, ?, ?, ?, ?)", phases)
+            self._conn.executemany("INSERT INTO phase_metrics VALUES (?, ?, ?, ?)", phase_metrics)
+            self._conn.executemany("INSERT INTO issues VALUES (?, ?, ?, ?, ?, ?, ?)", issues)
+
+        logger.debug("Stored %d flight reports in %s", len(flights), self.path)
+        self._pending = []
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "SqliteReportSink":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.close()
+        return False
@@ -0,0 +1,543 @@
+"""Synthetic MAM ACARS flights for benchmarks and stress tests.
+
+The generator simulates a complete flight (startup, taxi, takeoff, climb, cruise
+with step climbs, descent, approach, touch-and-goes, landing, taxi and shutdown)
+and emits the events the way MAM ACARS records them: full events at a fixed
+cadence (and on ground transitions / touchdowns) and delta events with only the
+changed values in between, using comma decimals.
+
+Events are produced lazily so flights with millions of events can be streamed to
+disk with `write_flight` without keeping them in memory.
+"""
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from math import asin, atan2, cos, degrees, radians, sin, tan
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from mam_analyzer.models.flight_context import AirportContext, FlightContext, Runway, RunwayEnd
+from mam_analyzer.utils.units import compute_bearing, haversine
+
+_KNOT_MS = 1852 / 3600
+_FT_M = 0.3048
+_EARTH_RADIUS_M = 6371000
+
+_RUNWAY_LENGTH_M = 3500
+_RUNWAY_WIDTH_M = 45
+_FINAL_LENGTH_M = 15000          # intermediate fix distance before the threshold
+_TOUCHDOWN_OFFSET_M = 300        # touchdown point past the threshold
+_CIRCUIT_HEIGHT_FT = 1500
+_GLIDESLOPE_DEG = 3.0
+
+_TAXI_SPEED_KT = 15
+_ROTATE_SPEED_KT = 140
+_CLIMB_SPEED_KT = 300
+_DESCENT_SPEED_KT = 300
+_APPROACH_SPEED_KT = 140
+_CLIMB_FPM = 2500
+_DESCENT_FPM = 2000
+
+# Fuel flow per engine (kg/s)
+_FUEL_FLOW_GROUND = 0.05
+_FUEL_FLOW_CLIMB = 0.8
+_FUEL_FLOW_CRUISE = 0.6
+_FUEL_FLOW_DESCENT = 0.25
+
+# Keys sent together in delta events when any of them changes
+_POSITION_KEYS = ("Latitude", "Longitude")
+_DELTA_GROUPS = (
+    ("onGround",),
+    ("Altitude", "AGLAltitude", "Altimeter", "VSFpm", "VSLast3Avg"),
+    ("Heading",),
+    ("GSKnots", "IASKnots"),
+    ("Flaps",),
+    ("Gear",),
+    ("AP",),
+)
+_MAX_DELTA_KEYS = 10
+
+
+@dataclass
+class SyntheticFlightConfig:
+    departure_icao: str = "SYDP"
+    departure_latitude: float = 40.0
+    departure_longitude: float = -3.0
+    departure_heading: float = 90.0
+    departure_elevation_ft: int = 2000
+    arrival_icao: str = "SYAR"
+    arrival_heading: float = 120.0
+    arrival_elevation_ft: int = 100
+    cruise_minutes: float = 60
+    cruise_altitude_ft: int = 35000
+    step_climbs: int = 1
+    step_climb_ft: int = 2000
+    cruise_speed_kt: int = 450
+    touch_and_goes: int = 0
+    preflight_minutes: float = 10
+    postflight_minutes: float = 5
+    sample_seconds: float = 1.0      # delta events density
+    full_event_seconds: float = 60.0  # full events cadence
+    engines: int = 2
+    initial_fuel_kg: Optional[float] = None
+    zfw_kg: Optional[int] = 60000
+    vs_last3_avg: bool = True
+    start_time: datetime = datetime(2025, 1, 1, 8, 0, 0)
+    seed: int = 0
+
+
+def format_decimal(value: float) -> str:
+    """Format a float the way MAM ACARS does (comma as decimal separator)."""
+    return repr(value).replace(".", ",")
+
+
+def _destination(lat: float, lon: float, bearing_deg: float, distance_m: float) -> Tuple[float, float]:
+    """Point reached from (lat, lon) after distance_m along bearing_deg (great circle)."""
+    d = distance_m / _EARTH_RADIUS_M
+    b = radians(bearing_deg)
+    lat1 = radians(lat)
+    lon1 = radians(lon)
+    lat2 = asin(sin(lat1) * cos(d) + cos(lat1) * sin(d) * cos(b))
+    lon2 = lon1 + atan2(sin(b) * sin(d) * cos(lat1), cos(d) - sin(lat1) * sin(lat2))
+    return degrees(lat2), (degrees(lon2) + 540) % 360 - 180
+
+
+def _designator(heading: float) -> str:
+    number = round(heading / 10) % 36
+    return f"{number or 36:02d}"
+
+
+def _build_runway(lat: float, lon: float, heading: float) -> Runway:
+    end_lat, end_lon = _destination(lat, lon, heading, _RUNWAY_LENGTH_M)
+    opposite = (heading + 180) % 360
+    return Runway(
+        designators=f"{_designator(heading)}/{_designator(opposite)}",
+        width_m=_RUNWAY_WIDTH_M,
+        length_m=_RUNWAY_LENGTH_M,
+        ends=[
+            RunwayEnd(
+                designator=_designator(heading), latitude=lat, longitude=lon,
+                true_heading_deg=heading, displaced_threshold_m=0, stopway_m=0,
+            ),
+            RunwayEnd(
+                designator=_designator(opposite), latitude=end_lat, longitude=end_lon,
+                true_heading_deg=opposite, displaced_threshold_m=0, stopway_m=0,
+            ),
+        ],
+    )
+
+
+def _climb_distance_m(from_ft: float, to_ft: float, speed_kt: float, fpm: float) -> float:
+    return max(0.0, to_ft - from_ft) / fpm * 60 * speed_kt * _KNOT_MS
+
+
+def _arrival_threshold(config: SyntheticFlightConfig) -> Tuple[float, float]:
+    """Place the arrival runway so the cruise lasts about `cruise_minutes`."""
+    dep_end = _destination(
+        config.departure_latitude, config.departure_longitude,
+        config.departure_heading, _RUNWAY_LENGTH_M,
+    )
+    top_ft = config.cruise_altitude_ft + config.step_climbs * config.step_climb_ft
+    distance = (
+        _climb_distance_m(config.departure_elevation_ft, config.cruise_altitude_ft, _CLIMB_SPEED_KT, _CLIMB_FPM)
+        + config.cruise_minutes * 60 * config.cruise_speed_kt * _KNOT_MS
+        + _climb_distance_m(config.arrival_elevation_ft + 3000, top_ft, _DESCENT_SPEED_KT, _DESCENT_FPM)
+    )
+    fix = _destination(dep_end[0], dep_end[1], config.departure_heading, distance)
+    return _destination(fix[0], fix[1], config.arrival_heading, _FINAL_LENGTH_M)
+
+
+def generate_flight_context(config: SyntheticFlightConfig) -> FlightContext:
+    """Return the FlightContext (departure and arrival runways) matching the generated flight."""
+    departure = AirportContext(
+        icao=config.departure_icao,
+        runways=[_build_runway(config.departure_latitude, config.departure_longitude, config.departure_heading)],
+    )
+    arr_lat, arr_lon = _arrival_threshold(config)
+    arrival = AirportContext(
+        icao=config.arrival_icao,
+        runways=[_build_runway(arr_lat, arr_lon, config.arrival_heading)],
+    )
+    return FlightContext(departure=departure, destination=arrival, landing=arrival)
+
+
+class _FlightSimulator:
+
+    def __init__(self, config: SyntheticFlightConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.dt = config.sample_seconds
+        self.t = config.start_time
+        self.next_full = self.t
+
+        self.dep_lat = config.departure_latitude
+        self.dep_lon = config.departure_longitude
+        self.arr_lat, self.arr_lon = _arrival_threshold(config)
+
+        # Runway frame used for ground and circuit movements
+        self.frame = (self.dep_lat, self.dep_lon, config.departure_heading)
+        self.along = 800.0
+        self.cross = -300.0
+        self.lat, self.lon = self._frame_position()
+
+        self.elevation = config.departure_elevation_ft
+        self.altitude = float(self.elevation)
+        self.vs = 0.0
+        self.heading = (config.departure_heading + 180) % 360
+        self.gs = 0.0
+        self.on_ground = True
+        self.flaps = 0
+        self.gear = "Down"
+        self.ap = "Off"
+        self.engines = ["Off"] * config.engines
+        self.fuel_flow = 0.0
+        self.last_vs: List[int] = []
+
+        if config.initial_fuel_kg is not None:
+            self.fuel = float(config.initial_fuel_kg)
+        else:
+            engines_seconds = config.engines * (config.cruise_minutes + 90) * 60
+            self.fuel = round(engines_seconds * _FUEL_FLOW_CRUISE * 1.3 + 2000, 3)
+
+        self.emitted: Dict[str, str] = {}
+
+    # === Position helpers ===
+
+    def _frame_position(self) -> Tuple[float, float]:
+        lat, lon, heading = self.frame
+        lat, lon = _destination(lat, lon, heading, self.along)
+        return _destination(lat, lon, heading + 90, self.cross)
+
+    def _set_frame(self, lat: float, lon: float, heading: float) -> None:
+        self.frame = (lat, lon, heading)
+
+    # === Event generation ===
+
+    def _values(self) -> Dict[str, str]:
+        config = self.config
+        vs = 0 if self.on_ground else round(self.vs + self.rng.uniform(-15, 15))
+        altitude = round(self.altitude)
+        values = {
+            "Latitude": format_decimal(round(self.lat, 5)),
+            "Longitude": format_decimal(round(self.lon, 5)),
+            "onGround": "True" if self.on_ground else "False",
+            "Altitude": str(altitude),
+            "AGLAltitude": str(max(0, altitude - self.elevation)),
+            "Altimeter": str(altitude - 264),
+            "VSFpm": str(vs),
+        }
+        if config.vs_last3_avg:
+            self.last_vs = (self.last_vs + [vs])[-3:]
+            values["VSLast3Avg"] = str(round(sum(self.last_vs) / len(self.last_vs)))
+        ias = self.gs if self.on_ground else self.gs / (1 + altitude / 1000 * 0.02)
+        values.update({
+            "Heading": str(round(self.heading) % 360),
+            "GSKnots": str(round(self.gs)),
+            "IASKnots": str(round(ias)),
+            "QNHSet": "1013",
+            "Flaps": str(self.flaps),
+            "Gear": self.gear,
+            "FuelKg": format_decimal(self.fuel),
+            "Squawk": "2000" if self.on_ground else "4512",
+            "AP": self.ap,
+        })
+        for i, status in enumerate(self.engines):
+            values[f"Engine {i + 1}"] = status
+        if config.zfw_kg is not None:
+            values["ZFW"] = str(config.zfw_kg)
+        return values
+
+    def _event(self, full: bool = False, extra: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        values = self._values()
+
+        if full or self.t >= self.next_full:
+            changes = dict(values)
+            self.next_full = self.t + timedelta(seconds=self.config.full_event_seconds)
+        else:
+            changes = {}
+            for group in _DELTA_GROUPS:
+                if any(k in values and self.emitted.get(k) != values[k] for k in group):
+                    for k in group:
+                        if k in values:
+                            changes[k] = values[k]
+            for k, v in values.items():
+                if k.startswith("Engine ") and self.emitted.get(k) != v:
+                    changes[k] = v
+            if changes:
+                changes = {**{k: values[k] for k in _POSITION_KEYS}, **changes}
+            elif any(self.emitted.get(k) != values[k] for k in _POSITION_KEYS):
+                changes = {k: values[k] for k in _POSITION_KEYS}
+            if len(changes) > _MAX_DELTA_KEYS:
+                # As MAM ACARS, a change of most of the state is sent as a full event
+                changes = dict(values)
+                self.next_full = self.t + timedelta(seconds=self.config.full_event_seconds)
+
+        self.emitted.update(changes)
+
+        if extra:
+            changes = {**extra, **changes}
+
+        if not changes:
+            return None
+
+        return {
+            "Timestamp": self.t.isoformat(timespec="microseconds"),
+            "Changes": changes,
+        }
+
+    def _tick(self) -> None:
+        dt = self.dt
+        self.t += timedelta(seconds=dt)
+        self.fuel = max(0.0, round(self.fuel - self.fuel_flow * self._engines_on() * dt, 6))
+        if not self.on_ground:
+            self.altitude += self.vs / 60 * dt
+
+    def _capped_fpm(self, fpm: float, remaining_ft: float) -> float:
+        """Vertical speed to use without overshooting the target altitude in the next tick."""
+        return max(0.0, min(fpm, remaining_ft * 60 / self.dt))
+
+    def _engines_on(self) -> int:
+        return sum(1 for e in self.engines if e == "On")
+
+    def _step(self, full: bool = False, extra: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+        self._tick()
+        event = self._event(full, extra)
+        if event is not None:
+            yield event
+
+    def _move_in_frame(self, heading_offset: float) -> None:
+        distance = self.gs * _KNOT_MS * self.dt
+        angle = radians(heading_offset)
+        self.along += distance * cos(angle)
+        self.cross += distance * sin(angle)
+        self.heading = (self.frame[2] + heading_offset) % 360
+        self.lat, self.lon = self._frame_position()
+
+    def _taxi_leg(self, heading_offset: float, done) -> Iterator[Dict[str, Any]]:
+        self.gs = _TAXI_SPEED_KT
+        self.fuel_flow = _FUEL_FLOW_GROUND
+        while not done():
+            self._move_in_frame(heading_offset)
+            yield from self._step()
+
+    def _wait(self, seconds: float) -> Iterator[Dict[str, Any]]:
+        end = self.t + timedelta(seconds=seconds)
+        while self.t < end:
+            yield from self._step()
+
+    # === Flight phases ===
+
+    def run(self) -> Iterator[Dict[str, Any]]:
+        config = self.config
+
+        # Preflight at the gate (static full events) and engines start
+        first = self._event(full=True)
+        yield first
+        yield from self._wait(config.preflight_minutes * 60)
+        for i in range(config.engines):
+            self.engines[i] = "On"
+            yield from self._wait(20)
+        yield from self._wait(60)
+
+        # Taxi to the runway threshold
+        yield from self._taxi_leg(90, lambda: self.cross >= -150)
+        yield from self._taxi_leg(180, lambda: self.along <= 0)
+        yield from self._taxi_leg(90, lambda: self.cross >= 0)
+        self.along, self.cross = 0.0, 0.0
+        self.gs = 0
+        self.heading = config.departure_heading
+        self.flaps = 5
+        yield from self._wait(20)
+
+        yield from self._takeoff_roll(0)
+        yield from self._climb_and_cruise()
+        yield from self._final_approach(-_FINAL_LENGTH_M)
+
+        for _ in range(config.touch_and_goes):
+            yield from self._touchdown()
+            yield from self._wait_rolling(15)
+            yield from self._takeoff_roll(110)
+            yield from self._circuit()
+            yield from self._final_approach(self.along)
+
+        yield from self._touchdown()
+        yield from self._rollout_and_park()
+
+    def _takeoff_roll(self, initial_speed: float) -> Iterator[Dict[str, Any]]:
+        self.gs = initial_speed
+        self.fuel_flow = _FUEL_FLOW_CLIMB
+        while self.gs < _ROTATE_SPEED_KT:
+            self.gs = min(_ROTATE_SPEED_KT, self.gs + 2.5 * self.dt)
+            self._move_in_frame(0)
+            yield from self._step()
+
+        # Liftoff
+        self.on_ground = False
+        self.vs = 1500
+        self._move_in_frame(0)
+        yield from self._step(full=True)
+
+        liftoff = self.t
+        while self.t < liftoff + timedelta(seconds=40):
+            if self.t >= liftoff + timedelta(seconds=8):
+                self.gear = "Up"
+            self.gs = min(180, self.gs + self.dt)
+            self._move_in_frame(0)
+            yield from self._step()
+        self.flaps = 0
+
+    def _climb_and_cruise(self) -> Iterator[Dict[str, Any]]:
+        config = self.config
+        target = config.cruise_altitude_ft
+        fix_lat, fix_lon = _destination(
+            self.arr_lat, self.arr_lon, config.arrival_heading + 180, _FINAL_LENGTH_M,
+        )
+        descent_target = config.arrival_elevation_ft + 3000
+        step_interval = config.cruise_minutes * 60 / (config.step_climbs + 1)
+        cruise_start = None
+        steps_done = 0
+        descending = False
+        self.ap = "On"
+
+        while True:
+            distance = haversine(self.lat, self.lon, fix_lat, fix_lon)
+            step_distance = self.gs * _KNOT_MS * self.dt
+            if distance <= step_distance:
+                break
+
+            self.heading = compute_bearing(self.lat, self.lon, fix_lat, fix_lon)
+
+            descent_distance = _climb_distance_m(descent_target, self.altitude, _DESCENT_SPEED_KT, _DESCENT_FPM)
+            if not descending and distance <= descent_distance + 5000:
+                descending = True
+
+            if descending:
+                self.gs = max(_DESCENT_SPEED_KT, self.gs - self.dt)
+                self.fuel_flow = _FUEL_FLOW_DESCENT
+                self.vs = -self._capped_fpm(_DESCENT_FPM, self.altitude - descent_target)
+                self.elevation = config.arrival_elevation_ft
+            elif self.altitude < target:
+                self.gs = min(_CLIMB_SPEED_KT, self.gs + self.dt)
+                self.fuel_flow = _FUEL_FLOW_CLIMB
+                self.vs = self._capped_fpm(_CLIMB_FPM, target - self.altitude)
+            else:
+                if cruise_start is None:
+                    cruise_start = self.t
+                self.altitude = target
+                self.gs = min(config.cruise_speed_kt, self.gs + self.dt)
+                self.fuel_flow = _FUEL_FLOW_CRUISE
+                self.vs = 0
+                elapsed = (self.t - cruise_start).total_seconds()
+                if steps_done < config.step_climbs and elapsed >= step_interval * (steps_done + 1):
+                    steps_done += 1
+                    target += config.step_climb_ft
+
+            self.lat, self.lon = _destination(self.lat, self.lon, self.heading, step_distance)
+            yield from self._step()
+
+        # Established on the extended centreline of the arrival runway
+        self._set_frame(self.arr_lat, self.arr_lon, config.arrival_heading)
+        self.along, self.cross = -_FINAL_LENGTH_M, 0.0
+        self.lat, self.lon = self._frame_position()
+        self.elevation = config.arrival_elevation_ft
+
+    def _final_approach(self, along: float) -> Iterator[Dict[str, Any]]:
+        self.along, self.cross = along, 0.0
+        self.ap = "Off"
+        self.fuel_flow = _FUEL_FLOW_DESCENT
+        glide_ratio = tan(radians(_GLIDESLOPE_DEG))
+
+        while self.along < _TOUCHDOWN_OFFSET_M:
+            remaining = -self.along
+            glide_altitude = self.elevation + 50 + max(0.0, remaining) * glide_ratio / _FT_M
+            if remaining < 8000:
+                self.flaps = 30
+                self.gear = "Down"
+            self.gs = max(_APPROACH_SPEED_KT, self.gs - self.dt)
+            if self.altitude > glide_altitude:
+                # Follow the glideslope at the current ground speed
+                self.vs = -self.gs * _KNOT_MS * glide_ratio / _FT_M * 60
+            else:
+                self.vs = 0
+            self._move_in_frame(0)
+            yield from self._step()
+
+    def _touchdown(self) -> Iterator[Dict[str, Any]]:
+        self.on_ground = True
+        self.altitude = self.elevation
+        touch_vs = -round(self.rng.uniform(80, 250))
+        self.vs = 0
+        self.gs = min(self.gs, _APPROACH_SPEED_KT)
+        self._move_in_frame(0)
+        yield from self._step(full=True, extra={"LandingVSFpm": str(touch_vs)})
+
+    def _wait_rolling(self, seconds: float) -> Iterator[Dict[str, Any]]:
+        end = self.t + timedelta(seconds=seconds)
+        while self.t < end:
+            self.gs = max(100, self.gs - 2 * self.dt)
+            self._move_in_frame(0)
+            yield from self._step()
+
+    def _circuit(self) -> Iterator[Dict[str, Any]]:
+        circuit_altitude = self.elevation + _CIRCUIT_HEIGHT_FT
+        final_length = _CIRCUIT_HEIGHT_FT * _FT_M / tan(radians(_GLIDESLOPE_DEG))
+        self.fuel_flow = _FUEL_FLOW_CLIMB
+
+        def fly(heading_offset, done):
+            while not done():
+                self.vs = self._capped_fpm(1500, circuit_altitude - self.altitude)
+                self._move_in_frame(heading_offset)
+                yield from self._step()
+
+        yield from fly(0, lambda: self.along >= _RUNWAY_LENGTH_M + 3000)
+        yield from fly(-90, lambda: self.cross <= -2500)
+        yield from fly(180, lambda: self.along <= -final_length)
+        yield from fly(90, lambda: self.cross >= 0)
+        self.cross = 0.0
+
+    def _rollout_and_park(self) -> Iterator[Dict[str, Any]]:
+        config = self.config
+        self.flaps = 0
+        self.fuel_flow = _FUEL_FLOW_GROUND
+        while self.gs > 20:
+            self.gs = max(20, self.gs - 3 * self.dt)
+            self._move_in_frame(0)
+            yield from self._step()
+
+        # Vacate the runway and taxi to the gate
+        yield from self._taxi_leg(-90, lambda: self.cross <= -150)
+        yield from self._taxi_leg(180, lambda: self.along <= 800)
+        yield from self._taxi_leg(-90, lambda: self.cross <= -300)
+        self.gs = 0
+        yield from self._wait(30)
+
+        for i in range(config.engines):
+            self.engines[i] = "Off"
+            yield from self._wait(5)
+
+        # Postflight at the gate (static full events)
+        yield from self._wait(config.postflight_minutes * 60)
+
+
+def iter_flight_events(config: SyntheticFlightConfig) -> Iterator[Dict[str, Any]]:
+    """Yield the raw events (as in the ACARS JSON "Events" list) of a synthetic flight."""
+    return _FlightSimulator(config).run()
+
+
+def generate_flight(config: SyntheticFlightConfig) -> Dict[str, Any]:
+    """Return a synthetic flight as the ACARS JSON document ({"Events": [...]})."""
+    return {"Events": list(iter_flight_events(config))}
+
+
+def write_flight(path, config: SyntheticFlightConfig) -> int:
+    """Stream a synthetic flight to `path` as ACARS JSON. Returns the number of events."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"Events": [')
+        for event in iter_flight_events(config):
+            if count:
+                f.write(",")
+            f.write(json.dumps(event))
+            count += 1
+        f.write("]}")
+    return count
@@ -1,16 +1,16 @@
 from mam_analyzer.models.flight_events import FlightEvent
 
 def event_has_altitude(e: FlightEvent) -> bool:
-	return e.other_changes.get("Altitude") is not None
+	return e.get_change("Altitude") is not None
 
 def get_altitude_as_int(e: FlightEvent) -> int:
-	return int(e.other_changes.get("Altitude"))
+	return int(e.get_change("Altitude"))
 
 def get_altitude_as_int_rounded_to(e: FlightEvent, round_val: int) -> int: 
 	return round(get_altitude_as_int(e) / round_val) * round_val
 
 def event_has_agl_altitude(e: FlightEvent) -> bool:
-	return e.other_changes.get("AGLAltitude") is not None
+	return e.get_change("AGLAltitude") is not None
 
 def get_agl_altitude_as_int(e: FlightEvent) -> int:
-	return int(e.other_changes.get("AGLAltitude"))
+	return int(e.get_change("AGLAltitude"))
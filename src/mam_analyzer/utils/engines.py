@@ -8,7 +8,7 @@ from mam_analyzer.models.flight_events import FlightEvent
 
 def get_engine_status(e: FlightEvent) -> List[str]:
 	result = []
-	for k,v in e.other_changes.items():
+	for k,v in e.change_items():
 		if k.startswith("Engine ") and k[7:].isdigit() and 1 <= int(k[7:]) <= 4:
 			result.append(v)
 	return result
@@ -1,7 +1,7 @@
 from mam_analyzer.models.flight_events import FlightEvent
 
 def event_has_fuel(e: FlightEvent) -> bool:
-	return e.other_changes.get("FuelKg") is not None
+	return e.get_change("FuelKg") is not None
 
 def get_fuel_kg_as_float(e: FlightEvent) -> float:
-	return float(e.other_changes.get("FuelKg").replace(",", "."))
\ No newline at end of file
+	return float(e.get_change("FuelKg").replace(",", "."))
\ No newline at end of file
@@ -1,6 +1,7 @@
 from typing import List
 
 from mam_analyzer.models.flight_events import FlightEvent
+from mam_analyzer.utils.search import LOCATION, find_key_indices_after, find_key_indices_before
 
 
 def event_has_location(e: FlightEvent) -> bool:
@@ -11,24 +12,11 @@ def collect_location_events_before(
     events: List[FlightEvent], before_idx: int, count: int
 ) -> List[FlightEvent]:
     """Return up to `count` events with location found before `before_idx`, in chronological order."""
-    collected = []
-    for idx in range(before_idx - 1, -1, -1):
-        if event_has_location(events[idx]):
-            collected.append(events[idx])
-            if len(collected) == count:
-                break
-    collected.reverse()
-    return collected
+    return [events[idx] for idx in find_key_indices_before(events, LOCATION, before_idx, count)]
 
 
 def collect_location_events_after(
     events: List[FlightEvent], after_idx: int, count: int
 ) -> List[FlightEvent]:
     """Return up to `count` events with location found after `after_idx`, in chronological order."""
-    collected = []
-    for idx in range(after_idx + 1, len(events)):
-        if event_has_location(events[idx]):
-            collected.append(events[idx])
-            if len(collected) == count:
-                break
-    return collected
\ No newline at end of file
+    return [events[idx] for idx in find_key_indices_after(events, LOCATION, after_idx, count)]
\ No newline at end of file
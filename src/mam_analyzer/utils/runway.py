@@ -1,32 +1,52 @@
+from functools import lru_cache
 from math import sqrt
-from typing import List, Optional, Tuple
-
-from shapely.geometry import LineString, Point
-from shapely.geometry.base import BaseGeometry
-from shapely.ops import unary_union
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from mam_analyzer.models.flight_context import AirportContext, Runway, RunwayEnd
 from mam_analyzer.models.flight_events import FlightEvent
-from mam_analyzer.utils.units import compute_bearing, haversine, heading_within_range, latlon_to_xy
+from mam_analyzer.utils.units import LocalProjection, compute_bearing, haversine, heading_within_range
+
+# shapely is imported on first use: importing it costs more than the rest of the package
+if TYPE_CHECKING:
+    from shapely.geometry.base import BaseGeometry
 
 
-def _runway_utm_zone(runway: Runway) -> int:
-    """Compute a single UTM zone from the runway midpoint to avoid zone-boundary issues."""
-    mid_lon = (runway.ends[0].longitude + runway.ends[1].longitude) / 2
-    return int((mid_lon + 180) // 6) + 1
+def _runway_key(runway: Runway) -> Tuple[float, ...]:
+    """Hashable key with the runway values the geometry depends on."""
+    e1, e2 = runway.ends[0], runway.ends[1]
+    return (e1.latitude, e1.longitude, e2.latitude, e2.longitude, runway.width_m)
 
 
 def build_runway_polygon(runway: Runway, margin_width_m: float = 0, extend_m: float = 0):
-    """Build a Shapely polygon representing the runway footprint in UTM coordinates.
+    """Build a Shapely polygon representing the runway footprint in planar coordinates.
 
     Uses both RunwayEnd positions to create a buffered rectangle.
     If extend_m > 0, the centreline is extended in both directions.
-    Returns (polygon, utm_zone) so callers can project points in the same zone.
+    Returns (polygon, projection) so callers can project points in the same plane.
+    Geometries are cached by runway values: treat the polygon as read-only.
     """
-    utm_zone = _runway_utm_zone(runway)
-    e1, e2 = runway.ends[0], runway.ends[1]
-    p1 = latlon_to_xy(e1.latitude, e1.longitude, utm_zone)
-    p2 = latlon_to_xy(e2.latitude, e2.longitude, utm_zone)
+    return _build_runway_polygon(_runway_key(runway), margin_width_m, extend_m)
+
+
+def runway_projection(runway: Runway) -> LocalProjection:
+    """Projection centred on the runway midpoint, shared by all the runway geometry."""
+    return _runway_projection(_runway_key(runway))
+
+
+@lru_cache(maxsize=256)
+def _runway_projection(key: Tuple[float, ...]) -> LocalProjection:
+    lat1, lon1, lat2, lon2, _ = key
+    return LocalProjection((lat1 + lat2) / 2, (lon1 + lon2) / 2)
+
+
+@lru_cache(maxsize=256)
+def _build_runway_polygon(key: Tuple[float, ...], margin_width_m: float, extend_m: float):
+    from shapely.geometry import LineString
+
+    lat1, lon1, lat2, lon2, width_m = key
+    projection = _runway_projection(key)
+    p1 = projection.to_xy(lat1, lon1)
+    p2 = projection.to_xy(lat2, lon2)
 
     line = LineString([p1, p2])
 
@@ -41,26 +61,40 @@ def build_runway_polygon(runway: Runway, margin_width_m: float = 0, extend_m: fl
             p2_ext = (x2 + ux * extend_m, y2 + uy * extend_m)
             line = LineString([p1_ext, p2_ext])
 
-    half_width = runway.width_m / 2 + margin_width_m
-    return line.buffer(half_width, cap_style=2), utm_zone
+    half_width = width_m / 2 + margin_width_m
+    return line.buffer(half_width, cap_style=2), projection
 
 
 def build_runway_safe_zone(
     runway: Runway,
     margin_width_m: float = 15,
     turn_zone_radius_m: float = 100,
-) -> BaseGeometry:
-    """Build a safe zone that includes the runway polygon plus turn circles at each end."""
-    polygon, utm_zone = build_runway_polygon(runway, margin_width_m)
+) -> "BaseGeometry":
+    """Build a safe zone that includes the runway polygon plus turn circles at each end.
 
-    e1, e2 = runway.ends[0], runway.ends[1]
-    p1 = latlon_to_xy(e1.latitude, e1.longitude, utm_zone)
-    p2 = latlon_to_xy(e2.latitude, e2.longitude, utm_zone)
+    Cached by runway values like build_runway_polygon: treat it as read-only.
+    """
+    return _build_runway_safe_zone(_runway_key(runway), margin_width_m, turn_zone_radius_m)
+
+
+@lru_cache(maxsize=256)
+def _build_runway_safe_zone(key: Tuple[float, ...], margin_width_m: float, turn_zone_radius_m: float) -> "BaseGeometry":
+    import shapely
+    from shapely.geometry import Point
+    from shapely.ops import unary_union
+
+    polygon, projection = _build_runway_polygon(key, margin_width_m, 0)
+
+    lat1, lon1, lat2, lon2, _ = key
+    p1 = projection.to_xy(lat1, lon1)
+    p2 = projection.to_xy(lat2, lon2)
 
     turn1 = Point(p1).buffer(turn_zone_radius_m)
     turn2 = Point(p2).buffer(turn_zone_radius_m)
 
-    return unary_union([polygon, turn1, turn2])
+    safe_zone = unary_union([polygon, turn1, turn2])
+    shapely.prepare(safe_zone)
+    return safe_zone
 
 
 def match_runway_end(
@@ -103,16 +137,17 @@ def match_runway_by_track(
     if len(track_points) < 2:
         return None
 
+    from shapely.geometry import LineString
+
     track_bearing = compute_bearing(
         track_points[0][0], track_points[0][1],
         track_points[-1][0], track_points[-1][1],
     )
 
     for runway in airport.runways:
-        utm_zone = _runway_utm_zone(runway)
-        rwy_polygon, _ = build_runway_polygon(runway)
-        xy_points = [latlon_to_xy(lat, lon, utm_zone) for lat, lon in track_points]
-        track_line = LineString(xy_points)
+        rwy_polygon, projection = build_runway_polygon(runway)
+        xs, ys = projection.to_xy_many([p[0] for p in track_points], [p[1] for p in track_points])
+        track_line = LineString(list(zip(xs, ys)))
 
         if rwy_polygon.intersects(track_line):
             for end in runway.ends:
@@ -174,7 +209,9 @@ def match_runway_for_landing(
     return match_runway_end(airport, fallback_heading, touch_event.latitude, touch_event.longitude)
 
 
-def point_inside_runway(lat: float, lon: float, polygon, utm_zone=None) -> bool:
-    """Check whether a lat/lon point falls inside a runway polygon (UTM)."""
-    x, y = latlon_to_xy(lat, lon, utm_zone)
+def point_inside_runway(lat: float, lon: float, polygon, projection: LocalProjection) -> bool:
+    """Check whether a lat/lon point falls inside a runway polygon built with `projection`."""
+    from shapely.geometry import Point
+
+    x, y = projection.to_xy(lat, lon)
     return polygon.covers(Point(x, y))
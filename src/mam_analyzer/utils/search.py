@@ -1,9 +1,284 @@
-from typing import Callable, Optional, Sequence, Tuple, TypeVar
+from array import array
+from bisect import bisect_left, bisect_right
+from math import inf
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
 from datetime import datetime
 from mam_analyzer.models.flight_events import FlightEvent
 
 T = TypeVar("T", bound=FlightEvent)
 
+# Posting lists that aren't a change key
+FULL_EVENTS = "<full events>"
+LOCATION = "<location>"
+
+# Block sizes of the column pyramids, coarse to fine (4096 and 64 events)
+PYRAMID_SHIFTS = (12, 6)
+
+class Column(NamedTuple):
+	"""Numeric column of the events: value(e) is None for events without it."""
+	name: str
+	value: Callable[[FlightEvent], Optional[float]]
+
+def _int_change(key: str) -> Callable[[FlightEvent], Optional[int]]:
+	def value(e: FlightEvent) -> Optional[int]:
+		found = e.get_change(key)
+		return int(found) if found is not None else None
+	return value
+
+HEADING = Column("heading", lambda e: e.heading)
+ALTITUDE = Column("Altitude", _int_change("Altitude"))
+
+class ColumnPyramid:
+	"""Min / max of a column per event and per block of 64 and 4096 events.
+
+	Events without a value have min inf and max -inf, so empty blocks have min > max.
+	"""
+
+	def __init__(self, values: List[Optional[float]]):
+		self.mins = [inf if v is None else v for v in values]
+		self.maxs = [-inf if v is None else v for v in values]
+		# (shift, mins, maxs) per level, coarse to fine
+		levels = []
+		mins, maxs, shift = self.mins, self.maxs, 0
+		for level_shift in reversed(PYRAMID_SHIFTS):
+			step = 1 << (level_shift - shift)
+			mins = [min(mins[i:i + step]) for i in range(0, len(mins), step)]
+			maxs = [max(maxs[i:i + step]) for i in range(0, len(maxs), step)]
+			shift = level_shift
+			levels.append((shift, mins, maxs))
+		levels.reverse()
+		self.levels = levels
+
+	def first_forward(self, events: Sequence[T], lo: int, hi: int, condition: Callable[[T], bool], block_may_match: Callable[[float, float], bool]) -> Optional[int]:
+		"""First position in [lo, hi) matching the condition, skipping blocks that can't match."""
+		finest = PYRAMID_SHIFTS[-1]
+		i = lo
+		while i < hi:
+			for shift, mins, maxs in self.levels:
+				b = i >> shift
+				if mins[b] > maxs[b] or not block_may_match(mins[b], maxs[b]):
+					i = (b + 1) << shift
+					break
+			else:
+				stop = min(((i >> finest) + 1) << finest, hi)
+				for j in range(i, stop):
+					if self.mins[j] <= self.maxs[j] and block_may_match(self.mins[j], self.maxs[j]) and condition(events[j]):
+						return j
+				i = stop
+		return None
+
+	def first_backward(self, events: Sequence[T], start: int, lo: int, condition: Callable[[T], bool], block_may_match: Callable[[float, float], bool]) -> Optional[int]:
+		"""Last position in [lo, start] matching the condition, skipping blocks that can't match."""
+		finest = PYRAMID_SHIFTS[-1]
+		i = start
+		while i >= lo:
+			for shift, mins, maxs in self.levels:
+				b = i >> shift
+				if mins[b] > maxs[b] or not block_may_match(mins[b], maxs[b]):
+					i = (b << shift) - 1
+					break
+			else:
+				stop = max((i >> finest) << finest, lo)
+				for j in range(i, stop - 1, -1):
+					if self.mins[j] <= self.maxs[j] and block_may_match(self.mins[j], self.maxs[j]) and condition(events[j]):
+						return j
+				i = stop - 1
+		return None
+
+	def range_max(self, lo: int, hi: int) -> float:
+		"""Max of the column in [lo, hi), -inf without values."""
+		best = -inf
+		i = lo
+		while i < hi:
+			for shift, _, maxs in self.levels:
+				b = i >> shift
+				if i == b << shift and i + (1 << shift) <= hi:
+					best = max(best, maxs[b])
+					i += 1 << shift
+					break
+			else:
+				stop = min(((i >> PYRAMID_SHIFTS[-1]) + 1) << PYRAMID_SHIFTS[-1], hi)
+				best = max(best, max(self.maxs[i:stop]))
+				i = stop
+		return best
+
+def _posting_condition(key: str) -> Callable[[FlightEvent], bool]:
+	if key == FULL_EVENTS:
+		return lambda e: e.is_full_event()
+	if key == LOCATION:
+		return lambda e: e.latitude is not None and e.longitude is not None
+	return lambda e: e.get_change(key) is not None
+
+class EventIndex:
+	"""Inverted index of the events of a flight.
+
+	For each key, the sorted indices of the events carrying it (posting list), so the
+	nearest event with the key before / after an index is a bisect. The full events list
+	is built with the index, the posting list of a key on its first lookup.
+	"""
+
+	def __init__(self, events: List[FlightEvent]):
+		self.events = events
+		self.timestamps = [e.timestamp for e in events]
+		# Lookups by time need ordered timestamps, otherwise the search functions scan
+		self.is_sorted = all(a <= b for a, b in zip(self.timestamps, self.timestamps[1:]))
+		self._postings: Dict[str, array] = {}
+		self._pyramids: Dict[str, Optional[ColumnPyramid]] = {}
+		self.postings(FULL_EVENTS)
+
+	def postings(self, key: str) -> array:
+		"""Sorted indices of the events with the key (a change key, FULL_EVENTS or LOCATION)."""
+		found = self._postings.get(key)
+		if found is None:
+			condition = _posting_condition(key)
+			found = self._postings[key] = array("q", (i for i, e in enumerate(self.events) if condition(e)))
+		return found
+
+	def pyramid(self, column: Column) -> Optional[ColumnPyramid]:
+		"""Pyramid of the column, built on its first lookup. None if a value can't be read
+		(the searches then scan, failing where the scan reaches the value)."""
+		if column.name not in self._pyramids:
+			try:
+				self._pyramids[column.name] = ColumnPyramid([column.value(e) for e in self.events])
+			except (ValueError, TypeError):
+				self._pyramids[column.name] = None
+		return self._pyramids[column.name]
+
+class IndexedEvents(list):
+	"""Events of a flight, or a contiguous part of them, sharing the EventIndex of the flight."""
+	__slots__ = ("index", "offset", "ingest")
+
+	def __init__(self, events: Iterable[FlightEvent] = (), index: Optional[EventIndex] = None, offset: int = 0):
+		super().__init__(events)
+		self.index = index if index is not None else EventIndex(self)
+		# Position of the first event in index.events
+		self.offset = offset
+		# What the parser did to the events of the flight (ingest.IngestSummary), None for parts
+		self.ingest = None
+
+	def between(self, start: datetime, end: datetime) -> "IndexedEvents":
+		"""Events with start <= timestamp <= end."""
+		if not self.index.is_sorted:
+			filtered = []
+			for ev in self:
+				if ev.timestamp >= start:
+					if ev.timestamp <= end:
+						filtered.append(ev)
+					else:
+						break
+			return IndexedEvents(filtered)
+
+		timestamps = self.index.timestamps
+		lo = bisect_left(timestamps, start, self.offset, self.offset + len(self))
+		hi = bisect_right(timestamps, end, lo, self.offset + len(self))
+		return IndexedEvents(self.index.events[lo:hi], self.index, lo)
+
+def _indexed_range(
+	events: Sequence[FlightEvent],
+	from_time: Optional[datetime],
+	to_time: Optional[datetime],
+) -> Optional[Tuple[EventIndex, int, int]]:
+	"""(index, lo, hi) positions in index.events of the events in [from_time, to_time], None if not indexed"""
+	if not isinstance(events, IndexedEvents) or not events.index.is_sorted:
+		return None
+	index = events.index
+	lo = events.offset
+	hi = events.offset + len(events)
+	if from_time is not None:
+		lo = bisect_left(index.timestamps, from_time, lo, hi)
+	if to_time is not None:
+		hi = bisect_right(index.timestamps, to_time, lo, hi)
+	return index, lo, hi
+
+def find_key_index_forward(
+	events: Sequence[T],
+	key: str,
+	from_time: Optional[datetime] = None,
+	to_time: Optional[datetime] = None,
+	start_idx: int = 0,
+) -> Optional[Tuple[int, T]]:
+	"""First event from start_idx with the key (or FULL_EVENTS, LOCATION), as find_first_index_forward.
+
+	O(log n) over IndexedEvents, a scan over other sequences.
+	"""
+	indexed = _indexed_range(events, from_time, to_time)
+	if indexed is None:
+		return find_first_index_forward_starting_from_idx(events, max(start_idx, 0), _posting_condition(key), from_time, to_time)
+
+	index, lo, hi = indexed
+	offset = events.offset
+	postings = index.postings(key)
+	pos = bisect_left(postings, max(lo, offset + start_idx))
+	if pos < len(postings) and postings[pos] < hi:
+		idx = postings[pos] - offset
+		return idx, events[idx]
+	return None
+
+def find_key_index_backward(
+	events: Sequence[T],
+	key: str,
+	from_time: Optional[datetime] = None,
+	to_time: Optional[datetime] = None,
+	start_idx: Optional[int] = None,
+) -> Optional[Tuple[int, T]]:
+	"""Last event up to start_idx (default the last one) with the key (or FULL_EVENTS, LOCATION),
+	as find_first_index_backward. O(log n) over IndexedEvents, a scan over other sequences.
+	"""
+	if start_idx is None:
+		start_idx = len(events) - 1
+	if start_idx < 0:
+		return None
+
+	indexed = _indexed_range(events, from_time, to_time)
+	if indexed is None:
+		return find_first_index_backward_starting_from_idx(events, min(start_idx, len(events) - 1), _posting_condition(key), from_time, to_time)
+
+	index, lo, hi = indexed
+	offset = events.offset
+	postings = index.postings(key)
+	pos = bisect_right(postings, min(hi - 1, offset + start_idx)) - 1
+	if pos >= 0 and postings[pos] >= lo:
+		idx = postings[pos] - offset
+		return idx, events[idx]
+	return None
+
+def find_key_indices_before(events: Sequence[T], key: str, before_idx: int, count: int) -> List[int]:
+	"""Indices of up to `count` events with the key before `before_idx`, in chronological order."""
+	if isinstance(events, IndexedEvents):
+		postings = events.index.postings(key)
+		offset = events.offset
+		end = bisect_left(postings, offset + max(before_idx, 0))
+		start = max(bisect_left(postings, offset), end - count)
+		return [i - offset for i in postings[start:end]]
+
+	condition = _posting_condition(key)
+	collected = []
+	for idx in range(before_idx - 1, -1, -1):
+		if condition(events[idx]):
+			collected.append(idx)
+			if len(collected) == count:
+				break
+	collected.reverse()
+	return collected
+
+def find_key_indices_after(events: Sequence[T], key: str, after_idx: int, count: int) -> List[int]:
+	"""Indices of up to `count` events with the key after `after_idx`, in chronological order."""
+	if isinstance(events, IndexedEvents):
+		postings = events.index.postings(key)
+		offset = events.offset
+		start = bisect_right(postings, offset + after_idx)
+		end = min(bisect_left(postings, offset + len(events)), start + count)
+		return [i - offset for i in postings[start:end]]
+
+	condition = _posting_condition(key)
+	collected = []
+	for idx in range(after_idx + 1, len(events)):
+		if condition(events[idx]):
+			collected.append(idx)
+			if len(collected) == count:
+				break
+	return collected
+
 def find_first_index_forward(
 	events: Sequence[T],
 	condition: Callable[[T], bool],
@@ -84,4 +359,94 @@ def find_first_index_backward_starting_from_idx(
 			else:
 				break
 
-	return None	
+	return None
+
+def _indexed_pyramid(
+	events: Sequence[FlightEvent],
+	column: Column,
+	from_time: Optional[datetime],
+	to_time: Optional[datetime],
+) -> Optional[Tuple[ColumnPyramid, int, int]]:
+	"""(pyramid, lo, hi) of the column over the events in [from_time, to_time], None if not indexed"""
+	indexed = _indexed_range(events, from_time, to_time)
+	if indexed is None:
+		return None
+	index, lo, hi = indexed
+	pyramid = index.pyramid(column)
+	if pyramid is None:
+		return None
+	return pyramid, lo, hi
+
+def find_first_index_forward_in_blocks(
+	events: Sequence[T],
+	start_idx: int,
+	condition: Callable[[T], bool],
+	column: Column,
+	block_may_match: Callable[[float, float], bool],
+	from_time: Optional[datetime] = None,
+	to_time: Optional[datetime] = None,
+) -> Optional[Tuple[int, T]]:
+	"""As find_first_index_forward_starting_from_idx, for a condition only true for events
+	with a value of the column. Blocks of events whose (min, max) can't match
+	(block_may_match False) are skipped over IndexedEvents, other sequences are scanned.
+	"""
+	indexed = _indexed_pyramid(events, column, from_time, to_time) if start_idx >= 0 else None
+	if indexed is None:
+		return find_first_index_forward_starting_from_idx(events, start_idx, condition, from_time, to_time)
+
+	pyramid, lo, hi = indexed
+	offset = events.offset
+	found = pyramid.first_forward(events.index.events, max(lo, offset + start_idx), hi, condition, block_may_match)
+	if found is None:
+		return None
+	return found - offset, events[found - offset]
+
+def find_first_index_backward_in_blocks(
+	events: Sequence[T],
+	start_idx: int,
+	condition: Callable[[T], bool],
+	column: Column,
+	block_may_match: Callable[[float, float], bool],
+	from_time: Optional[datetime] = None,
+	to_time: Optional[datetime] = None,
+) -> Optional[Tuple[int, T]]:
+	"""As find_first_index_backward_starting_from_idx, skipping blocks of events as
+	find_first_index_forward_in_blocks."""
+	indexed = _indexed_pyramid(events, column, from_time, to_time) if 0 <= start_idx < len(events) else None
+	if indexed is None:
+		return find_first_index_backward_starting_from_idx(events, start_idx, condition, from_time, to_time)
+
+	pyramid, lo, hi = indexed
+	offset = events.offset
+	found = pyramid.first_backward(events.index.events, min(hi - 1, offset + start_idx), lo, condition, block_may_match)
+	if found is None:
+		return None
+	return found - offset, events[found - offset]
+
+def find_column_max(
+	events: Sequence[T],
+	column: Column,
+	from_time: Optional[datetime] = None,
+	to_time: Optional[datetime] = None,
+) -> Optional[Tuple[int, float]]:
+	"""(index, value) of the first event with the highest value of the column, None without
+	values. Events in [from_time, to_time] up to the first one after to_time, as the scans."""
+	indexed = _indexed_pyramid(events, column, from_time, to_time)
+	if indexed is None:
+		best = None
+		for idx, event in enumerate(events):
+			ts = event.timestamp
+			if (from_time is None or ts >= from_time) and (to_time is None or ts <= to_time):
+				value = column.value(event)
+				if value is not None and (best is None or value > best[1]):
+					best = idx, value
+			elif to_time is not None and ts > to_time:
+				break
+		return best
+
+	pyramid, lo, hi = indexed
+	highest = pyramid.range_max(lo, hi)
+	if highest == -inf:
+		return None
+	found = pyramid.first_forward(events.index.events, lo, hi, lambda e: True, lambda mn, mx: mx >= highest)
+	return found - events.offset, highest
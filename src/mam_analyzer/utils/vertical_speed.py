@@ -1,13 +1,13 @@
 from mam_analyzer.models.flight_events import FlightEvent
 
 def event_has_vertical_speed(e: FlightEvent) -> bool:
-	return e.other_changes.get("VSFpm") is not None
+	return e.get_change("VSFpm") is not None
 
 def get_vertical_speed_as_int(e: FlightEvent) -> int:
-	return int(e.other_changes.get("VSFpm"))
+	return int(e.get_change("VSFpm"))
 
 def event_has_vs_last3_avg(e: FlightEvent) -> bool:
-	return e.other_changes.get("VSLast3Avg") is not None
+	return e.get_change("VSLast3Avg") is not None
 
 def get_vs_last3_avg_as_int(e: FlightEvent) -> int:
-	return int(e.other_changes.get("VSLast3Avg"))
\ No newline at end of file
+	return int(e.get_change("VSLast3Avg"))
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""Fixtures for the performance suite (marker `perf`, skipped in normal runs).
+
+Every file in data/ is benchmarked as recorded. A few representative flights are
+also scaled up (10x, 100x events) by inserting interpolated position events
+between every pair of consecutive events. Long synthetic flights (see
+`mam_analyzer.synthetic`) cover the 10^5 events range with step climbs and
+touch-and-goes.
+"""
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from mam_analyzer.models.flight_context import FlightContext
+from mam_analyzer.models.flight_events import FlightEvent
+from mam_analyzer.parser import load_flight_data
+from mam_analyzer.phases.flight_phase import FlightPhase
+from mam_analyzer.phases.phases_aggregator import PhasesAggregator
+from mam_analyzer.synthetic import SyntheticFlightConfig, generate_flight_context, write_flight
+from mam_analyzer.utils.parsing import parse_coordinate, parse_timestamp
+from runway_data import make_flight_context
+
+DATA_DIR = Path("data")
+
+FLIGHT_AIRPORTS = {
+    "LEPA-LEPP-737.json": ("LEPA", "LEPP"),
+    "LEPP-LEMG-737.json": ("LEPP", "LEMG"),
+    "LPMA-Circuits-737.json": ("LPMA", "LPMA"),
+    "UHMA-PAOM-B350.json": ("UHMA", "PAOM"),
+    "UHPT-UHMA-B350.json": ("UHPT", "UHMA"),
+    "UHPT-UHMA-SF34.json": ("UHPT", "UHMA"),
+    "UHSH-UHMM-B350.json": ("UHSH", "UHMM"),
+    "PAOM-PANC-B350-fromtaxi.json": ("PAOM", "PANC"),
+    "LEBB-touchgoLEXJ-LEAS.json": ("LEBB", "LEAS"),
+    "ENRA_ENDU_False_refueling.json": ("ENRA", "ENDU"),
+    "LEVD-fast-crash.json": ("LEVD", "LEVD"),
+    "CYBL_KEUG_REFUELING.json": ("CYBL", "KEUG"),
+    "backtrack_1.json": ("EFKS", "EFVA"),
+    "backtrack_2.json": ("EFKT", "EFKS"),
+    "backtrack_3.json": ("ENNA", "EFKI"),
+    "backtrack_4.json": ("ENDU", "ENKR"),
+    "backtrack_5.json": ("ESNX", "ENRA"),
+    "backtrack_6.json": ("EFVA", "EETN"),
+    "zfw.json": ("OOMS", "LTFM"),
+    "zfw_modified.json": ("OOMS", "LTFM"),
+    "short_flight_vslast3avg.json": ("LEBL", "LEBL"),
+}
+
+# Flights also benchmarked with 10x and 100x events
+SCALED_FLIGHTS = ("LEPA-LEPP-737.json", "LEBB-touchgoLEXJ-LEAS.json", "zfw.json")
+SCALES = (10, 100)
+
+# Generated flights (name -> config), benchmarked with their generated context
+SYNTHETIC_FLIGHTS = {
+    "synthetic-12h-3tg": SyntheticFlightConfig(cruise_minutes=720, step_climbs=3, touch_and_goes=3),
+    "synthetic-12h-dense": SyntheticFlightConfig(cruise_minutes=720, step_climbs=3, sample_seconds=0.4),
+}
+
+# Keys interpolated in the inserted events
+_COORDINATE_KEYS = ("Latitude", "Longitude")
+_HELD_KEYS = ("Altitude", "AGLAltitude")
+
+
+@dataclass
+class BenchmarkFlight:
+    name: str
+    scale: int
+    path: Path
+    events: List[FlightEvent]
+    context: Optional[FlightContext]
+    phases: List[FlightPhase]
+
+    @property
+    def rounds(self) -> int:
+        if self.name in SYNTHETIC_FLIGHTS:
+            return 1
+        return max(1, 5 // self.scale)
+
+    def phase(self, name: str) -> FlightPhase:
+        for p in self.phases:
+            if p.name == name:
+                return p
+        pytest.skip(f"{self.name} has no {name} phase")
+
+
+def _format_coordinate(value: float) -> str:
+    return repr(value).replace(".", ",")
+
+
+def scale_flight(raw: Dict[str, Any], factor: int) -> Dict[str, Any]:
+    """Return a copy of the raw flight with `factor` times more events.
+
+    factor - 1 delta events are inserted between each pair of consecutive events,
+    with the position interpolated and the altitude held. Original events are kept
+    untouched so the detected phases stay the same.
+    """
+    raw_events = raw["Events"]
+    scaled = []
+    state: Dict[str, str] = {}
+
+    for current, following in zip(raw_events, raw_events[1:]):
+        scaled.append(current)
+        state.update(current.get("Changes", {}))
+
+        next_state = dict(state)
+        next_state.update(following.get("Changes", {}))
+
+        start = parse_timestamp(current["Timestamp"])
+        end = parse_timestamp(following["Timestamp"])
+
+        for k in range(1, factor):
+            ratio = k / factor
+            changes = {}
+            for key in _COORDINATE_KEYS:
+                if key in state and key in next_state:
+                    a = parse_coordinate(state[key])
+                    b = parse_coordinate(next_state[key])
+                    changes[key] = _format_coordinate(a + (b - a) * ratio)
+            for key in _HELD_KEYS:
+                if key in state:
+                    changes[key] = state[key]
+
+            ts: datetime = start + (end - start) * ratio
+            scaled.append({"Timestamp": ts.isoformat(), "Changes": changes})
+
+    scaled.append(raw_events[-1])
+    return {"Events": scaled}
+
+
+def _flight_params():
+    params = [pytest.param((name, 1), id=name.removesuffix(".json")) for name in FLIGHT_AIRPORTS]
+    for name in SCALED_FLIGHTS:
+        for scale in SCALES:
+            params.append(pytest.param((name, scale), id=f"{name.removesuffix('.json')}-x{scale}"))
+    for name in SYNTHETIC_FLIGHTS:
+        params.append(pytest.param((name, 1), id=name))
+    return params
+
+
+@pytest.fixture(scope="session", params=_flight_params())
+def flight(request, tmp_path_factory) -> BenchmarkFlight:
+    name, scale = request.param
+    path = DATA_DIR / name
+
+    if name in SYNTHETIC_FLIGHTS:
+        config = SYNTHETIC_FLIGHTS[name]
+        path = tmp_path_factory.mktemp("synthetic") / f"{name}.json"
+        write_flight(path, config)
+        context = generate_flight_context(config)
+        events = load_flight_data(path)
+        phases = PhasesAggregator().identify_phases(events, context)
+        return BenchmarkFlight(name, scale, path, events, context, phases)
+
+    if scale > 1:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        path = tmp_path_factory.mktemp("scaled") / f"x{scale}-{name}"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(scale_flight(raw, scale), f)
+
+    departure, landing = FLIGHT_AIRPORTS[name]
+    context = make_flight_context(departure, landing)
+    events = load_flight_data(path)
+    phases = PhasesAggregator().identify_phases(events, context)
+
+    return BenchmarkFlight(name, scale, path, events, context, phases)
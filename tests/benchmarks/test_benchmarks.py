@@ -0,0 +1,123 @@
+import json
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from mam_analyzer.archive import encode_flight
+from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.parser import load_flight_data, parse_flight_data
+from mam_analyzer.phases.analyzers.approach import ApproachAnalyzer
+from mam_analyzer.phases.analyzers.cruise import CruiseAnalyzer
+from mam_analyzer.phases.analyzers.final_landing import FinalLandingAnalyzer
+from mam_analyzer.phases.analyzers.result import AnalysisResult
+from mam_analyzer.phases.analyzers.takeoff import TakeoffAnalyzer
+from mam_analyzer.phases.analyzers.taxi import TaxiAnalyzer
+from mam_analyzer.phases.analyzers.touch_go import TouchAndGoAnalyzer
+from mam_analyzer.phases.detectors.backtrack import BacktrackDetector
+from mam_analyzer.phases.detectors.cruise import CruiseDetector
+from mam_analyzer.phases.detectors.final_landing import FinalLandingDetector
+from mam_analyzer.phases.detectors.shutdown import ShutdownDetector
+from mam_analyzer.phases.detectors.startup import StartupDetector
+from mam_analyzer.phases.detectors.takeoff import TakeoffDetector
+from mam_analyzer.phases.detectors.touch_go import TouchAndGoDetector
+from mam_analyzer.phases.flight_phase import FlightPhase
+from mam_analyzer.phases.phases_aggregator import PhasesAggregator
+
+pytestmark = pytest.mark.perf
+
+ANALYZERS = {
+    "takeoff": TakeoffAnalyzer,
+    "final_landing": FinalLandingAnalyzer,
+    "touch_go": TouchAndGoAnalyzer,
+    "cruise": CruiseAnalyzer,
+    "taxi": TaxiAnalyzer,
+    "approach": ApproachAnalyzer,
+}
+
+
+def _run(benchmark, flight, func, *args):
+    return benchmark.pedantic(func, args=args, rounds=flight.rounds, iterations=1)
+
+
+def test_parse(benchmark, flight):
+    benchmark.group = "parse"
+    _run(benchmark, flight, load_flight_data, flight.path)
+
+
+def test_parse_archive(benchmark, flight):
+    benchmark.group = "parse"
+    archive = encode_flight(json.loads(flight.path.read_bytes()))
+    _run(benchmark, flight, parse_flight_data, archive)
+
+
+@pytest.mark.parametrize("detector_cls", [TakeoffDetector, FinalLandingDetector], ids=["takeoff", "final_landing"])
+def test_detect_with_context(benchmark, flight, detector_cls):
+    benchmark.group = f"detect.{detector_cls.__name__}"
+    _run(benchmark, flight, detector_cls().detect, flight.events, None, None, flight.context)
+
+
+@pytest.mark.parametrize("detector_cls", [StartupDetector, ShutdownDetector], ids=["startup", "shutdown"])
+def test_detect_whole_flight(benchmark, flight, detector_cls):
+    benchmark.group = f"detect.{detector_cls.__name__}"
+    _run(benchmark, flight, detector_cls().detect, flight.events, None, None)
+
+
+@pytest.mark.parametrize("detector_cls", [CruiseDetector, TouchAndGoDetector], ids=["cruise", "touch_go"])
+def test_detect_airborne(benchmark, flight, detector_cls):
+    benchmark.group = f"detect.{detector_cls.__name__}"
+    takeoff = flight.phase("takeoff")
+    landing = flight.phase("final_landing")
+    _run(
+        benchmark,
+        flight,
+        detector_cls().detect,
+        flight.events,
+        takeoff.end + timedelta(microseconds=1),
+        landing.start + timedelta(microseconds=-1),
+    )
+
+
+def test_detect_backtrack(benchmark, flight):
+    benchmark.group = "detect.BacktrackDetector"
+    takeoff = flight.phase("takeoff")
+    ground = [p for p in flight.phases if p.end < takeoff.start and p.name in ("taxi", "backtrack")]
+    if not ground:
+        pytest.skip(f"{flight.name} has no taxi before takeoff")
+
+    # Same taxi candidate the aggregator builds before splitting taxi and backtrack
+    start = ground[0].start
+    end = takeoff.start + timedelta(microseconds=-1)
+    events = [e for e in flight.events if start <= e.timestamp <= end]
+    taxi = FlightPhase("taxi", start, end, AnalysisResult(), events)
+
+    _run(benchmark, flight, BacktrackDetector().detect_from_takeoff, taxi, takeoff, flight.context)
+
+
+@pytest.mark.parametrize("phase_name", list(ANALYZERS))
+def test_analyze(benchmark, flight, phase_name):
+    benchmark.group = f"analyze.{phase_name}"
+    phase = flight.phase(phase_name)
+    analyzer = ANALYZERS[phase_name]()
+    _run(benchmark, flight, analyzer.analyze, phase.events, phase.start, phase.end, flight.context)
+
+
+def test_identify_phases(benchmark, flight):
+    benchmark.group = "identify_phases"
+    _run(benchmark, flight, PhasesAggregator().identify_phases, flight.events, flight.context)
+
+
+def test_evaluate(benchmark, flight):
+    benchmark.group = "evaluate"
+    _run(benchmark, flight, FlightEvaluator().evaluate, flight.events, flight.context)
+
+
+def test_serialize(benchmark, flight):
+    benchmark.group = "serialize"
+    report = FlightEvaluator().evaluate(flight.events, flight.context)
+
+    def serialize():
+        return json.dumps(report.to_dict())
+
+    _run(benchmark, flight, serialize)
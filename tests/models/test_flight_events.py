@@ -1,6 +1,11 @@
+import json
+from pathlib import Path
+
 import pytest
 
+from mam_analyzer.models.event_layout import ACARS_KEYS, key_bit
 from mam_analyzer.models.flight_events import FlightEvent
+from mam_analyzer.parser import load_flight_data
 
 
 @pytest.fixture
@@ -52,3 +57,69 @@ def test_full_event_with_only_changes(only_changes_event):
 def test_full_event_with_full_info(full_event):
     assert full_event.is_full_event() == True       
 
+
+def test_full_event_is_exact(full_event):
+    # Many keys but not the whole state: a delta event
+    changes = full_event.other_changes
+    del changes["FuelKg"]
+    delta = FlightEvent.from_json({"Timestamp": "2025-01-01T12:00:00Z", "Changes": changes})
+    assert len(delta.other_changes) > 10
+    assert delta.is_full_event() == False
+
+    # Single engine aircraft: still full
+    changes = full_event.other_changes
+    del changes["Engine 2"]
+    single = FlightEvent.from_json({"Timestamp": "2025-01-01T12:00:00Z", "Changes": changes})
+    assert single.is_full_event() == True
+
+def test_changes_accessors(full_event, only_changes_event):
+    assert full_event.get_change("FuelKg") == "9535,299668470565"
+    assert full_event.get_change("ZFW") is None
+    assert only_changes_event.has_change("Flaps")
+    assert not only_changes_event.has_change("Gear")
+    assert list(only_changes_event.change_items()) == [("Engine 1", "On"), ("Flaps", "10")]
+    assert only_changes_event.changes_mask == key_bit_mask("Engine 1", "Flaps")
+
+def key_bit_mask(*keys):
+    return sum(1 << key_bit(k) for k in keys)
+
+def test_layouts_are_shared_between_events():
+    a = FlightEvent.from_json({"Timestamp": "2025-01-01T12:00:00Z", "Changes": {"VSFpm": "-500", "Altitude": "3000"}})
+    b = FlightEvent.from_json({"Timestamp": "2025-01-01T12:00:01Z", "Changes": {"VSFpm": "-450", "Altitude": "2990"}})
+    c = FlightEvent.from_json({"Timestamp": "2025-01-01T12:00:02Z", "Changes": {"Altitude": "2980", "VSFpm": "-450"}})
+
+    assert a._layout is b._layout
+    # Same keys in other order: same mask, but the order is kept for export
+    assert c._layout is not a._layout
+    assert c.changes_mask == a.changes_mask
+    assert list(c.to_dict()["Changes"]) == ["Altitude", "VSFpm"]
+
+def test_unknown_keys_get_a_bit():
+    event = FlightEvent.from_json({"Timestamp": "2025-01-01T12:00:00Z", "Changes": {"NewAcarsKey": "1"}})
+
+    assert event.get_change("NewAcarsKey") == "1"
+    assert event.changes_mask == 1 << key_bit("NewAcarsKey")
+    assert key_bit("NewAcarsKey") >= len(ACARS_KEYS)
+
+def test_to_dict_returns_the_imported_event(full_event, empty_event):
+    touch = {
+        "Timestamp": "2025-01-01T12:00:00.1234567Z",
+        "Changes": {"LandingVSFpm": "-120", **full_event.other_changes},
+    }
+    assert FlightEvent.from_json(touch).to_dict() == touch
+    assert list(FlightEvent.from_json(touch).to_dict()["Changes"])[0] == "LandingVSFpm"
+    assert empty_event.to_dict() == {"Timestamp": "2025-01-01T12:00:00Z"}
+
+    other = {"Timestamp": "2025-01-01T12:00:00Z", "Changes": {"Flaps": "5"}, "Extra": 1}
+    assert FlightEvent.from_json(other).to_dict() == other
+
+def test_streaming_decoder_matches_from_json():
+    path = Path("data/LEPA-LEPP-737.json")
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+
+    events = load_flight_data(path)
+
+    assert events == [FlightEvent.from_json(e) for e in raw["Events"]]
+    assert [e.to_dict() for e in events] == raw["Events"]
+    assert [e.is_full_event() for e in events] == [len(e["Changes"]) > 10 for e in raw["Events"]]
@@ -5,6 +5,8 @@ import pytest
 
 from mam_analyzer.models.flight_events import FlightEvent
 from mam_analyzer.phases.detectors.cruise import CruiseDetector
+from mam_analyzer.synthetic import SyntheticFlightConfig, generate_flight
+from mam_analyzer.utils.search import IndexedEvents
 from mam_analyzer.utils.parsing import parse_timestamp
 
 
@@ -218,4 +220,17 @@ def test_cruise_detects_from_real_files(
         assert end == expected_end_dt, f"Incorrect end for cruise in {filename}"
 
     else:
-        assert result is None, f"Cruise shouldn't been detected in {filename}"      
\ No newline at end of file
+        assert result is None, f"Cruise shouldn't been detected in {filename}"
+
+
+@pytest.mark.parametrize("step_climbs", [0, 3])
+def test_indexed_events_match_the_linear_scan(detector, step_climbs):
+    config = SyntheticFlightConfig(cruise_minutes=150, step_climbs=step_climbs, step_climb_ft=5000)
+    events = IndexedEvents(FlightEvent.from_json(e) for e in generate_flight(config)["Events"])
+    first, last = events[0].timestamp, events[-1].timestamp
+
+    for from_time, to_time in [(first, last), (first + timedelta(minutes=40), last - timedelta(minutes=30))]:
+        result = detector.detect(events, from_time, to_time)
+        assert result is not None
+        assert result == detector.detect(list(events), from_time, to_time)
+
@@ -279,7 +279,7 @@ def test_phases_aggregator(filename, expected_phases):
         phase_found = None
         for phase in phases:
             for ev in phase.events:
-                if e._raw["Timestamp"] == ev._raw["Timestamp"]:
+                if e.to_dict()["Timestamp"] == ev.to_dict()["Timestamp"]:
                     if phase_found is None:
                         phase_found = phase
                     else:
@@ -298,3 +298,34 @@ def test_phases_aggregator(filename, expected_phases):
                     f"{[p.name for p in containing]}"
                 )
 
+
+
+def test_detectors_share_runway_matches_with_analyzers(monkeypatch):
+    from mam_analyzer.phases import blackboard as blackboard_module
+    from mam_analyzer.phases.analyzers.final_landing import FinalLandingAnalyzer
+    from mam_analyzer.phases.analyzers.takeoff import TakeoffAnalyzer
+    from runway_data import make_flight_context
+
+    boards = []
+    original_init = blackboard_module.FlightBlackboard.__init__
+
+    def init(self):
+        original_init(self)
+        boards.append(self)
+
+    monkeypatch.setattr(blackboard_module.FlightBlackboard, "__init__", init)
+
+    events = load_flight_data(DATA_DIR / "LEPA-LEPP-737.json")
+    context = make_flight_context("LEPA", "LEPP")
+    phases = PhasesAggregator().identify_phases(events, context)
+
+    # Matched once by each detector, reused by its analyzer
+    assert (boards[0].computed, boards[0].reused) == (2, 2)
+    assert boards[0].takeoff.runway is not None and boards[0].landing.runway is not None
+
+    # Same results as the analyzers on their own
+    by_name = {p.name: p for p in phases}
+    for name, analyzer in (("takeoff", TakeoffAnalyzer()), ("final_landing", FinalLandingAnalyzer())):
+        phase = by_name[name]
+        standalone = analyzer.analyze(phase.events, phase.start, phase.end, context)
+        assert standalone.to_dict() == phase.analysis.to_dict()
@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import pytest
+
+from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.parser import load_flight_data
+from mam_analyzer.phases.phases_aggregator import PhasesAggregator
+from mam_analyzer.phases.profiles import (
+    FULL,
+    LANDING_ONLY,
+    METRICS_ONLY,
+    PROFILES,
+    get_profile,
+    make_profile,
+)
+from runway_data import make_flight_context
+
+DATA_DIR = Path("data")
+
+FLIGHTS = [
+    ("LEPA-LEPP-737.json", "LEPA", "LEPP"),
+    ("LEBB-touchgoLEXJ-LEAS.json", "LEBB", "LEAS"),
+    ("UHMA-PAOM-B350.json", "UHMA", "PAOM"),
+    ("CYBL_KEUG_REFUELING.json", "CYBL", "KEUG"),
+    ("LEVD-fast-crash.json", "LEVD", "LEVD"),
+]
+
+
+def _phases(report, names):
+    return [p for p in report["phases"] if p["name"] in names]
+
+
+def test_dependencies_are_resolved():
+    assert make_profile("approach", ["approach"]) == make_profile("approach", ["approach", "final_landing"], ["touch_go", "approach"])
+    assert make_profile("cruise", (), ["cruise"]).detectors == {"touch_go", "approach", "cruise"}
+    assert make_profile("taxi", ["taxi"]).detectors == {"backtrack"}
+
+    assert get_profile(None) is PROFILES[FULL]
+    assert get_profile(FULL).is_full
+    assert not get_profile(METRICS_ONLY).analyzers and not get_profile(METRICS_ONLY).detectors
+    with pytest.raises(ValueError):
+        get_profile("quick")
+    with pytest.raises(ValueError):
+        make_profile("wrong", ["startup"])
+
+
+@pytest.mark.parametrize("filename,departure,landing", FLIGHTS)
+def test_partial_profiles_match_the_full_analysis(filename, departure, landing):
+    events = load_flight_data(DATA_DIR / filename)
+    context = make_flight_context(departure, landing)
+
+    full = FlightEvaluator().evaluate(events, context).to_dict()
+    metrics_only = FlightEvaluator(profile=METRICS_ONLY).evaluate(events, context).to_dict()
+    landing_only = FlightEvaluator(profile=LANDING_ONLY).evaluate(events, context).to_dict()
+
+    assert "profile" not in full
+    assert metrics_only.pop("profile") == METRICS_ONLY
+    assert landing_only.pop("profile") == LANDING_ONLY
+
+    assert metrics_only["global"] == full["global"]
+    # Same timeline: the phases not detected are unknown
+    assert [(p["start"], p["end"]) for p in _phases(metrics_only, {"startup", "takeoff", "final_landing", "shutdown"})] == [
+        (p["start"], p["end"]) for p in _phases(full, {"startup", "takeoff", "final_landing", "shutdown"})
+    ]
+    assert {p["name"] for p in metrics_only["phases"]} <= {"startup", "taxi", "takeoff", "unknown", "final_landing", "shutdown"}
+    assert all(not p["analysis"]["phase_metrics"] for p in metrics_only["phases"])
+
+    landing_phases = {"approach", "final_landing"}
+    assert _phases(landing_only, landing_phases) == _phases(full, landing_phases)
+    assert all(not p["analysis"]["phase_metrics"] for p in landing_only["phases"] if p["name"] not in landing_phases)
+
+
+def test_metrics_only_skips_the_runway_geometry_of_backtracks(monkeypatch):
+    aggregator = PhasesAggregator(profile=METRICS_ONLY)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("backtrack detection ran")
+
+    monkeypatch.setattr(aggregator.backtrack_detector, "detect_from_takeoff", fail)
+    monkeypatch.setattr(aggregator.backtrack_detector, "detect_from_landing", fail)
+
+    events = load_flight_data(DATA_DIR / "backtrack_1.json")
+    phases = aggregator.identify_phases(events, make_flight_context("LEVD", "LEVD"))
+
+    assert "backtrack" not in {p.name for p in phases}
@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from mam_analyzer.archive import LZMA, ZLIB, decode_flight, encode_flight, is_archive
+from mam_analyzer.parser import load_flight_data, parse_flight_data
+
+DATA_DIR = Path("data")
+
+
+@pytest.mark.parametrize("path", sorted(DATA_DIR.glob("*.json")), ids=lambda p: p.name)
+def test_data_flights_round_trip(path):
+    raw = path.read_bytes()
+    document = json.loads(raw)
+
+    archive = encode_flight(document)
+
+    assert is_archive(archive)
+    assert len(archive) < len(raw) / 5
+    assert json.dumps(decode_flight(archive)) == json.dumps(document)
+
+    events = parse_flight_data(archive, collapse_static=False)
+    expected = parse_flight_data(raw, collapse_static=False)
+    assert events == expected
+    assert [e.to_dict() for e in events] == document["Events"]
+
+
+@pytest.mark.parametrize("codec", [ZLIB, LZMA])
+def test_unusual_values_are_kept_as_they_are(codec):
+    document = {
+        "FlightId": 7,
+        "Events": [
+            {"Timestamp": "2025-07-07T09:00:00", "Changes": {"Latitude": "39,5", "Longitude": "-0,5", "FuelKg": "007"}},
+            {"Timestamp": "2025-07-07 09:00:01.5", "Changes": {"Latitude": "39,50", "Longitude": "-0", "FuelKg": "1.5"}},
+            {"Timestamp": "2025-07-07T09:00:02.123456789", "Changes": {"Squawk": "7700", "FuelKg": "99999999999999999999999,1"}},
+            {"Timestamp": "20250707T090003", "Changes": {"onGround": "True", "Heading": "-12"}},
+            {"Timestamp": "2025-07-07T09:00:04,25", "Changes": {"Gear": "Down"}},
+            {"Timestamp": "2025-07-07T09:00:05", "Changes": {"Flaps": 5, "Gear": None}},
+            {"Timestamp": "2025-07-07T09:00:06", "Changes": {}, "Source": "manual"},
+            {"Timestamp": "2025-07-07T09:00:07", "Source": "manual", "Changes": {"Gear": "Up"}},
+            {"Timestamp": "2025-07-07T09:00:08", "Changes": {"FuelKg": "1.5", "Latitude": "39,5"}},
+        ],
+        "Aircraft": "B738",
+    }
+
+    archive = encode_flight(document, codec)
+
+    decoded = decode_flight(archive)
+    assert json.dumps(decoded) == json.dumps(document)
+    assert [e.to_dict() for e in parse_flight_data(archive, collapse_static=False)] == [
+        e.to_dict() for e in parse_flight_data(json.dumps(document), collapse_static=False)
+    ]
+
+
+def test_events_with_other_key_orders():
+    document = json.loads((DATA_DIR / "LEPA-LEPP-737.json").read_bytes())
+    events = document["Events"]
+    events[10] = {"Changes": events[10]["Changes"], "Timestamp": events[10]["Timestamp"]}
+    events[20] = {"Source": "manual", **events[20]}
+
+    archive = encode_flight(document)
+
+    assert json.dumps(decode_flight(archive)) == json.dumps(document)
+    assert parse_flight_data(archive, collapse_static=False) == parse_flight_data(json.dumps(document), collapse_static=False)
+
+
+def test_load_flight_data_reads_archives(tmp_path):
+    path = tmp_path / "LEPA-LEPP-737.mamz"
+    path.write_bytes(encode_flight(json.loads((DATA_DIR / "LEPA-LEPP-737.json").read_bytes())))
+
+    assert load_flight_data(path) == load_flight_data(DATA_DIR / "LEPA-LEPP-737.json")
+
+
+def test_invalid_input_is_rejected():
+    with pytest.raises(ValueError):
+        encode_flight({"FlightId": 1})
+    with pytest.raises(ValueError):
+        encode_flight({"Events": []}, codec="bz2")
+    with pytest.raises(ValueError):
+        decode_flight(b"{}")
@@ -0,0 +1,81 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from mam_analyzer.batch import analyze_many, analyze_many_async, report_path
+from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.parser import load_flight_data, parse_flight_data
+from runway_data import make_flight_context
+
+DATA_DIR = Path("data")
+
+FLIGHTS = [
+    DATA_DIR / "LEPA-LEPP-737.json",
+    DATA_DIR / "LEPP-LEMG-737.json",
+    DATA_DIR / "LPMA-Circuits-737.json",
+]
+
+
+def _expected(path, context=None):
+    return json.loads(json.dumps(FlightEvaluator().evaluate(load_flight_data(path), context).to_dict()))
+
+
+def test_parse_flight_data_matches_load():
+    path = FLIGHTS[0]
+    assert parse_flight_data(path.read_bytes()) == load_flight_data(path)
+
+
+def test_analyze_many_writes_reports(tmp_path):
+    results = analyze_many(FLIGHTS, output_dir=tmp_path)
+
+    assert [r.path for r in results] == FLIGHTS
+    for path, result in zip(FLIGHTS, results):
+        assert result.ok
+        assert result.output == report_path(path, tmp_path)
+        assert result.report is None
+        with open(result.output, encoding="utf-8") as f:
+            assert json.load(f) == _expected(path)
+
+
+def test_analyze_many_async_returns_reports_with_contexts():
+    contexts = {FLIGHTS[0]: make_flight_context("LEPA", "LEPP")}
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = asyncio.run(analyze_many_async(
+            FLIGHTS[:2], contexts=contexts, max_reads=1, max_in_flight=1, executor=executor,
+        ))
+
+    assert results[0].report == _expected(FLIGHTS[0], contexts[FLIGHTS[0]])
+    takeoff = next(p for p in results[0].report["phases"] if p["name"] == "takeoff")
+    assert "TakeoffRunway" in takeoff["analysis"]["phase_metrics"]
+    assert results[1].report == _expected(FLIGHTS[1])
+
+
+def test_failures_dont_stop_the_batch(tmp_path):
+    broken = tmp_path / "broken.json"
+    broken.write_text("{\"Events\": [", encoding="utf-8")
+    missing = tmp_path / "missing.json"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = analyze_many([broken, FLIGHTS[0], missing], output_dir=tmp_path / "out", executor=executor)
+
+    assert [r.ok for r in results] == [False, True, False]
+    assert "JSONDecodeError" in results[0].error
+    assert "FileNotFoundError" in results[2].error
+    assert results[1].output.is_file()
+
+
+def test_read_ahead_is_sized_from_the_workers(monkeypatch):
+    sizes = []
+    semaphore = asyncio.Semaphore
+    monkeypatch.setattr(asyncio, "Semaphore", lambda value: sizes.append(value) or semaphore(value))
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = analyze_many(FLIGHTS[:1], max_reads=2, executor=executor, workers=3)
+
+    assert results[0].ok
+    # max_reads, then max_in_flight: two files per worker plus the reads
+    assert sizes == [2, 2 * 3 + 2]
@@ -0,0 +1,256 @@
+import sqlite3
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from mam_analyzer import cache as cache_module
+from mam_analyzer.cache import ResultCache, evaluator_key, flight_key, ruleset_version
+from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.issue_coalescing import CoalesceRule
+from mam_analyzer.parser import load_flight_data
+from mam_analyzer.phases.analyzers.issues import Issues
+from mam_analyzer.phases.analyzers.takeoff import TakeoffAnalyzer
+from mam_analyzer.phases.profiles import FULL, METRICS_ONLY
+from mam_analyzer.profiling import Profiler
+from runway_data import make_flight_context
+
+DATA_DIR = Path("data")
+
+
+@pytest.fixture(scope="module")
+def events():
+    return load_flight_data(DATA_DIR / "LEPA-LEPP-737.json")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with ResultCache(tmp_path / "cache.db") as c:
+        yield c
+
+
+def test_flight_key_is_stable(events):
+    assert flight_key(events) == flight_key(list(events))
+    assert len(ruleset_version()) == 64
+
+
+def test_flight_key_depends_on_events_and_context(events):
+    key = flight_key(events)
+
+    assert flight_key(events[:-1]) != key
+    assert flight_key(events, make_flight_context("LEPA", "LEPP")) != key
+    assert flight_key(events, make_flight_context("LEPA", "LEPP")) != flight_key(events, make_flight_context("LEPP", "LEPA"))
+
+
+def test_flight_key_depends_on_ruleset(events, monkeypatch):
+    key = flight_key(events)
+
+    monkeypatch.setattr(cache_module, "ruleset_version", lambda: "other analyzers")
+
+    assert flight_key(events) != key
+
+
+def test_ruleset_covers_only_the_analysis_sources():
+    names = {p.relative_to(cache_module._PACKAGE_DIR).as_posix() for p in cache_module._ruleset_paths()}
+
+    assert {"parser.py", "ingest.py", "evaluator.py", "models/flight_events.py", "phases/detectors/takeoff.py", "utils/search.py"} <= names
+    assert not names & {"sink.py", "fleet.py", "batch.py", "profiling.py", "preview.py", "cache.py"}
+
+
+def test_profiles_have_their_own_reports(events, cache):
+    metrics_only = FlightEvaluator(profile=METRICS_ONLY)
+
+    assert flight_key(events, profile=FULL) == flight_key(events)
+    assert flight_key(events, profile=METRICS_ONLY) != flight_key(events)
+
+    partial = cache.get_or_evaluate(events, None, metrics_only)
+    assert partial == metrics_only.evaluate(events).to_dict()
+    assert cache.get_or_evaluate(events, None, FlightEvaluator()) == FlightEvaluator().evaluate(events).to_dict()
+
+    # Partial profiles don't memoize phases
+    FlightEvaluator(phase_cache=cache, profile=METRICS_ONLY).evaluate(events)
+    assert cache.memo(events).phases() is None
+
+
+def test_key_describes_the_report_of_the_evaluator(events, cache):
+    raw = FlightEvaluator(issue_coalescing=None)
+    slow_taxi = {Issues.ISSUE_TAXI_OVERSPEED: CoalesceRule(max_gap=timedelta(seconds=60))}
+
+    assert evaluator_key(events, None, FlightEvaluator()) == flight_key(events)
+    assert evaluator_key(events, None, FlightEvaluator(profile=METRICS_ONLY)) == flight_key(events, profile=METRICS_ONLY)
+    assert evaluator_key(events, None, raw) != flight_key(events)
+    assert evaluator_key(events, None, FlightEvaluator(issue_coalescing=slow_taxi)) not in (flight_key(events), evaluator_key(events, None, raw))
+
+    # Stored in this order, each evaluator still gets its own report
+    assert cache.get_or_evaluate(events, None, FlightEvaluator(profile=METRICS_ONLY)) == FlightEvaluator(profile=METRICS_ONLY).evaluate(events).to_dict()
+    assert cache.get_or_evaluate(events, None, raw) == raw.evaluate(events).to_dict()
+    assert cache.get_or_evaluate(events, None, FlightEvaluator()) == FlightEvaluator().evaluate(events).to_dict()
+
+
+def test_get_or_evaluate_evaluates_once(events, cache):
+    calls = []
+
+    class CountingEvaluator(FlightEvaluator):
+        def evaluate(self, evs, context=None):
+            calls.append(1)
+            return super().evaluate(evs, context)
+
+    first = cache.get_or_evaluate(events, None, CountingEvaluator())
+    second = cache.get_or_evaluate(events, None, CountingEvaluator())
+
+    assert len(calls) == 1
+    assert first == second
+    assert second == FlightEvaluator().evaluate(events).to_dict()
+
+
+def test_current_reports_skip_other_variants_and_rulesets(cache, monkeypatch):
+    cache.put("full", {"global": {}})
+    cache.put("raw", {"global": {}}, "coalescing:none")
+    monkeypatch.setattr(cache_module, "ruleset_version", lambda: "other analyzers")
+    cache.put("stale", {"global": {}})
+    monkeypatch.undo()
+
+    assert [key for key, _ in cache.current_reports()] == ["full"]
+
+
+def test_untagged_reports_are_not_current(tmp_path):
+    path = tmp_path / "cache.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE reports (key TEXT PRIMARY KEY, report TEXT NOT NULL, size INTEGER NOT NULL, accessed INTEGER NOT NULL)")
+        conn.execute("INSERT INTO reports VALUES ('old', '{}', 2, 1)")
+
+    with ResultCache(path) as c:
+        assert c.get("old") == {}
+        assert list(c.current_reports()) == []
+
+
+def test_cache_persists_between_instances(events, tmp_path):
+    path = tmp_path / "cache.db"
+    report = FlightEvaluator().evaluate(events).to_dict()
+
+    with ResultCache(path) as c:
+        c.put(flight_key(events), report)
+
+    with ResultCache(path) as c:
+        assert c.get(flight_key(events)) == report
+
+
+def test_timings_are_not_cached(events, cache):
+    report = FlightEvaluator(Profiler()).evaluate(events).to_dict()
+    assert "timings" in report
+
+    cache.put("key", report)
+
+    assert "timings" not in cache.get("key")
+
+
+def test_lru_eviction(cache):
+    report = {"global": {}, "phases": [{"name": "x" * 100}]}
+    cache.max_bytes = 3 * 150
+
+    cache.put("a", report)
+    cache.put("b", report)
+    cache.put("c", report)
+    # "a" becomes the most recently used
+    assert cache.get("a") is not None
+    cache.put("d", report)
+
+    assert len(cache) == 3
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("d") is not None
+    assert cache.size_bytes() <= cache.max_bytes
+
+
+def test_get_unknown_key(cache):
+    assert cache.get("missing") is None
+
+
+def _count_analyze_calls(monkeypatch, evaluator):
+    """Count analyze() calls per phase name of the evaluator's analyzers."""
+    calls = []
+    aggregator = evaluator.aggregator
+    analyzers = [a for _, a in aggregator.detectors.values() if a is not None]
+    analyzers += [aggregator.taxi_analyzer, aggregator.approach_analyzer]
+    for analyzer in analyzers:
+        original = analyzer.analyze
+
+        def analyze(*args, _original=original, _name=type(analyzer).__name__, **kwargs):
+            calls.append(_name)
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(analyzer, "analyze", analyze)
+    return calls
+
+
+def _fail_detection(monkeypatch, evaluator):
+    def fail(*args, **kwargs):
+        raise AssertionError("detector called with memoized phases")
+
+    for detector, _ in evaluator.aggregator.detectors.values():
+        monkeypatch.setattr(detector, "detect", fail)
+
+
+@pytest.fixture(scope="module")
+def context():
+    return make_flight_context("LEPA", "LEPP")
+
+
+def test_memoized_phases_and_results_are_reused(events, context, cache, monkeypatch):
+    expected = FlightEvaluator().evaluate(events, context).to_dict()
+    first = FlightEvaluator(phase_cache=cache).evaluate(events, context).to_dict()
+
+    evaluator = FlightEvaluator(phase_cache=cache)
+    calls = _count_analyze_calls(monkeypatch, evaluator)
+    _fail_detection(monkeypatch, evaluator)
+    memo = cache.memo(events, context)
+    phases = evaluator.aggregator.identify_phases(events, context, memo)
+
+    assert calls == []
+    assert memo.misses == 0 and memo.hits > 0
+    assert [p.to_dict() for p in phases] == [p.to_dict() for p in FlightEvaluator().aggregator.identify_phases(events, context)]
+    assert first == expected
+    assert FlightEvaluator(phase_cache=cache).evaluate(events, context).to_dict() == expected
+
+
+def test_only_analyzers_with_new_version_run_again(events, context, cache, monkeypatch):
+    FlightEvaluator(phase_cache=cache).evaluate(events, context)
+
+    monkeypatch.setattr(TakeoffAnalyzer, "VERSION", TakeoffAnalyzer.VERSION + 1)
+    evaluator = FlightEvaluator(phase_cache=cache)
+    calls = _count_analyze_calls(monkeypatch, evaluator)
+    _fail_detection(monkeypatch, evaluator)
+
+    report = evaluator.evaluate(events, context).to_dict()
+
+    assert calls == ["TakeoffAnalyzer"]
+    assert report == FlightEvaluator().evaluate(events, context).to_dict()
+
+    # The new result is stored for the next run
+    evaluator = FlightEvaluator(phase_cache=cache)
+    calls = _count_analyze_calls(monkeypatch, evaluator)
+    evaluator.evaluate(events, context)
+    assert calls == []
+
+
+def test_detection_runs_again_when_detection_version_changes(events, cache, monkeypatch):
+    FlightEvaluator(phase_cache=cache).evaluate(events)
+
+    monkeypatch.setattr(cache_module, "detection_version", lambda: "other detectors")
+    memo = cache.memo(events)
+
+    assert memo.phases() is None
+    report = FlightEvaluator(phase_cache=cache).evaluate(events).to_dict()
+    assert report == FlightEvaluator().evaluate(events).to_dict()
+    assert cache.memo(events).phases() is not None
+
+
+def test_memoized_flights_are_evicted(events, cache):
+    FlightEvaluator(phase_cache=cache).evaluate(events)
+    assert cache.memo(events).phases() is not None
+
+    cache.max_bytes = 0
+    cache.put("a", {"global": {}, "phases": []})
+
+    assert cache.size_bytes() == 0
+    assert cache.memo(events).phases() is None
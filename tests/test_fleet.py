@@ -0,0 +1,174 @@
+import json
+import sqlite3
+import statistics
+from pathlib import Path
+
+import pytest
+
+from mam_analyzer import cache as cache_module
+from mam_analyzer.cache import ResultCache
+from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.fleet import (
+    ALL_FLIGHTS,
+    FleetAggregate,
+    FlightSummary,
+    MetricStats,
+    aggregate_fleet,
+    by_metric,
+    by_name_part,
+    iter_summaries,
+)
+from mam_analyzer.parser import load_flight_data
+from mam_analyzer.phases.profiles import LANDING_ONLY
+from mam_analyzer.sink import SqliteReportSink
+from runway_data import make_flight_context
+
+DATA_DIR = Path("data")
+
+FLIGHTS = {
+    "LEPA-LEPP-737": ("LEPA", "LEPP"),
+    "LEPP-LEMG-737": ("LEPP", "LEMG"),
+    "LPMA-Circuits-737": ("LPMA", "LPMA"),
+    "UHMA-PAOM-B350": ("UHMA", "PAOM"),
+    "UHPT-UHMA-B350": ("UHPT", "UHMA"),
+}
+
+
+@pytest.fixture(scope="module")
+def reports():
+    result = {}
+    for name, (dep, arr) in FLIGHTS.items():
+        events = load_flight_data(DATA_DIR / f"{name}.json")
+        report = FlightEvaluator().evaluate(events, make_flight_context(dep, arr)).to_dict()
+        result[name] = json.loads(json.dumps(report))
+    return result
+
+
+@pytest.fixture(scope="module")
+def report_dir(reports, tmp_path_factory):
+    path = tmp_path_factory.mktemp("reports")
+    for name, report in reports.items():
+        (path / f"{name}.json").write_text(json.dumps(report), encoding="utf-8")
+    return path
+
+
+def _assert_same(actual: FleetAggregate, expected: FleetAggregate):
+    assert set(actual.groups) == set(expected.groups)
+    for key, group in expected.groups.items():
+        other = actual.groups[key]
+        assert other.flights == group.flights
+        assert other.issues == group.issues
+        for metric, stats in group.metrics.items():
+            assert other.metrics[metric].count == stats.count
+            assert other.metrics[metric].mean == pytest.approx(stats.mean)
+            assert other.metrics[metric].m2 == pytest.approx(stats.m2)
+            assert (other.metrics[metric].min, other.metrics[metric].max) == (stats.min, stats.max)
+
+
+def test_metric_stats_merge_matches_single_pass():
+    values = [-120, -250, -95, -610, -330, -180, -75]
+    single = MetricStats()
+    for v in values:
+        single.add(v)
+
+    left, right = MetricStats(), MetricStats()
+    for v in values[:3]:
+        left.add(v)
+    for v in values[3:]:
+        right.add(v)
+    left.merge(right)
+    left.merge(MetricStats())
+
+    for stats in (single, left):
+        assert stats.count == len(values)
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.stdev == pytest.approx(statistics.stdev(values))
+        assert (stats.min, stats.max) == (min(values), max(values))
+
+
+def test_grouped_statistics(reports):
+    aggregate = FleetAggregate(group_by=by_name_part(2)).add_all(
+        FlightSummary.from_report(name, report) for name, report in reports.items()
+    )
+
+    assert set(aggregate.groups) == {"737", "B350"}
+    b737 = aggregate.groups["737"]
+    assert b737.flights == 3
+
+    landing_vs = [
+        p["analysis"]["phase_metrics"]["LandingVSFpm"]
+        for name, report in reports.items() if name.endswith("737")
+        for p in report["phases"] if "LandingVSFpm" in p["analysis"]["phase_metrics"]
+    ]
+    assert b737.metrics["LandingVSFpm"].count == len(landing_vs)
+    assert b737.metrics["LandingVSFpm"].mean == pytest.approx(statistics.mean(landing_vs))
+
+    hard = sum(
+        any(i["code"] == "LandingHardFpm" for p in report["phases"] for i in p["analysis"]["issues"])
+        for name, report in reports.items() if name.endswith("737")
+    )
+    assert b737.issue_rate("LandingHardFpm") == pytest.approx(hard / 3)
+
+
+def test_issue_code_and_metric_filters(reports):
+    aggregate = FleetAggregate(metrics=["TakeoffRunwayRemainingPct"], issue_codes=["TaxiOverspeed"]).add_all(
+        FlightSummary.from_report(name, report) for name, report in reports.items()
+    )
+    group = aggregate.groups[ALL_FLIGHTS]
+
+    assert group.flights == len(reports)
+    assert set(group.metrics) == {"TakeoffRunwayRemainingPct"}
+    assert set(group.issues) <= {"TaxiOverspeed"}
+
+
+def test_sources_give_the_same_statistics(reports, report_dir, tmp_path):
+    with SqliteReportSink(tmp_path / "reports.db") as sink:
+        for name, report in reports.items():
+            sink.add_report(name, report)
+    with ResultCache(tmp_path / "cache.db") as cache:
+        for name, report in reports.items():
+            cache.put(name, report)
+
+    group_by = by_metric("LandingRunway")
+    expected = aggregate_fleet(sorted(report_dir.glob("*.json")), group_by=group_by)
+
+    assert len(list(iter_summaries(report_dir))) == len(reports)
+    for source in (report_dir, tmp_path / "reports.db", tmp_path / "cache.db"):
+        _assert_same(aggregate_fleet(source, group_by=group_by), expected)
+
+
+def test_cache_source_counts_each_flight_once(tmp_path, monkeypatch):
+    name = "LEPA-LEPP-737"
+    events = load_flight_data(DATA_DIR / f"{name}.json")
+    context = make_flight_context(*FLIGHTS[name])
+    path = tmp_path / "cache.db"
+
+    with ResultCache(path) as cache:
+        # Report of an older ruleset, still in the file until evicted
+        with monkeypatch.context() as m:
+            m.setattr(cache_module, "ruleset_version", lambda: "older analyzers")
+            cache.get_or_evaluate(events, context, FlightEvaluator())
+        for evaluator in (FlightEvaluator(), FlightEvaluator(profile=LANDING_ONLY), FlightEvaluator(issue_coalescing=None)):
+            cache.get_or_evaluate(events, context, evaluator)
+        assert cache._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0] == 4
+
+    group = aggregate_fleet(path).groups[ALL_FLIGHTS]
+
+    assert group.flights == 1
+    assert group.metrics["LandingVSFpm"].count == 1
+
+
+def test_parallel_partial_aggregation(report_dir):
+    group_by = by_name_part(-1)
+    expected = aggregate_fleet(report_dir, group_by=group_by)
+
+    _assert_same(aggregate_fleet(report_dir, group_by=group_by, workers=2), expected)
+
+
+def test_unknown_database_is_rejected(tmp_path):
+    path = tmp_path / "other.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE other (x)")
+
+    with pytest.raises(ValueError):
+        aggregate_fleet(path)
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+from pathlib import Path
+
+RUN_SCRIPT = Path("scripts/run.py")
+
+# Heavy libraries only needed once the geometry runs (backtrack, runway context)
+LAZY_MODULES = ("numpy", "shapely", "pyproj")
+
+# Cumulative import time of the mam_analyzer modules loaded by scripts/run.py (~70 ms
+# on a laptop). Generous so slow CI runners don't fail, low enough to catch an eager
+# import of shapely / numpy (+100 ms).
+IMPORT_BUDGET_US = 400_000
+
+
+def _importtime(*args):
+    """Run scripts/run.py with -X importtime. Returns {module: (cumulative us, depth)}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(RUN_SCRIPT), *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(cumulative), depth)
+    return modules
+
+
+def test_cli_cold_start_does_not_import_geometry_libraries():
+    modules = _importtime("--help")
+
+    assert "mam_analyzer.evaluator" in modules
+    for name in LAZY_MODULES:
+        assert name not in modules, f"{name} imported at startup"
+
+
+def test_cli_cold_start_does_not_import_the_archive_codecs():
+    # Only imported to decode an archive (lzma / zlib)
+    assert "mam_analyzer.archive" not in _importtime("--help")
+
+
+def test_cli_cold_start_import_budget():
+    modules = _importtime("--help")
+
+    total = sum(
+        cumulative
+        for name, (cumulative, depth) in modules.items()
+        if name.startswith("mam_analyzer") and depth == 0
+    )
+
+    assert 0 < total < IMPORT_BUDGET_US
@@ -0,0 +1,135 @@
+from mam_analyzer.evaluator import FlightEvaluator
+import json
+import random
+from pathlib import Path
+
+from mam_analyzer.ingest import collapse_static_runs, expand_static_runs, expanded_event_count, normalize_events
+from mam_analyzer.models.flight_events import FlightEvent, StaticRun
+from mam_analyzer.phases.analyzers.result import AnalysisResult
+from mam_analyzer.phases.analyzers.taxi import TaxiAnalyzer
+from mam_analyzer.phases.flight_phase import FlightPhase
+from mam_analyzer.parser import load_flight_data, parse_flight_data
+from mam_analyzer.synthetic import SyntheticFlightConfig, generate_flight_context, write_flight
+
+DATA_DIR = Path("data")
+
+LONG_GATE_FLIGHT = SyntheticFlightConfig(cruise_minutes=20, preflight_minutes=240, postflight_minutes=120)
+
+GATE = {
+    "Latitude": "39,5",
+    "Longitude": "2,7",
+    "onGround": "True",
+    "Altitude": "25",
+    "AGLAltitude": "0",
+    "Altimeter": "25",
+    "VSFpm": "0",
+    "Heading": "240",
+    "GSKnots": "0",
+    "IASKnots": "0",
+    "QNHSet": "1013",
+    "Flaps": "0",
+    "Gear": "Down",
+    "FuelKg": "5000,0",
+    "Squawk": "2000",
+    "AP": "Off",
+    "Engine 1": "Off",
+    "Engine 2": "Off",
+}
+
+
+def _gate_event(second, **changes):
+    return FlightEvent.from_json({"Timestamp": f"2025-07-07 09:00:{second:02d}.000", "Changes": {**GATE, **changes}})
+
+
+def test_identical_ground_events_are_collapsed():
+    events = [_gate_event(s) for s in range(5)] + [_gate_event(5, **{"Engine 1": "On"}), _gate_event(6)]
+
+    collapsed = collapse_static_runs(events)
+
+    assert len(collapsed) == 4
+    run = collapsed[0]
+    assert isinstance(run, StaticRun)
+    assert (run.timestamp, run.run_end, run.run_count) == (events[0].timestamp, events[4].timestamp, 5)
+    assert collapsed[1:] == events[4:]
+    assert expanded_event_count(collapsed) == len(events)
+    assert [d for e in collapsed for d in e.to_dicts()] == [e.to_dict() for e in events]
+
+
+def test_per_event_issues_count_the_collapsed_events():
+    # Holding short with engines on: a static run raising an issue per event
+    holding = {"Engine 1": "On", "Engine 2": "On", "GSKnots": "35", "ZFW": "52000"}
+    events = [_gate_event(s, **holding) for s in range(6)] + [_gate_event(6, **{**holding, "GSKnots": "0"})]
+    collapsed = collapse_static_runs(events)
+    assert len(collapsed) < len(events)
+    assert [e.timestamp for e in expand_static_runs(collapsed)] == [e.timestamp for e in events]
+
+    start, end = events[0].timestamp, events[-1].timestamp
+    overspeeds = TaxiAnalyzer().analyze(collapsed, start, end).issues
+    assert overspeeds == TaxiAnalyzer().analyze(events, start, end).issues
+    assert len(overspeeds) == 6
+
+    def zfw_issues(phase_events):
+        phases = [FlightPhase(name, start, end, AnalysisResult(), phase_events) for name in ("startup", "taxi", "shutdown")]
+        FlightEvaluator().check_zfw_changed(phases, 50000)
+        return phases[1].analysis.issues
+
+    assert zfw_issues(collapsed) == zfw_issues(events)
+    assert len(zfw_issues(collapsed)) == len(events)
+
+
+def test_short_and_airborne_runs_are_kept():
+    airborne = {"onGround": "False"}
+    events = [_gate_event(s) for s in range(2)] + [_gate_event(s, **airborne) for s in range(2, 6)]
+
+    assert collapse_static_runs(events) == events
+
+
+def test_report_is_the_same_with_collapsed_runs(tmp_path):
+    path = tmp_path / "long_gate.json"
+    write_flight(path, LONG_GATE_FLIGHT)
+    context = generate_flight_context(LONG_GATE_FLIGHT)
+
+    events = load_flight_data(path, collapse_static=False)
+    collapsed = load_flight_data(path)
+
+    assert len(collapsed) < len(events)
+    assert expanded_event_count(collapsed) == len(events)
+    assert FlightEvaluator().evaluate(collapsed, context).to_dict() == FlightEvaluator().evaluate(events, context).to_dict()
+
+
+def test_events_are_ordered_and_exact_duplicates_dropped():
+    events = [_gate_event(0), _gate_event(2), _gate_event(1), _gate_event(2), _gate_event(2, Squawk="7000"), _gate_event(1)]
+
+    normalized, summary = normalize_events(events)
+
+    assert [(e.timestamp.second, e.other_changes["Squawk"]) for e in normalized] == [
+        (0, "2000"), (1, "2000"), (2, "2000"), (2, "7000"),
+    ]
+    assert summary.to_dict() == {"events": 6, "reordered": True, "out_of_order": 2, "duplicates": 2}
+
+    ordered = [_gate_event(s) for s in range(3)]
+    normalized, summary = normalize_events(ordered)
+    assert normalized is ordered
+    assert not summary.changed
+
+
+def test_report_of_shuffled_flight_records_the_normalization():
+    document = json.loads((DATA_DIR / "LEPA-LEPP-737.json").read_bytes())
+    clean_events = load_flight_data(DATA_DIR / "LEPA-LEPP-737.json")
+    assert not clean_events.ingest.changed
+
+    shuffled = document["Events"][:]
+    # A chunk uploaded twice and a few events out of order
+    shuffled[100:100] = shuffled[200:220]
+    shuffled[300:310] = random.Random(46).sample(shuffled[300:310], 10)
+    events = parse_flight_data(json.dumps({**document, "Events": shuffled}))
+
+    assert events.index.is_sorted
+    assert [e.to_dicts() for e in events] == [e.to_dicts() for e in clean_events]
+
+    clean = FlightEvaluator().evaluate(clean_events).to_dict()
+    report = FlightEvaluator().evaluate(events).to_dict()
+    ingest = report.pop("ingest")
+    assert report == clean
+    assert ingest["reordered"] and ingest["duplicates"] == 20
+    assert ingest["events"] == len(shuffled)
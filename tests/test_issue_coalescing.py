@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.issue_coalescing import CoalesceRule, coalesce_issues
+from mam_analyzer.parser import load_flight_data
+from mam_analyzer.phases.analyzers.issues import Issues
+from mam_analyzer.phases.analyzers.result import AnalysisIssue
+
+DATA_DIR = Path("data")
+
+BASE = datetime(2025, 7, 7, 9, 0, 0)
+
+
+def issue(code, seconds, value=None):
+    return AnalysisIssue(code=code, timestamp=BASE + timedelta(seconds=seconds), value=value)
+
+
+def test_consecutive_issues_are_merged_into_intervals():
+    issues = [
+        issue(Issues.ISSUE_TAXI_OVERSPEED, 0, 31),
+        issue(Issues.ISSUE_TAXI_OVERSPEED, 4, 38),
+        issue(Issues.ISSUE_TAXI_OVERSPEED, 8, 33),
+        # More than 10 seconds later: new interval
+        issue(Issues.ISSUE_TAXI_OVERSPEED, 30, 32),
+    ]
+
+    intervals = coalesce_issues(issues)
+
+    assert [(i.start, i.end, i.count, i.peak) for i in intervals] == [
+        (issues[0].timestamp, issues[2].timestamp, 3, 38),
+        (issues[3].timestamp, issues[3].timestamp, 1, 32),
+    ]
+    assert intervals[0].issues == issues[:3]
+    assert intervals[0].to_dict() == {
+        "code": Issues.ISSUE_TAXI_OVERSPEED,
+        "timestamp": issues[0].timestamp.isoformat(),
+        "value": 38,
+        "end": issues[2].timestamp.isoformat(),
+        "count": 3,
+    }
+    # A single issue keeps the raw form
+    assert intervals[1].to_dict() == {"code": Issues.ISSUE_TAXI_OVERSPEED, "timestamp": issues[3].timestamp.isoformat(), "value": 32}
+
+
+def test_codes_are_coalesced_independently_and_per_rule():
+    issues = [
+        issue(Issues.ISSUE_APP_HIGH_VS_BELOW_1000AGL, 0, "-1650|900|-1500"),
+        issue(Issues.ISSUE_HARD_LANDING_FPM, 1, -700),
+        issue(Issues.ISSUE_APP_HIGH_VS_BELOW_1000AGL, 2, "-1900|850|-1500"),
+        issue(Issues.ISSUE_HARD_LANDING_FPM, 3, -750),
+        issue(Issues.ISSUE_APP_HIGH_VS_BELOW_1000AGL, 4, "-1550|800|-1500"),
+    ]
+
+    intervals = coalesce_issues(issues)
+
+    # Steepest descent is the peak, codes without rule are untouched
+    assert [(i.code, i.count, i.peak) for i in intervals] == [
+        (Issues.ISSUE_APP_HIGH_VS_BELOW_1000AGL, 3, "-1900|850|-1500"),
+        (Issues.ISSUE_HARD_LANDING_FPM, 1, -700),
+        (Issues.ISSUE_HARD_LANDING_FPM, 1, -750),
+    ]
+
+    rules = {Issues.ISSUE_HARD_LANDING_FPM: CoalesceRule(max_gap=timedelta(seconds=5), magnitude=lambda v: abs(v))}
+    intervals = coalesce_issues(issues, rules)
+    assert [(i.code, i.count, i.peak) for i in intervals] == [
+        (Issues.ISSUE_APP_HIGH_VS_BELOW_1000AGL, 1, "-1650|900|-1500"),
+        (Issues.ISSUE_HARD_LANDING_FPM, 2, -750),
+        (Issues.ISSUE_APP_HIGH_VS_BELOW_1000AGL, 1, "-1900|850|-1500"),
+        (Issues.ISSUE_APP_HIGH_VS_BELOW_1000AGL, 1, "-1550|800|-1500"),
+    ]
+
+
+def test_report_exports_intervals_and_raw_issues_on_demand():
+    events = load_flight_data(DATA_DIR / "LPMA-Circuits-737.json")
+    report = FlightEvaluator().evaluate(events)
+
+    coalesced = report.to_dict()
+    raw = report.to_dict(raw_issues=True)
+    assert raw == FlightEvaluator(issue_coalescing=None).evaluate(events).to_dict()
+
+    for phase, raw_phase, analyzed in zip(coalesced["phases"], raw["phases"], report.phases):
+        assert raw_phase["analysis"]["issues"] == [
+            {"code": i.code, "timestamp": i.timestamp.isoformat(), "value": i.value} for i in analyzed.analysis.issues
+        ]
+        assert sum(i.get("count", 1) for i in phase["analysis"]["issues"]) == len(analyzed.analysis.issues)
+
+    assert any(i.get("count", 1) > 1 for p in coalesced["phases"] for i in p["analysis"]["issues"])
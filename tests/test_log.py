@@ -0,0 +1,56 @@
+import io
+import json
+import logging
+from pathlib import Path
+
+from mam_analyzer.log import JsonFormatter, configure_logging
+from mam_analyzer.parser import load_flight_data
+from mam_analyzer.phases.phases_aggregator import PhasesAggregator
+
+DATA_DIR = Path("data")
+
+
+def test_json_formatter_outputs_one_json_line():
+    record = logging.makeLogRecord({
+        "name": "mam_analyzer.phases.detectors.cruise",
+        "levelno": logging.DEBUG,
+        "levelname": "DEBUG",
+        "msg": "Margin altitude %s",
+        "args": (1000,),
+        "flight": "LEPA-LEPP",
+    })
+
+    line = JsonFormatter().format(record)
+    data = json.loads(line)
+
+    assert "\n" not in line
+    assert data["level"] == "DEBUG"
+    assert data["logger"] == "mam_analyzer.phases.detectors.cruise"
+    assert data["message"] == "Margin altitude 1000"
+    assert data["flight"] == "LEPA-LEPP"
+
+
+def test_identify_phases_does_not_write_to_stdout(capsys):
+    events = load_flight_data(DATA_DIR / "LPMA-Circuits-737.json")
+    PhasesAggregator().identify_phases(events)
+
+    assert capsys.readouterr().out == ""
+
+
+def test_identify_phases_logs_with_module_loggers():
+    stream = io.StringIO()
+    handler = configure_logging("DEBUG", json_format=True, stream=stream)
+    try:
+        events = load_flight_data(DATA_DIR / "LPMA-Circuits-737.json")
+        PhasesAggregator().identify_phases(events)
+    finally:
+        logger = logging.getLogger("mam_analyzer")
+        logger.removeHandler(handler)
+        logger.setLevel(logging.NOTSET)
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    loggers = {r["logger"] for r in records}
+
+    assert "mam_analyzer.phases.phases_aggregator" in loggers
+    assert "mam_analyzer.phases.detectors.cruise" in loggers
+    assert any(r["message"].startswith("Found bounce") for r in records)
@@ -0,0 +1,91 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from mam_analyzer.archive import encode_flight
+from mam_analyzer.batch import analyze_many
+from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.parser import parse_flight_data
+from mam_analyzer.precheck import (
+    NO_AIRBORNE_EVENT,
+    NO_EVENTS,
+    NO_LANDING_VS,
+    NOT_ON_GROUND_AT_END,
+    precheck_events,
+    precheck_flight_data,
+    precheck_flight_file,
+)
+
+DATA_DIR = Path("data")
+
+
+def _document(path, events=None):
+    document = json.loads(path.read_bytes())
+    if events is not None:
+        document["Events"] = events(document["Events"])
+    return json.dumps(document)
+
+
+@pytest.mark.parametrize("path", sorted(DATA_DIR.glob("*.json")), ids=lambda p: p.name)
+def test_data_flights_are_analyzable(path):
+    result = precheck_flight_file(path)
+
+    assert result.analyzable
+    assert result.to_dict() == {"analyzable": True, "reason": None, "message": None, "events": result.events}
+
+
+def test_truncated_sessions_are_rejected_exactly_when_detection_fails():
+    path = DATA_DIR / "LEPA-LEPP-737.json"
+    count = len(json.loads(path.read_bytes())["Events"])
+
+    reasons = set()
+    for cut in range(10, count + 1, 12):
+        data = _document(path, lambda events: events[:cut])
+        result = precheck_flight_data(data)
+        reasons.add(result.reason)
+
+        try:
+            FlightEvaluator().evaluate(parse_flight_data(data))
+            identified = True
+        except RuntimeError as e:
+            identified = "Can't identify" not in str(e)
+
+        assert result.analyzable == identified, cut
+
+    assert {NO_AIRBORNE_EVENT, NOT_ON_GROUND_AT_END, None} <= reasons
+
+
+def test_reasons():
+    path = DATA_DIR / "LEPP-LEMG-737.json"
+
+    assert precheck_events([]).reason == NO_EVENTS
+    assert precheck_flight_data(_document(path, lambda events: [
+        {**e, "Changes": {k: v for k, v in e["Changes"].items() if k != "LandingVSFpm"}} for e in events
+    ])).reason == NO_LANDING_VS
+    for empty in (None, ""):
+        assert precheck_flight_data(_document(path, lambda events: [
+            {**e, "Changes": {**e["Changes"], "LandingVSFpm": empty}} if "LandingVSFpm" in e["Changes"] else e for e in events
+        ])).reason == NO_LANDING_VS
+    # The last full event by timestamp, not by position in the file
+    def airborne_full_event_last(events):
+        i = next(i for i, e in enumerate(events) if e["Changes"].get("onGround") == "False" and "Squawk" in e["Changes"])
+        return events[:i] + events[i + 1:] + [events[i]]
+
+    reordered = _document(path, airborne_full_event_last)
+    assert precheck_flight_data(reordered).analyzable
+    assert precheck_flight_data(encode_flight(json.loads(reordered))).analyzable
+
+
+def test_batch_skips_rejected_flights(tmp_path):
+    aborted = tmp_path / "aborted.json"
+    aborted.write_text(_document(DATA_DIR / "LEPA-LEPP-737.json", lambda events: events[:20]), encoding="utf-8")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = analyze_many([aborted, DATA_DIR / "LEPA-LEPP-737.json"], executor=executor)
+
+    assert [r.ok for r in results] == [False, True]
+    assert results[0].rejection.reason == NO_AIRBORNE_EVENT
+    assert results[0].error == results[0].rejection.message
+    assert results[1].rejection is None
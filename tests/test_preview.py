@@ -0,0 +1,70 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.parser import load_flight_data
+from mam_analyzer.preview import decimate_events
+from runway_data import make_flight_context
+
+DATA_DIR = Path("data")
+
+# Phases detected from the transitions kept in the decimated track
+BOUNDARY_PHASES = {"startup", "takeoff", "touch_go", "final_landing", "shutdown"}
+# Boundaries found by walks over the decimated events (heading / runway walks) land on a
+# kept neighbour: worst cases on data/ are 20 s and 122 s. The others hang on kept
+# transitions and are exact.
+MAX_BOUNDARY_ERROR_SECONDS = {("takeoff", "start"): 30, ("final_landing", "end"): 130}
+
+
+def _boundaries(report):
+    return [
+        (p["name"], datetime.fromisoformat(p["start"]), datetime.fromisoformat(p["end"]))
+        for p in report["phases"]
+        if p["name"] in BOUNDARY_PHASES
+    ]
+
+
+def _assert_close(preview, full):
+    assert [name for name, _, _ in _boundaries(preview)] == [name for name, _, _ in _boundaries(full)]
+    for (name, start, end), (_, full_start, full_end) in zip(_boundaries(preview), _boundaries(full)):
+        assert abs((start - full_start).total_seconds()) <= MAX_BOUNDARY_ERROR_SECONDS.get((name, "start"), 0), (name, "start")
+        assert abs((end - full_end).total_seconds()) <= MAX_BOUNDARY_ERROR_SECONDS.get((name, "end"), 0), (name, "end")
+
+    assert preview["global"].keys() == full["global"].keys()
+    assert abs(preview["global"]["airborne_time_minutes"] - full["global"]["airborne_time_minutes"]) <= 1
+    assert abs(preview["global"]["distance_nm"] - full["global"]["distance_nm"]) <= 0.02 * full["global"]["distance_nm"]
+
+
+@pytest.mark.parametrize("path", sorted(DATA_DIR.glob("*.json")), ids=lambda p: p.name)
+def test_preview_boundaries_are_close_to_the_full_analysis(path):
+    events = load_flight_data(path)
+
+    preview = FlightEvaluator().preview(events).to_dict()
+    full = FlightEvaluator().evaluate(events).to_dict()
+
+    assert preview["provisional"] is True
+    assert "provisional" not in full
+    assert all(not p["analysis"]["phase_metrics"] for p in preview["phases"])
+    _assert_close(preview, full)
+
+
+def test_preview_with_runways():
+    events = load_flight_data(DATA_DIR / "LEPA-LEPP-737.json")
+    context = make_flight_context("LEPA", "LEPP")
+
+    _assert_close(FlightEvaluator().preview(events, context).to_dict(), FlightEvaluator().evaluate(events, context).to_dict())
+
+
+def test_decimated_track_keeps_the_transitions():
+    events = load_flight_data(DATA_DIR / "LPMA-Circuits-737.json")
+
+    decimated = decimate_events(events, step=50)
+
+    assert len(decimated) < len(events)
+    assert decimated[-1] is events[-1]
+    assert [e for e in decimated if e.has_change("LandingVSFpm")] == [e for e in events if e.has_change("LandingVSFpm")]
+    assert decimated.index.is_sorted
+    with pytest.raises(ValueError):
+        decimate_events(events, step=0)
@@ -0,0 +1,132 @@
+from pathlib import Path
+
+import pytest
+
+from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.parser import load_flight_data
+from mam_analyzer.profiling import NULL_PROFILER, MemoryProfiler, NullProfiler, Profiler
+from mam_analyzer.synthetic import SyntheticFlightConfig, write_flight
+
+DATA_DIR = Path("data")
+
+# Memory kept by the parsed events (FlightEvent + value tuples + datetimes), per event.
+# Raise it only on purpose: long flights have millions of events.
+BYTES_PER_EVENT_BUDGET = 1536
+
+
+def test_profiler_accumulates_stages_and_counters():
+    profiler = Profiler()
+
+    with profiler.stage("detect.takeoff", 10):
+        pass
+    with profiler.stage("detect.takeoff", 5):
+        pass
+    profiler.count("events", 15)
+    profiler.count("events")
+
+    result = profiler.to_dict()
+
+    assert result["stages"]["detect.takeoff"]["calls"] == 2
+    assert result["stages"]["detect.takeoff"]["events"] == 15
+    assert result["stages"]["detect.takeoff"]["seconds"] >= 0
+    assert result["counters"] == {"events": 16}
+
+
+def test_profiler_records_stage_on_exception():
+    profiler = Profiler()
+
+    try:
+        with profiler.stage("analyze.approach"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert profiler.stages["analyze.approach"]["calls"] == 1
+
+
+def test_null_profiler_records_nothing():
+    profiler = NullProfiler()
+
+    with profiler.stage("detect.takeoff", 10):
+        pass
+    profiler.count("events", 10)
+
+    assert profiler.to_dict() == {}
+    assert not NULL_PROFILER.enabled
+
+
+def test_report_without_profiler_has_no_timings():
+    events = load_flight_data(DATA_DIR / "UHSH-UHMM-B350.json")
+    report = FlightEvaluator().evaluate(events)
+
+    assert "timings" not in report.to_dict()
+
+
+def test_report_with_profiler_has_timings():
+    profiler = Profiler()
+    events = load_flight_data(DATA_DIR / "UHSH-UHMM-B350.json", profiler)
+    report = FlightEvaluator(profiler).evaluate(events)
+
+    timings = report.to_dict()["timings"]
+    stages = timings["stages"]
+
+    for name in (
+        "parse",
+        "identify_phases",
+        "global_metrics",
+        "serialize",
+        "detect.takeoff",
+        "detect.final_landing",
+        "analyze.takeoff",
+        "analyze.final_landing",
+        "analyze.approach",
+    ):
+        assert name in stages, f"Missing stage {name}"
+
+    assert stages["detect.takeoff"]["events"] == len(events)
+    assert timings["counters"]["events"] == len(events)
+    assert timings["counters"]["phases"] == len(report.phases)
+
+
+def test_memory_profiler_records_memory_per_stage():
+    profiler = MemoryProfiler()
+    try:
+        events = load_flight_data(DATA_DIR / "UHSH-UHMM-B350.json", profiler)
+        report = FlightEvaluator(profiler).evaluate(events)
+        timings = report.to_dict()["timings"]
+    finally:
+        profiler.stop()
+
+    assert timings["peak_rss_kb"] is None or timings["peak_rss_kb"] > 0
+
+    parse = timings["stages"]["parse"]["memory"]
+    assert parse["allocated_bytes"] > 0
+    assert parse["peak_bytes"] >= parse["allocated_bytes"]
+    assert 0 < len(parse["top_allocators"]) <= profiler.top
+    assert parse["top_allocators"][0]["size_bytes"] > 0
+
+    # Nested stages keep their own peak
+    identify = timings["stages"]["identify_phases"]["memory"]
+    detect = timings["stages"]["detect.takeoff"]["memory"]
+    assert identify["peak_bytes"] >= detect["peak_bytes"]
+
+
+def _parsed_bytes_per_event(path) -> float:
+    profiler = MemoryProfiler()
+    try:
+        events = load_flight_data(path, profiler)
+    finally:
+        profiler.stop()
+    return profiler.memory["parse"]["allocated_bytes"] / len(events)
+
+
+@pytest.mark.parametrize("name", ["LEPA-LEPP-737.json", "zfw.json", "LEBB-touchgoLEXJ-LEAS.json"])
+def test_parsed_events_memory_budget(name):
+    assert _parsed_bytes_per_event(DATA_DIR / name) < BYTES_PER_EVENT_BUDGET
+
+
+def test_long_flight_memory_budget(tmp_path):
+    path = tmp_path / "long.json"
+    write_flight(path, SyntheticFlightConfig(cruise_minutes=120, touch_and_goes=1))
+
+    assert _parsed_bytes_per_event(path) < BYTES_PER_EVENT_BUDGET
@@ -0,0 +1,130 @@
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from mam_analyzer.batch import analyze_many
+from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.parser import load_flight_data
+from mam_analyzer.sink import SqliteReportSink
+from runway_data import make_flight_context
+
+DATA_DIR = Path("data")
+
+
+@pytest.fixture(scope="module")
+def report():
+    events = load_flight_data(DATA_DIR / "LEPA-LEPP-737.json")
+    return FlightEvaluator().evaluate(events, make_flight_context("LEPA", "LEPP"))
+
+
+def _stored(conn, name):
+    flight_id = conn.execute("SELECT id FROM flights WHERE name = ?", (name,)).fetchone()[0]
+    global_metrics = dict(conn.execute("SELECT name, value FROM global_metrics WHERE flight_id = ?", (flight_id,)))
+    phases = conn.execute(
+        "SELECT idx, name, start, end, first_event, last_event FROM phases WHERE flight_id = ? ORDER BY idx",
+        (flight_id,),
+    ).fetchall()
+    metrics = conn.execute("SELECT phase_idx, name, value FROM phase_metrics WHERE flight_id = ?", (flight_id,)).fetchall()
+    issues = conn.execute(
+        "SELECT phase_idx, code, timestamp, value FROM issues WHERE flight_id = ? ORDER BY rowid", (flight_id,)
+    ).fetchall()
+    return global_metrics, phases, metrics, issues
+
+
+def test_report_is_normalized(tmp_path, report):
+    with SqliteReportSink(tmp_path / "reports.db") as sink:
+        sink.add_report("LEPA-LEPP", report)
+        sink.flush()
+        global_metrics, phases, metrics, issues = _stored(sink.connection, "LEPA-LEPP")
+
+    assert global_metrics == report.global_metrics
+    assert [(name, start, end) for _, name, start, end, _, _ in phases] == [
+        (p.name, p.start.isoformat(), p.end.isoformat()) for p in report.phases
+    ]
+
+    # Index range of the events of every phase in the flight
+    events = [e for p in report.phases for e in p.events]
+    for (idx, _, _, _, first, last), phase in zip(phases, report.phases):
+        if phase.events:
+            assert events[first:last + 1] == phase.events
+        else:
+            assert first is None and last is None
+
+    expected_metrics = {
+        (idx, key): json.dumps(value) if isinstance(value, list) else value
+        for idx, p in enumerate(report.phases)
+        for key, value in p.analysis.phase_metrics.items()
+    }
+    assert {(idx, key): value for idx, key, value in metrics} == expected_metrics
+
+    expected_issues = [
+        (idx, i.code, i.timestamp.isoformat(), i.value)
+        for idx, p in enumerate(report.phases)
+        for i in p.analysis.issues
+    ]
+    assert issues == expected_issues
+
+
+def test_dict_reports_are_stored_like_reports(tmp_path, report):
+    with SqliteReportSink(tmp_path / "reports.db") as sink:
+        sink.add_report("object", report)
+        sink.add_report("dict", json.loads(json.dumps(report.to_dict())))
+        sink.flush()
+        assert _stored(sink.connection, "object") == _stored(sink.connection, "dict")
+
+
+def test_reports_are_written_in_batches(tmp_path, report):
+    path = tmp_path / "reports.db"
+    with SqliteReportSink(path, batch_size=2) as sink:
+        sink.add_report("a", report)
+        assert sink.connection.execute("SELECT COUNT(*) FROM flights").fetchone()[0] == 0
+        sink.add_report("b", report)
+        assert sink.connection.execute("SELECT COUNT(*) FROM flights").fetchone()[0] == 2
+        sink.add_report("c", report)
+
+    # close() flushes the rest
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM flights").fetchone()[0] == 3
+
+
+def test_flight_added_again_is_replaced(tmp_path, report):
+    path = tmp_path / "reports.db"
+    with SqliteReportSink(path) as sink:
+        sink.add_report("a", report)
+        sink.add_report("b", report)
+    with SqliteReportSink(path) as sink:
+        sink.add_report("a", report)
+        sink.add_report("a", report)
+        conn = sink.connection
+        sink.flush()
+
+        assert conn.execute("SELECT COUNT(*) FROM flights").fetchone()[0] == 2
+        per_flight = conn.execute("SELECT COUNT(*) FROM phases GROUP BY flight_id").fetchall()
+        assert per_flight == [(len(report.phases),)] * 2
+
+
+def test_issue_queries_use_indexes(tmp_path):
+    with SqliteReportSink(tmp_path / "reports.db") as sink:
+        plan = sink.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM issues WHERE code = ? AND timestamp > ?", ("TaxiOverspeed", "2025")
+        ).fetchall()
+        assert "issues_code" in str(plan)
+        plan = sink.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM issues WHERE timestamp BETWEEN ? AND ?", ("2025", "2026")
+        ).fetchall()
+        assert "issues_timestamp" in str(plan)
+
+
+def test_batch_writes_to_sink(tmp_path):
+    flights = [DATA_DIR / "LEPA-LEPP-737.json", DATA_DIR / "LEPP-LEMG-737.json"]
+
+    with SqliteReportSink(tmp_path / "reports.db") as sink:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = analyze_many(flights, sink=sink, executor=executor)
+
+        assert all(r.ok and r.report is None for r in results)
+        names = [row[0] for row in sink.connection.execute("SELECT name FROM flights ORDER BY name")]
+        assert names == ["LEPA-LEPP-737", "LEPP-LEMG-737"]
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+from mam_analyzer.evaluator import FlightEvaluator
+from mam_analyzer.ingest import expanded_event_count
+from mam_analyzer.models.flight_events import FlightEvent
+from mam_analyzer.parser import load_flight_data
+from mam_analyzer.synthetic import (
+    SyntheticFlightConfig,
+    generate_flight,
+    generate_flight_context,
+    iter_flight_events,
+    write_flight,
+)
+
+SHORT_FLIGHT = SyntheticFlightConfig(cruise_minutes=20, preflight_minutes=2, postflight_minutes=2)
+
+
+def _events(config):
+    return [FlightEvent.from_json(e) for e in generate_flight(config)["Events"]]
+
+
+def _phase_names(report):
+    return [p.name for p in report.phases if p.name != "unknown"]
+
+
+def test_generated_flight_phases():
+    report = FlightEvaluator().evaluate(_events(SHORT_FLIGHT))
+
+    assert _phase_names(report) == [
+        "startup", "taxi", "takeoff", "cruise", "approach", "final_landing", "taxi", "shutdown",
+    ]
+    for phase in report.phases:
+        assert phase.analysis.issues == [], f"Unexpected issues in {phase.name}"
+
+
+@pytest.mark.parametrize("touch_and_goes", [1, 3])
+def test_generated_flight_touch_and_goes(touch_and_goes):
+    config = SyntheticFlightConfig(
+        cruise_minutes=20, preflight_minutes=2, postflight_minutes=2, touch_and_goes=touch_and_goes,
+    )
+    report = FlightEvaluator().evaluate(_events(config))
+    names = _phase_names(report)
+
+    assert names.count("touch_go") == touch_and_goes
+    assert names.count("final_landing") == 1
+
+
+def test_generated_context_matches_runways():
+    config = SyntheticFlightConfig(
+        cruise_minutes=20, preflight_minutes=2, postflight_minutes=2,
+        departure_heading=270, arrival_heading=35,
+    )
+    context = generate_flight_context(config)
+    report = FlightEvaluator().evaluate(_events(config), context)
+
+    takeoff = next(p for p in report.phases if p.name == "takeoff")
+    landing = next(p for p in report.phases if p.name == "final_landing")
+
+    assert takeoff.analysis.phase_metrics["TakeoffRunway"] == "27"
+    assert landing.analysis.phase_metrics["LandingRunway"] == "04"
+
+
+def test_step_climbs_reach_final_level():
+    config = SyntheticFlightConfig(
+        cruise_minutes=60, preflight_minutes=2, postflight_minutes=2,
+        cruise_altitude_ft=33000, step_climbs=2, step_climb_ft=2000,
+    )
+    altitudes = [int(e["Changes"]["Altitude"]) for e in iter_flight_events(config) if "Altitude" in e["Changes"]]
+
+    assert max(altitudes) == 37000
+
+
+def test_delta_and_full_events():
+    raw = generate_flight(SHORT_FLIGHT)["Events"]
+    events = [FlightEvent.from_json(e) for e in raw]
+
+    full = [e for e in events if e.is_full_event()]
+    delta = [e for e in events if not e.is_full_event()]
+
+    assert events[0].is_full_event() and events[-1].is_full_event()
+    assert len(delta) > len(full)
+    # Delta events only report changes, full events every key
+    assert all("FuelKg" not in e.other_changes for e in delta)
+    assert all("FuelKg" in e.other_changes and "Engine 2" in e.other_changes for e in full)
+    # Touchdowns are full events starting with LandingVSFpm
+    touches = [e for e in raw if "LandingVSFpm" in e["Changes"]]
+    assert len(touches) == 1
+    assert next(iter(touches[0]["Changes"])) == "LandingVSFpm"
+    # Comma decimals as in MAM ACARS
+    assert "," in raw[0]["Changes"]["Latitude"]
+    assert "," in raw[0]["Changes"]["FuelKg"]
+    assert all("." not in v for e in raw for v in e["Changes"].values())
+
+
+def test_density_is_configurable():
+    sparse = generate_flight(SHORT_FLIGHT)["Events"]
+    dense = generate_flight(SyntheticFlightConfig(
+        cruise_minutes=20, preflight_minutes=2, postflight_minutes=2, sample_seconds=0.25,
+    ))["Events"]
+
+    assert len(dense) > 3 * len(sparse)
+
+
+def test_generation_is_deterministic():
+    assert generate_flight(SHORT_FLIGHT) == generate_flight(SHORT_FLIGHT)
+    assert generate_flight(SHORT_FLIGHT) != generate_flight(SyntheticFlightConfig(
+        cruise_minutes=20, preflight_minutes=2, postflight_minutes=2, seed=1,
+    ))
+
+
+def test_write_flight_streams_valid_json(tmp_path):
+    path = tmp_path / "synthetic.json"
+
+    count = write_flight(path, SHORT_FLIGHT)
+
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == generate_flight(SHORT_FLIGHT)
+    assert len(load_flight_data(path, collapse_static=False)) == count
+    assert expanded_event_count(load_flight_data(path)) == count
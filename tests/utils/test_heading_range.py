@@ -3,7 +3,7 @@ import os
 from datetime import datetime
 import pytest
 
-from mam_analyzer.utils.units import heading_within_range
+from mam_analyzer.utils.units import heading_within_range, headings_within_range
 
 def test_heading_range_correct():
     # Normal headings
@@ -26,4 +26,14 @@ def test_heading_range_correct():
     assert heading_within_range(15,355, tolerance=10) is False
     assert heading_within_range(15,355, tolerance=20) is True
     assert heading_within_range(355,15, tolerance=10) is False
-    assert heading_within_range(355,15, tolerance=20) is True
\ No newline at end of file
+    assert heading_within_range(355,15, tolerance=20) is True
+
+
+@pytest.mark.parametrize("reference", [0, 3, 90, 180, 357, 360])
+@pytest.mark.parametrize("tolerance", [0, 6, 20])
+def test_headings_range_matches_every_heading(reference, tolerance):
+    for lowest in range(-20, 380, 3):
+        for highest in range(lowest, lowest + 50, 2):
+            expected = all(heading_within_range(h, reference, tolerance) for h in range(lowest, highest + 1))
+            assert headings_within_range(lowest, highest, reference, tolerance) is expected, (lowest, highest)
+
@@ -1,3 +1,5 @@
+import json
+
 from src.mam_analyzer import parser
 from mam_analyzer.models.flight_events import FlightEvent
 
@@ -16,3 +18,18 @@ def test_load_flight_data():
     # El primero debe tener un timestamp válido
     assert hasattr(data[0], "timestamp")
     assert data[0].timestamp is not None
+
+def test_event_keys_in_any_order():
+    with open("data/LEPA-LEPP-737.json", encoding="utf-8") as f:
+        document = json.load(f)
+    events = document["Events"]
+    events[10] = {"Changes": events[10]["Changes"], "Timestamp": events[10]["Timestamp"]}
+    events[20] = {"Source": "manual", **events[20]}
+
+    parsed = parser.parse_flight_data(json.dumps(document))
+
+    assert all(isinstance(ev, FlightEvent) for ev in parsed)
+    assert parsed == parser.parse_flight_data(json.dumps({**document, "Events": [
+        {"Timestamp": e["Timestamp"], "Changes": e["Changes"]} if i == 10 else e for i, e in enumerate(events)
+    ]}))
+    assert [e.to_dict() for e in parser.parse_flight_data(json.dumps(document), collapse_static=False)][20] == events[20]
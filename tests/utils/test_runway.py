@@ -8,7 +8,6 @@ from mam_analyzer.utils.runway import (
     match_runway_end,
     point_inside_runway,
 )
-from mam_analyzer.utils.units import latlon_to_xy
 
 
 def _make_runway(
@@ -45,19 +44,19 @@ def _make_runway(
 class TestBuildRunwayPolygon:
     def test_polygon_contains_both_ends(self):
         rwy = _make_runway()
-        poly, utm_zone = build_runway_polygon(rwy)
+        poly, projection = build_runway_polygon(rwy)
 
-        p1 = Point(latlon_to_xy(rwy.ends[0].latitude, rwy.ends[0].longitude, utm_zone))
-        p2 = Point(latlon_to_xy(rwy.ends[1].latitude, rwy.ends[1].longitude, utm_zone))
+        p1 = Point(projection.to_xy(rwy.ends[0].latitude, rwy.ends[0].longitude))
+        p2 = Point(projection.to_xy(rwy.ends[1].latitude, rwy.ends[1].longitude))
 
         assert poly.covers(p1)
         assert poly.covers(p2)
 
     def test_point_far_away_is_outside(self):
         rwy = _make_runway()
-        poly, utm_zone = build_runway_polygon(rwy)
+        poly, projection = build_runway_polygon(rwy)
 
-        far_point = Point(latlon_to_xy(40.0, 3.0, utm_zone))
+        far_point = Point(projection.to_xy(40.0, 3.0))
         assert not poly.covers(far_point)
 
     def test_margin_makes_polygon_bigger(self):
@@ -76,15 +75,32 @@ class TestBuildRunwayPolygon:
 
     def test_polygon_width_is_correct(self):
         rwy = _make_runway(width_m=60)
-        poly, utm_zone = build_runway_polygon(rwy, margin_width_m=0, extend_m=0)
+        poly, projection = build_runway_polygon(rwy, margin_width_m=0, extend_m=0)
 
-        p1 = latlon_to_xy(rwy.ends[0].latitude, rwy.ends[0].longitude, utm_zone)
-        p2 = latlon_to_xy(rwy.ends[1].latitude, rwy.ends[1].longitude, utm_zone)
+        p1 = projection.to_xy(rwy.ends[0].latitude, rwy.ends[0].longitude)
+        p2 = projection.to_xy(rwy.ends[1].latitude, rwy.ends[1].longitude)
         centreline = Point((p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2)
 
         # Centre should be inside
         assert poly.covers(centreline)
 
+    def test_runway_across_utm_zone_border(self):
+        # Ends on both sides of the 30/31 UTM zone border (lon 0)
+        rwy = _make_runway(lat1=43.30, lon1=-0.01, lat2=43.30, lon2=0.01, heading1=90, heading2=270, width_m=45)
+        poly, projection = build_runway_polygon(rwy)
+
+        assert projection.lon0 == pytest.approx(0)
+        assert poly.area == pytest.approx(1620 * 45, rel=0.02)
+        assert point_inside_runway(43.30, -0.009, poly, projection) is True
+        assert point_inside_runway(43.30, 0.009, poly, projection) is True
+
+    def test_polygon_is_cached_by_runway_values(self):
+        poly, _ = build_runway_polygon(_make_runway())
+
+        assert build_runway_polygon(_make_runway())[0] is poly
+        assert build_runway_polygon(_make_runway(width_m=60))[0] is not poly
+        assert build_runway_polygon(_make_runway(), margin_width_m=20)[0] is not poly
+
 
 # === build_runway_safe_zone ===
 
@@ -100,9 +116,9 @@ class TestBuildRunwaySafeZone:
         rwy = _make_runway()
         safe = build_runway_safe_zone(rwy)
 
-        _, utm_zone = build_runway_polygon(rwy)
-        p1 = Point(latlon_to_xy(rwy.ends[0].latitude, rwy.ends[0].longitude, utm_zone))
-        p2 = Point(latlon_to_xy(rwy.ends[1].latitude, rwy.ends[1].longitude, utm_zone))
+        _, projection = build_runway_polygon(rwy)
+        p1 = Point(projection.to_xy(rwy.ends[0].latitude, rwy.ends[0].longitude))
+        p2 = Point(projection.to_xy(rwy.ends[1].latitude, rwy.ends[1].longitude))
 
         assert safe.covers(p1)
         assert safe.covers(p2)
@@ -178,23 +194,23 @@ class TestMatchRunwayEnd:
 class TestPointInsideRunway:
     def test_point_on_runway_is_inside(self):
         rwy = _make_runway()
-        poly, utm_zone = build_runway_polygon(rwy)
+        poly, projection = build_runway_polygon(rwy)
 
         # Midpoint of the runway
         mid_lat = (rwy.ends[0].latitude + rwy.ends[1].latitude) / 2
         mid_lon = (rwy.ends[0].longitude + rwy.ends[1].longitude) / 2
 
-        assert point_inside_runway(mid_lat, mid_lon, poly, utm_zone) is True
+        assert point_inside_runway(mid_lat, mid_lon, poly, projection) is True
 
     def test_point_far_away_is_outside(self):
         rwy = _make_runway()
-        poly, utm_zone = build_runway_polygon(rwy)
+        poly, projection = build_runway_polygon(rwy)
 
-        assert point_inside_runway(40.0, 3.0, poly, utm_zone) is False
+        assert point_inside_runway(40.0, 3.0, poly, projection) is False
 
     def test_end_points_are_inside(self):
         rwy = _make_runway()
-        poly, utm_zone = build_runway_polygon(rwy)
+        poly, projection = build_runway_polygon(rwy)
 
-        assert point_inside_runway(rwy.ends[0].latitude, rwy.ends[0].longitude, poly, utm_zone) is True
-        assert point_inside_runway(rwy.ends[1].latitude, rwy.ends[1].longitude, poly, utm_zone) is True
+        assert point_inside_runway(rwy.ends[0].latitude, rwy.ends[0].longitude, poly, projection) is True
+        assert point_inside_runway(rwy.ends[1].latitude, rwy.ends[1].longitude, poly, projection) is True
@@ -0,0 +1,137 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+from mam_analyzer.models.flight_events import FlightEvent
+from mam_analyzer.parser import load_flight_data
+from mam_analyzer.synthetic import SyntheticFlightConfig, generate_flight
+from mam_analyzer.utils.search import (
+    ALTITUDE,
+    FULL_EVENTS,
+    HEADING,
+    LOCATION,
+    Column,
+    IndexedEvents,
+    find_column_max,
+    find_first_index_backward_in_blocks,
+    find_first_index_forward_in_blocks,
+    find_key_index_backward,
+    find_key_index_forward,
+    find_key_indices_after,
+    find_key_indices_before,
+)
+from mam_analyzer.utils.units import heading_within_range, headings_within_range
+
+KEYS = [FULL_EVENTS, LOCATION, "LandingVSFpm", "FuelKg", "Engine 1", "Missing"]
+
+
+@pytest.fixture(scope="module")
+def events():
+    return load_flight_data("data/LEPA-LEPP-737.json")
+
+
+@pytest.fixture(scope="module")
+def long_events():
+    # Over two 4096 event blocks
+    config = SyntheticFlightConfig(cruise_minutes=120, step_climbs=2, touch_and_goes=1)
+    return IndexedEvents(FlightEvent.from_json(e) for e in generate_flight(config)["Events"])
+
+
+def test_load_returns_indexed_events(events):
+    assert isinstance(events, IndexedEvents)
+    assert events.index.is_sorted
+    assert list(events.index.postings(FULL_EVENTS)) == [i for i, e in enumerate(events) if e.is_full_event()]
+    assert list(events.index.postings("LandingVSFpm")) == [
+        i for i, e in enumerate(events) if e.get_change("LandingVSFpm") is not None
+    ]
+
+
+def test_indexed_lookups_match_linear_scan(events):
+    plain = list(events)
+    first, last = events[0].timestamp, events[-1].timestamp
+    span = (last - first).total_seconds()
+    rnd = random.Random(41)
+
+    for _ in range(200):
+        key = rnd.choice(KEYS)
+        from_time = first + timedelta(seconds=rnd.uniform(-60, span)) if rnd.random() < 0.7 else None
+        to_time = first + timedelta(seconds=rnd.uniform(0, span + 60)) if rnd.random() < 0.7 else None
+        idx = rnd.randrange(-1, len(events))
+
+        assert find_key_index_forward(events, key, from_time, to_time, max(idx, 0)) == \
+            find_key_index_forward(plain, key, from_time, to_time, max(idx, 0))
+        assert find_key_index_backward(events, key, from_time, to_time, idx) == \
+            find_key_index_backward(plain, key, from_time, to_time, idx)
+        assert find_key_indices_before(events, key, idx, 2) == find_key_indices_before(plain, key, idx, 2)
+        assert find_key_indices_after(events, key, idx, 2) == find_key_indices_after(plain, key, idx, 2)
+
+
+def test_between_shares_the_index(events):
+    start = events[100].timestamp
+    end = events[len(events) // 2].timestamp
+    part = events.between(start, end)
+
+    assert part == [e for e in events if start <= e.timestamp <= end]
+    assert part.index is events.index
+    assert find_key_index_backward(part, FULL_EVENTS) == find_key_index_backward(list(part), FULL_EVENTS)
+    assert find_key_indices_after(part, LOCATION, len(part) - 3, 5) == find_key_indices_after(list(part), LOCATION, len(part) - 3, 5)
+
+
+def test_unsorted_events_fall_back_to_scan(events):
+    shuffled = IndexedEvents(reversed(events[:50]))
+    assert not shuffled.index.is_sorted
+
+    plain = list(shuffled)
+    assert find_key_index_forward(shuffled, FULL_EVENTS, plain[10].timestamp, None) == \
+        find_key_index_forward(plain, FULL_EVENTS, plain[10].timestamp, None)
+
+
+def test_block_searches_match_linear_scan(long_events):
+    plain = list(long_events)
+    first, last = long_events[0].timestamp, long_events[-1].timestamp
+    span = (last - first).total_seconds()
+    rnd = random.Random(50)
+
+    for _ in range(300):
+        from_time = first + timedelta(seconds=rnd.uniform(-60, span)) if rnd.random() < 0.7 else None
+        to_time = first + timedelta(seconds=rnd.uniform(0, span + 60)) if rnd.random() < 0.7 else None
+        idx = rnd.randrange(-1, len(long_events))
+
+        if rnd.random() < 0.5:
+            reference, tolerance = rnd.randrange(0, 360), rnd.choice([0, 6, 30])
+            column = HEADING
+            condition = lambda e: e.heading is not None and not heading_within_range(e.heading, reference, tolerance)
+            block_may_match = lambda lowest, highest: not headings_within_range(lowest, highest, reference, tolerance)
+        else:
+            altitude, margin = rnd.randrange(0, 40000), rnd.choice([0, 1000, 4000])
+            column = ALTITUDE
+            condition = lambda e: e.get_change("Altitude") is not None and abs(altitude - int(e.get_change("Altitude"))) > margin
+            block_may_match = lambda lowest, highest: not (altitude - margin <= lowest and highest <= altitude + margin)
+
+        assert find_first_index_forward_in_blocks(long_events, idx, condition, column, block_may_match, from_time, to_time) == \
+            find_first_index_forward_in_blocks(plain, idx, condition, column, block_may_match, from_time, to_time)
+        assert find_first_index_backward_in_blocks(long_events, idx, condition, column, block_may_match, from_time, to_time) == \
+            find_first_index_backward_in_blocks(plain, idx, condition, column, block_may_match, from_time, to_time)
+        assert find_column_max(long_events, ALTITUDE, from_time, to_time) == find_column_max(plain, ALTITUDE, from_time, to_time)
+
+
+def test_block_searches_over_parts(long_events):
+    part = long_events.between(long_events[5000].timestamp, long_events[9000].timestamp)
+    condition = lambda e: e.heading is not None and not heading_within_range(e.heading, 90)
+    block_may_match = lambda lowest, highest: not headings_within_range(lowest, highest, 90)
+
+    assert find_column_max(part, ALTITUDE) == find_column_max(list(part), ALTITUDE)
+    for idx in (0, 100, len(part) - 1):
+        assert find_first_index_forward_in_blocks(part, idx, condition, HEADING, block_may_match) == \
+            find_first_index_forward_in_blocks(list(part), idx, condition, HEADING, block_may_match)
+        assert find_first_index_backward_in_blocks(part, idx, condition, HEADING, block_may_match) == \
+            find_first_index_backward_in_blocks(list(part), idx, condition, HEADING, block_may_match)
+
+
+def test_unreadable_column_falls_back_to_scan(events):
+    broken = Column("broken", lambda e: int("x") if e.is_full_event() else None)
+
+    assert events.index.pyramid(broken) is None
+    # Scanned with the condition only
+    assert find_first_index_forward_in_blocks(events, 0, lambda e: True, broken, lambda lowest, highest: True) == (0, events[0])
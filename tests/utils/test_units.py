@@ -0,0 +1,68 @@
+from math import hypot
+
+import numpy as np
+import pytest
+
+from mam_analyzer.utils.units import LocalProjection, haversine, latlon_to_xy
+
+POINTS = [
+    (39.5517, 2.7388),
+    (39.5365, 2.7279),
+    # Both sides of the 30/31 UTM zone boundary
+    (43.30, -0.01),
+    (43.30, 0.01),
+    # Southern hemisphere
+    (-33.9461, 151.1772),
+]
+
+
+def test_local_projection_reference_is_origin():
+    projection = LocalProjection(39.5441, 2.7333)
+
+    assert projection.to_xy(39.5441, 2.7333) == pytest.approx((0, 0), abs=1e-6)
+    # East and north axes
+    x, y = projection.to_xy(39.5441, 2.7433)
+    assert x > 0 and y == pytest.approx(0, abs=1)
+    x, y = projection.to_xy(39.5541, 2.7333)
+    assert y > 0 and x == pytest.approx(0, abs=1e-6)
+
+
+def test_local_projection_preserves_distances_around_reference():
+    projection = LocalProjection(39.5441, 2.7333)
+
+    for lat, lon in POINTS[:2]:
+        x, y = projection.to_xy(lat, lon)
+        # haversine uses a spherical Earth: ±0.5%
+        assert hypot(x, y) == pytest.approx(haversine(39.5441, 2.7333, lat, lon), rel=0.005)
+
+
+@pytest.mark.parametrize("lat0, lon0", [(39.5441, 2.7333), (64.5, -21.9), (-33.9461, 151.1772)])
+def test_local_projection_error_vs_utm(lat0, lon0):
+    """Runway-scale shapes match UTM within 0.1% of their size (documented bound)."""
+    pytest.importorskip("pyproj")
+    projection = LocalProjection(lat0, lon0)
+    rng = np.random.default_rng(0)
+    # Points up to ~5 km around the reference
+    lats = lat0 + rng.uniform(-0.045, 0.045, 50)
+    lons = lon0 + rng.uniform(-0.045, 0.045, 50) / np.cos(np.radians(lat0))
+
+    xs, ys = projection.to_xy_many(lats, lons)
+    utm_zone = int((lon0 + 180) // 6) + 1
+    uxs, uys = zip(*(latlon_to_xy(lat, lon, utm_zone) for lat, lon in zip(lats, lons)))
+
+    for i in range(1, 50):
+        local = hypot(xs[i] - xs[0], ys[i] - ys[0])
+        utm = hypot(uxs[i] - uxs[0], uys[i] - uys[0])
+        assert abs(local - utm) <= 0.001 * utm + 0.01
+
+
+def test_local_projection_bulk_matches_single():
+    projection = LocalProjection(43.30, 0.0)
+    lats = [43.30, 43.31, 43.29]
+    lons = [-0.01, 0.0, 0.01]
+
+    xs, ys = projection.to_xy_many(lats, lons)
+
+    for i in range(3):
+        assert (xs[i], ys[i]) == pytest.approx(projection.to_xy(lats[i], lons[i]), abs=1e-6)
+    assert len(projection.to_xy_many([], [])[0]) == 0